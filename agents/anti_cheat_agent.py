@@ -9,18 +9,10 @@
 # Author  : Shivaraj Yelugodla  |  Date: 08-Mar-2026
 # ─────────────────────────────────────────────────────────────────────
 
-import os
 import re
-from openai import OpenAI
-from dotenv import load_dotenv
 
-from pathlib import Path
-load_dotenv(dotenv_path=Path(__file__).resolve().parents[1] / ".env")
-
-client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=os.getenv("OPENROUTER_API_KEY")
-)
+from utils.llm import chat
+from utils.resume_parser import resume_sections
 
 
 # ──────────────────────────────────────────────
@@ -296,7 +288,7 @@ Your task is to generate 2-3 "curveball" follow-up questions that would be IMPOS
 4. Be practical and conversational (not accusatory)
 
 CANDIDATE'S RESUME:
-{resume_text[:500]}
+{resume_sections(resume_text, "skills", "projects", "experience", limit=1000)}
 
 INTERVIEW TRANSCRIPT:
 {transcript}
@@ -315,13 +307,7 @@ Rationale: <why this catches cheaters>
 """
 
     try:
-        response = client.chat.completions.create(
-            model="meta-llama/llama-3-8b-instruct",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.5
-        )
-
-        raw_output = response.choices[0].message.content.strip()
+        raw_output = chat("curveball", prompt)
 
         # Parse curveball questions
         questions = []
@@ -10,74 +10,94 @@
 import os
 import re
 import requests
-from dotenv import load_dotenv
-from openai import OpenAI
 
-from pathlib import Path
-load_dotenv(dotenv_path=Path(__file__).resolve().parents[1] / ".env")
+from utils.llm import chat
+from utils.resume_parser import extract_contact_fields, resume_sections
 
-client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=os.getenv("OPENROUTER_API_KEY")
-)
+
+# Fields at or above this confidence are taken from the regex extractor;
+# only the rest are sent to the LLM.
+CONTACT_MIN_CONFIDENCE = float(os.getenv("CONTACT_MIN_CONFIDENCE", 0.75))
+
+_LLM_FIELDS = {
+    "name": ("Name", "Full name", "<name>"),
+    "email": ("Email", "Email address", "<email>"),
+    "linkedin": ("LinkedIn", "LinkedIn profile URL (if mentioned)", '<url or "Not found">'),
+    "github": ("GitHub", "GitHub username or URL (if mentioned)", '<username or url or "Not found">'),
+}
+
+# What an unresolved field's value sits next to, wherever in the resume
+# that is. The name has none; it is looked for in the contact header.
+_FIELD_MARKERS = {
+    "email": re.compile(r"@"),
+    "linkedin": re.compile(r"linkedin", re.IGNORECASE),
+    "github": re.compile(r"github", re.IGNORECASE),
+}
+
+
+def _llm_context(resume_text, fields):
+    """
+    The contact header plus every line, anywhere in the resume, holding
+    the marker of one of `fields` - an email or profile link in the
+    footer or a projects section is outside the header.
+    """
+    header = resume_sections(resume_text, "contact")
+    header_lines = {line.strip() for line in header.splitlines()}
+    markers = [_FIELD_MARKERS[f] for f in fields if f in _FIELD_MARKERS]
+    extra = []
+    for line in resume_text.splitlines():
+        line = line.strip()
+        if (line and line not in header_lines and line not in extra
+                and any(m.search(line) for m in markers)):
+            extra.append(line)
+    return "\n".join([header] + extra)
 
 
 def extract_candidate_info(resume_text):
     """
-    Extract candidate information from resume using AI.
+    Extract candidate information from resume.
+    Contact fields come from the single-pass regex extractor; the LLM is
+    asked only for fields it could not resolve confidently.
     Returns: name, email, linkedin_url, github_username
     """
+    contact = extract_contact_fields(resume_text)
+    missing = [field for field in _LLM_FIELDS
+               if contact[field]["confidence"] < CONTACT_MIN_CONFIDENCE]
+    info = {field: None if field in missing else contact[field]["value"]
+            for field in _LLM_FIELDS}
+    if not missing:
+        return info
+
+    wanted = "\n".join(f"- {_LLM_FIELDS[f][1]}" for f in missing)
+    answer_format = "\n".join(f"{_LLM_FIELDS[f][0]}: {_LLM_FIELDS[f][2]}" for f in missing)
     prompt = f"""
 Extract the following information from this resume:
-- Full name
-- Email address
-- LinkedIn profile URL (if mentioned)
-- GitHub username or URL (if mentioned)
+{wanted}
 
 Resume:
-{resume_text}
+{_llm_context(resume_text, missing)}
 
 Respond in this exact format:
-Name: <name>
-Email: <email>
-LinkedIn: <url or "Not found">
-GitHub: <username or url or "Not found">
+{answer_format}
 """
     
     try:
-        response = client.chat.completions.create(
-            model="meta-llama/llama-3-8b-instruct",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.1
-        )
-        
-        result = response.choices[0].message.content.strip()
+        result = chat("verification", prompt)
         
         # Parse response
-        info = {
-            "name": None,
-            "email": None,
-            "linkedin": None,
-            "github": None
-        }
-        
         for line in result.split('\n'):
-            if line.startswith("Name:"):
-                info["name"] = line.split("Name:")[1].strip()
-            elif line.startswith("Email:"):
-                info["email"] = line.split("Email:")[1].strip()
-            elif line.startswith("LinkedIn:"):
-                linkedin = line.split("LinkedIn:")[1].strip()
-                info["linkedin"] = None if "not found" in linkedin.lower() else linkedin
-            elif line.startswith("GitHub:"):
-                github = line.split("GitHub:")[1].strip()
-                info["github"] = None if "not found" in github.lower() else github
+            for field in missing:
+                label = _LLM_FIELDS[field][0] + ":"
+                if line.startswith(label):
+                    value = line.split(label, 1)[1].strip()
+                    if value and "not found" not in value.lower():
+                        info[field] = value
         
         return info
     
     except Exception as e:
         print(f"⚠️ Error extracting candidate info: {e}")
-        return {"name": None, "email": None, "linkedin": None, "github": None}
+        return info
 
 
 def verify_email(email):
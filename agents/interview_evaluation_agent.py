@@ -6,17 +6,9 @@
 # Author  : Shivaraj Yelugodla  |  Date: 07-Mar-2026
 # ─────────────────────────────────────────────────────────────────────
 
-import os
 import re
-from openai import OpenAI
-from dotenv import load_dotenv
 
-load_dotenv()
-
-client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=os.getenv("OPENROUTER_API_KEY")
-)
+from utils.llm import chat
 
 
 def count_questions_in_transcript(transcript):
@@ -127,12 +119,4 @@ Decision: <Pass / Fail>
 Reason: <2-3 sentences explaining the decision based strictly on the transcript>
 """
 
-    response = client.chat.completions.create(
-        model="meta-llama/llama-3-8b-instruct",
-        messages=[
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.1
-    )
-
-    return response.choices[0].message.content.strip()
+    return chat("evaluation", prompt)
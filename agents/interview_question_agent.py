@@ -1,17 +1,7 @@
 # agents/interview_question_agent.py
 
-import os
-from openai import OpenAI
-from dotenv import load_dotenv
-
-from pathlib import Path
-load_dotenv(dotenv_path=Path(__file__).resolve().parents[1] / ".env")
-
-
-client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=os.getenv("OPENROUTER_API_KEY")
-)
+from utils.llm import chat
+from utils.resume_parser import resume_sections
 
 
 def generate_interview_questions(resume_text):
@@ -28,17 +18,9 @@ The questions should:
 - Avoid basic theory questions
 
 Resume:
-{resume_text}
+{resume_sections(resume_text, "skills", "experience", "projects")}
 
 Return the questions as a numbered list.
 """
 
-    response = client.chat.completions.create(
-        model="meta-llama/llama-3-8b-instruct",
-        messages=[
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.4
-    )
-
-    return response.choices[0].message.content.strip()
+    return chat("questions", prompt)
@@ -6,18 +6,8 @@
 # Author  : Shivaraj Yelugodla  |  Date: 07-Mar-2026
 # ─────────────────────────────────────────────────────────────────────
 
-import os
-from openai import OpenAI
-from dotenv import load_dotenv
-
-from pathlib import Path
-load_dotenv(dotenv_path=Path(__file__).resolve().parents[1] / ".env")
-
-
-client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=os.getenv("OPENROUTER_API_KEY")
-)
+from utils.llm import chat
+from utils.resume_parser import resume_sections
 
 
 def screen_resume(resume_text):
@@ -38,19 +28,11 @@ Based on the resume below, decide whether the candidate is QUALIFIED or NOT QUAL
 Give a short reason.
 
 Resume:
-{resume_text}
+{resume_sections(resume_text, "summary", "skills", "experience", "projects")}
 
 Respond strictly in this format:
 Decision: <Qualified / Not Qualified>
 Reason: <one short sentence>
 """
 
-    response = client.chat.completions.create(
-        model="meta-llama/llama-3-8b-instruct",
-        messages=[
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.2
-    )
-
-    return response.choices[0].message.content.strip()
+    return chat("screening", prompt)
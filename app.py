@@ -19,14 +19,11 @@ uploaded_file = st.file_uploader("Upload Resume (PDF)", type=["pdf"])
 phone_number = st.text_input("Candidate Phone Number", "+91")
 
 if uploaded_file:
-    with open("temp_resume.pdf", "wb") as f:
-        f.write(uploaded_file.read())
-
     st.success("Resume uploaded successfully")
 
     if st.button("Start Interview"):
         with st.spinner("Processing resume..."):
-            resume_text = extract_resume_text("temp_resume.pdf")
+            resume_text = extract_resume_text(uploaded_file.getvalue())
             screening_result = screen_resume(resume_text)
             questions = generate_interview_questions(resume_text)
 
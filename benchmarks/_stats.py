@@ -0,0 +1,27 @@
+"""
+benchmarks/_stats.py
+--------------------
+Small timing helpers shared by the benchmark scripts.
+"""
+
+import time
+from contextlib import contextmanager
+
+from utils.stats import percentile
+
+
+def summarize_ms(samples: list) -> str:
+    """Format a list of durations (seconds) as p50/p99/max in milliseconds."""
+    return (f"p50={percentile(samples, 50) * 1000:7.2f} ms  "
+            f"p99={percentile(samples, 99) * 1000:7.2f} ms  "
+            f"max={max(samples, default=0) * 1000:7.2f} ms")
+
+
+@contextmanager
+def timed(samples: list):
+    """Append the duration of the `with` block (seconds) to `samples`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        samples.append(time.perf_counter() - start)
@@ -0,0 +1,106 @@
+"""
+benchmarks/bench_db_pool.py
+---------------------------
+Compares one-connection-per-write (the old utils/db.py behaviour) against
+the pooled helpers, for the five writes a pipeline run makes.
+
+Reports connections opened per pipeline run and p50/p99 write latency.
+Uses the DB credentials from .env; rows are written under
+bench+<n>@agentforge.invalid and deleted afterwards.
+
+Run: python -m benchmarks.bench_db_pool --runs 50
+"""
+
+import argparse
+
+from benchmarks._stats import summarize_ms, timed
+from utils import db
+
+_EMAIL = "bench+{}@agentforge.invalid"
+_SCREENING = "Decision: Qualified\nReason: Benchmark row."
+_EVALUATION = "Questions Asked: 5\nPerfect Answers: 3\nScore: 60\nDecision: Pass\nReason: Benchmark row."
+_VERIFICATION = {"credibility_score": 80, "status": "VERIFIED",
+                 "recommendation": "PROCEED", "checks": {}, "issues": []}
+
+
+def _unpooled_write(sql: str, values: tuple, returning: bool = False):
+    """The pre-pool pattern: connect, execute, commit, close."""
+    conn = db.get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(sql, values)
+        row = cur.fetchone() if returning else None
+        conn.commit()
+        cur.close()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+
+def run_unpooled(runs: int, samples: list) -> int:
+    opened = 0
+    for i in range(runs):
+        with timed(samples):
+            cid = _unpooled_write(
+                "INSERT INTO candidates (email, resume_text) VALUES (%s, %s) "
+                "ON CONFLICT (email) DO UPDATE SET resume_text = EXCLUDED.resume_text RETURNING id;",
+                (_EMAIL.format(f"u{i}"), "benchmark"), returning=True)
+        for sql, values in (
+            ("INSERT INTO screening_results (candidate_id, decision, reason, raw_output) VALUES (%s,%s,%s,%s);",
+             (cid, "Qualified", "Benchmark row.", _SCREENING)),
+            ("INSERT INTO background_checks (candidate_id, credibility_score, status) VALUES (%s,%s,%s);",
+             (cid, 80, "VERIFIED")),
+            ("INSERT INTO interview_sessions (candidate_id, call_id, call_status) VALUES (%s,%s,%s);",
+             (cid, "bench", "completed")),
+            ("INSERT INTO evaluation_results (candidate_id, score, decision, raw_output) VALUES (%s,%s,%s,%s);",
+             (cid, 60, "Pass", _EVALUATION)),
+        ):
+            with timed(samples):
+                _unpooled_write(sql, values)
+        opened += 5
+    return opened
+
+
+def run_pooled(runs: int, samples: list) -> int:
+    before = db.get_pool().stats()["opened"]
+    for i in range(runs):
+        with timed(samples):
+            cid = db.upsert_candidate(email=_EMAIL.format(f"p{i}"), resume_text="benchmark")
+        with timed(samples):
+            db.save_screening_result(cid, _SCREENING)
+        with timed(samples):
+            db.save_background_check(cid, _VERIFICATION)
+        with timed(samples):
+            db.save_interview_session(cid, "bench", "", "")
+        with timed(samples):
+            db.save_evaluation_result(cid, _EVALUATION)
+    return db.get_pool().stats()["opened"] - before
+
+
+def cleanup():
+    with db.pooled_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM candidates WHERE email LIKE %s;", (_EMAIL.format("%"),))
+        conn.commit()
+        cur.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--runs", type=int, default=20, help="simulated pipeline runs per mode")
+    args = parser.parse_args()
+
+    db.init_tables()
+    try:
+        for label, fn in (("before (connect per write)", run_unpooled),
+                          ("after  (pooled)", run_pooled)):
+            samples = []
+            opened = fn(args.runs, samples)
+            print(f"{label:28s} conns/run={opened / args.runs:5.2f}  {summarize_ms(samples)}")
+        print(f"pool stats: {db.get_pool().stats()}")
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    main()
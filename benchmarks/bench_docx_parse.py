@@ -0,0 +1,117 @@
+"""
+benchmarks/bench_docx_parse.py
+------------------------------
+Compares the old parse_docx (python-docx object model, string += per
+paragraph, body paragraphs only) with the streaming iterparse extractor
+in utils/resume_parser.py on generated documents of increasing size.
+
+Each run happens in a fresh forked process, and its peak RSS growth is
+read from /proc/self/status (VmHWM), which also counts lxml's C-level
+allocations. That figure is Linux only and prints as n/a elsewhere.
+
+Run: python -m benchmarks.bench_docx_parse --paragraphs 200 5000 50000 --repeat 3
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+import tempfile
+import time
+
+from docx import Document
+
+from benchmarks._stats import summarize_ms
+from utils.resume_parser import parse_docx
+
+_LINE = "Built MERN stack services with React, Node.js, Express and MongoDB; paragraph {}"
+
+
+def write_synthetic_docx(path: str, paragraphs: int):
+    """Write a .docx with `paragraphs` paragraphs plus a skills table every 50."""
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Jane Doe | jane.doe@example.com"
+    for i in range(paragraphs):
+        doc.add_paragraph(_LINE.format(i))
+        if i % 50 == 49:
+            table = doc.add_table(rows=3, cols=2)
+            for row, (area, skills) in enumerate((("Frontend", "React, Redux"),
+                                                  ("Backend", "Node.js, Express"),
+                                                  ("Database", "MongoDB"))):
+                table.cell(row, 0).text = area
+                table.cell(row, 1).text = skills
+    doc.save(path)
+
+
+def parse_docx_old(file_path):
+    """parse_docx before the streaming rewrite."""
+    text = ""
+    doc = Document(file_path)
+
+    for para in doc.paragraphs:
+        text += para.text + " "
+
+    return text.strip()
+
+
+def _rss_kb(field: str):
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _run_once(fn, path, queue):
+    before = _rss_kb("VmRSS")
+    start = time.perf_counter()
+    chars = len(fn(path))
+    seconds = time.perf_counter() - start
+    peak = _rss_kb("VmHWM")
+    queue.put((seconds, chars, peak - before if peak is not None and before is not None else None))
+
+
+def measure(fn, path):
+    """(seconds, chars, peak RSS growth in KB or None) of fn(path) in a fresh process."""
+    # Keep the child's GC from walking (and copying) the parent's heap,
+    # which is large after generating the document with python-docx.
+    gc.collect()
+    gc.freeze()
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run_once, args=(fn, path, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--paragraphs", type=int, nargs="+", default=[200, 5000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for paragraphs in args.paragraphs:
+            path = os.path.join(tmp, f"synthetic_{paragraphs}.docx")
+            write_synthetic_docx(path, paragraphs)
+            size_kb = os.path.getsize(path) // 1024
+            for label, fn in (("before (python-docx)", parse_docx_old),
+                              ("after  (iterparse)", lambda p: parse_docx(p, 0)),
+                              ("after  (bounded)", parse_docx)):
+                samples, peaks = [], []
+                for _ in range(args.repeat):
+                    seconds, chars, peak_kb = measure(fn, path)
+                    samples.append(seconds)
+                    peaks.append(peak_kb)
+                peak = "n/a" if None in peaks else f"{max(peaks) / 1024:7.1f} MB"
+                print(f"{paragraphs:6d} paras ({size_kb:5d} KB)  {label:22s} chars={chars:9d}  "
+                      f"{summarize_ms(samples)}  peak+{peak}")
+
+
+if __name__ == "__main__":
+    main()
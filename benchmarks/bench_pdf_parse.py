@@ -0,0 +1,66 @@
+"""
+benchmarks/bench_pdf_parse.py
+-----------------------------
+Compares the old parse_pdf (string += per page, every page) with the
+page-bounded one in utils/resume_parser.py on synthetic PDFs of
+increasing length.
+
+The PDFs are generated by benchmarks/_pdf.py (plain text pages,
+Helvetica), so no extra dependency is needed.
+
+Run: python -m benchmarks.bench_pdf_parse --pages 2 20 80 --repeat 5
+"""
+
+import argparse
+import os
+import tempfile
+
+from pypdf import PdfReader
+
+from benchmarks._pdf import build_pdf
+from benchmarks._stats import summarize_ms, timed
+from utils.resume_parser import parse_pdf
+
+_LINE = "Built MERN stack services with React, Node.js, Express and MongoDB; {}"
+
+
+def write_synthetic_pdf(path: str, pages: int, lines_per_page: int = 50):
+    """Write a `pages`-page PDF with `lines_per_page` lines of text each."""
+    with open(path, "wb") as f:
+        f.write(build_pdf([[_LINE.format(f"page {p} line {i}") for i in range(lines_per_page)]
+                           for p in range(pages)]))
+
+
+def parse_pdf_old(file_path):
+    """parse_pdf before the page-bounded rewrite."""
+    text = ""
+    reader = PdfReader(file_path)
+    for page in reader.pages:
+        page_text = page.extract_text()
+        if page_text:
+            text += page_text + " "
+    return text.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--pages", type=int, nargs="+", default=[2, 20, 80])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            path = os.path.join(tmp, f"synthetic_{pages}.pdf")
+            write_synthetic_pdf(path, pages)
+            for label, fn in (("before (all pages)", parse_pdf_old),
+                              ("after  (bounded)", parse_pdf),
+                              ("after  (unbounded)", lambda p: parse_pdf(p, 0, 0))):
+                samples = []
+                for _ in range(args.repeat):
+                    with timed(samples):
+                        chars = len(fn(path))
+                print(f"{pages:4d} pages  {label:20s} chars={chars:8d}  {summarize_ms(samples)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+benchmarks/bench_storage.py
+---------------------------
+Candidates processed per minute through the utils.db API, for whichever
+backend DB_BACKEND selects. Each simulated candidate is one
+CandidateSession flush (candidate + four result rows), as in server.py.
+
+Rows are written under bench+<n>@agentforge.invalid and deleted afterwards.
+
+Run:
+  python -m benchmarks.bench_storage --runs 500
+  DB_BACKEND=sqlite SQLITE_PATH=/tmp/bench.db python -m benchmarks.bench_storage --runs 500
+"""
+
+import argparse
+import time
+
+from benchmarks._stats import summarize_ms, timed
+from benchmarks.bench_db_pool import _EMAIL, _EVALUATION, _SCREENING, _VERIFICATION
+from utils import db
+
+
+def run(runs: int, samples: list):
+    for i in range(runs):
+        with timed(samples):
+            with db.CandidateSession() as session:
+                session.update_candidate(email=_EMAIL.format(f"s{i}"), resume_text="benchmark")
+                session.add_screening_result(_SCREENING)
+                session.add_background_check(_VERIFICATION)
+                session.add_interview_session("bench", "", "")
+                session.add_evaluation_result(_EVALUATION)
+
+
+def cleanup():
+    if db.BACKEND == "sqlite":
+        from utils import sqlite_store
+        with sqlite_store._transaction() as conn:
+            conn.execute("DELETE FROM candidates WHERE email LIKE ?;", (_EMAIL.format("%"),))
+        return
+    with db.pooled_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM candidates WHERE email LIKE %s;", (_EMAIL.format("%"),))
+        conn.commit()
+        cur.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--runs", type=int, default=200, help="simulated candidates")
+    args = parser.parse_args()
+
+    db.init_tables()
+    samples = []
+    try:
+        start = time.perf_counter()
+        run(args.runs, samples)
+        elapsed = time.perf_counter() - start
+        print(f"backend={db.BACKEND:8s} candidates/min={args.runs / elapsed * 60:10.0f}  "
+              f"{summarize_ms(samples)}")
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    main()
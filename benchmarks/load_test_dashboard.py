@@ -0,0 +1,97 @@
+"""
+benchmarks/load_test_dashboard.py
+---------------------------------
+Load test for a running server.py: hammers /candidates and /stats from
+several threads while a prober keeps opening /stream-logs and timing how
+long the SSE response headers take (a direct read of event-loop stalls).
+
+If DB calls block the event loop, SSE time-to-headers climbs to the
+dashboard query latency; with utils/async_db.py it should stay flat.
+
+Run:  uvicorn server:app --port 8000          (pointed at a local Postgres)
+      python -m benchmarks.load_test_dashboard --seed 2000 --clients 16
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks._stats import summarize_ms, timed
+
+_EMAIL = "bench+{}@agentforge.invalid"
+
+
+def seed(count: int):
+    from utils import db
+    db.init_tables()
+    for i in range(count):
+        with db.CandidateSession(email=_EMAIL.format(i), resume_text="benchmark") as session:
+            session.add_screening_result("Decision: Qualified\nReason: Benchmark row.")
+            session.add_evaluation_result("Score: 60\nDecision: Pass\nReason: Benchmark row.")
+
+
+def cleanup():
+    from utils import db
+    with db.pooled_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM candidates WHERE email LIKE %s;", (_EMAIL.format("%"),))
+        conn.commit()
+        cur.close()
+
+
+def dashboard_client(url: str, requests_per_client: int, samples: list):
+    with requests.Session() as http:
+        for i in range(requests_per_client):
+            path = "/candidates" if i % 2 else "/stats"
+            with timed(samples):
+                http.get(url + path, timeout=60).raise_for_status()
+
+
+def sse_prober(url: str, stop: threading.Event, samples: list):
+    with requests.Session() as http:
+        while not stop.is_set():
+            with timed(samples):
+                resp = http.get(url + "/stream-logs", stream=True, timeout=60)
+            resp.close()
+            time.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard vs SSE load test")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=25, help="requests per client")
+    parser.add_argument("--seed", type=int, default=0, help="insert N benchmark candidates first")
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.seed)
+    try:
+        dashboard, sse = [], []
+        stop = threading.Event()
+        prober = threading.Thread(target=sse_prober, args=(args.url, stop, sse), daemon=True)
+        prober.start()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            futures = [pool.submit(dashboard_client, args.url, args.requests, dashboard)
+                       for _ in range(args.clients)]
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        prober.join()
+
+        print(f"dashboard: {len(dashboard)} requests in {elapsed:.2f}s "
+              f"({len(dashboard) / elapsed:.1f} req/s)  {summarize_ms(dashboard)}")
+        print(f"sse time-to-headers: {len(sse)} probes  {summarize_ms(sse)}")
+    finally:
+        if args.seed:
+            cleanup()
+
+
+if __name__ == "__main__":
+    main()
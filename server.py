@@ -6,13 +6,13 @@
 # Date    : 07-Mar-2026
 # Version : 2.0
 # ─────────────────────────────────────────────────────────────────────
-from fastapi import FastAPI, UploadFile, File, Form, BackgroundTasks
+from fastapi import FastAPI, UploadFile, File, Form, BackgroundTasks, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 import json
 import asyncio
-import os
-import shutil
+from datetime import datetime
+from typing import Optional
 from agents.resume_screening_agent import screen_resume
 from agents.background_verification_agent import verify_background
 from agents.interview_question_agent import generate_interview_questions
@@ -20,13 +20,17 @@ from agents.calling_agent import start_interview_call, wait_for_call_completion,
 from agents.anti_cheat_agent import run_anti_cheat_analysis
 from agents.interview_evaluation_agent import evaluate_interview
 from agents.final_decision_agent import handle_final_decision
-from utils.resume_parser import extract_resume_text, extract_resume_data
-from utils.db import (
-    init_tables, upsert_candidate,
-    save_screening_result, save_background_check,
-    save_interview_session, save_evaluation_result,
-    get_all_candidates, get_pipeline_stats, test_connection
+from utils.resume_parser import extract_resume_data, read_resume_bytes
+from utils.db import init_tables, CandidateSession, buffer_hash
+from utils.async_db import (
+    get_pool as get_async_pool, close_pool as close_async_pool,
+    get_candidates_page, get_pipeline_stats, get_resume_by_file_hash, store_resume
 )
+from utils.health import monitor as db_health
+from utils.dedupe_index import get_index as get_dedupe_index
+from utils.llm import close_client as close_llm_client
+from utils import llm_cache
+from utils.parse_sandbox import ResumeParseError, close_parser_pool, get_parser_pool
 
 app = FastAPI(title="AgentForge API")
 
@@ -34,6 +38,19 @@ app = FastAPI(title="AgentForge API")
 @app.on_event("startup")
 async def startup_event():
     init_tables()
+    try:
+        await get_async_pool()
+    except Exception as e:
+        print(f"⚠️  Async DB pool not ready yet: {e}")
+    db_health.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await db_health.stop()
+    await close_async_pool()
+    close_parser_pool()
+    close_llm_client()
 
 # ── CORS for Next.js frontend ────────────────────
 app.add_middleware(
@@ -62,10 +79,31 @@ async def log_event(agent: str, message: str, data: dict = None, status: str = "
 
 
 # ── Health & DB status ────────────────────────────
+# All three read the cached snapshot from utils/health.py; none touch the DB.
 @app.get("/health")
 async def health():
-    db_ok = test_connection()
-    return {"status": "ok", "supabase": "connected" if db_ok else "error"}
+    snap = db_health.snapshot()
+    return {"status": "ok", "supabase": snap["database"]}
+
+
+@app.get("/health/live")
+async def health_live():
+    """Liveness: the process is up and the event loop is responsive."""
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness: 200 when the last background DB check passed and is fresh, else 503."""
+    snap = db_health.snapshot()
+    return JSONResponse(status_code=200 if snap["ready"] else 503,
+                        content={"status": "ready" if snap["ready"] else "unavailable", **snap})
+
+
+@app.get("/llm-cache")
+async def llm_cache_stats():
+    """Hit/miss counters of the LLM response cache (this process)."""
+    return llm_cache.stats()
 
 
 # ── Stream logs via SSE ───────────────────────────
@@ -87,44 +125,64 @@ async def stream_logs():
 async def start_process(background_tasks: BackgroundTasks,
                         file: UploadFile = File(...),
                         phone: str = Form(...)):
-    temp_path = f"temp_{file.filename}"
-    with open(temp_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    background_tasks.add_task(run_hiring_pipeline, temp_path, phone)
+    # Parsed from memory; no temp copy. Read now because the upload is
+    # closed before background tasks run.
+    resume_bytes = read_resume_bytes(file.file)
+    background_tasks.add_task(run_hiring_pipeline, resume_bytes, phone)
     return {"status": "started", "file": file.filename}
 
 
 # Core pipeline coroutine — runs all 6 stages sequentially in the background
-async def run_hiring_pipeline(resume_path: str, phone: str):
-    candidate_id = None
+async def run_hiring_pipeline(resume_bytes, phone: str):
+    session = None
     try:
         execution_logs.clear()
 
         # 1. Extraction
-        await log_event("Extractor", "Parsing Resume PDF...", {"status": "reading_bytes"})
-        resume_text = extract_resume_text(resume_path)
+        resume_file_hash = buffer_hash(resume_bytes)
+        resume_text = await get_resume_by_file_hash(resume_file_hash)
+        if resume_text:
+            await log_event("Extractor", "Resume seen before, reusing extracted text",
+                            {"status": "cached"})
+        else:
+            await log_event("Extractor", "Parsing Resume PDF...", {"status": "reading_bytes"})
+            try:
+                # Sandboxed worker: a pathological file can't stall the event loop.
+                resume_text = await get_parser_pool().parse_async(resume_bytes)
+            except ResumeParseError as e:
+                await log_event("Extractor", f"Resume rejected: {e}", status="failed")
+                return
+            if resume_text:
+                await store_resume(resume_text, file_hash=resume_file_hash)
         resume_data = extract_resume_data(resume_text)
         candidate_email = resume_data.get("email", "Unknown")
         candidate_phone_from_resume = resume_data.get("phone")
         await log_event("Extractor", "Data Extraction Complete",
                         {"email": candidate_email, "phone": candidate_phone_from_resume}, "success")
 
-        # ── Save candidate to Supabase ──
-        candidate_id = upsert_candidate(
+        # Same resume under another name/email: stop before any LLM or Vapi call.
+        dedupe_index = get_dedupe_index()
+        if dedupe_index is not None:
+            duplicates = dedupe_index.check_and_add(candidate_email or resume_file_hash,
+                                                    resume_text)
+            if duplicates:
+                await log_event("Dedupe", "Near-duplicate of an earlier application",
+                                {"matches": [{"key": key, "similarity": round(score, 2)}
+                                             for key, score in duplicates[:5]]}, "failed")
+                return
+
+        # ── Buffer candidate writes; flushed in one transaction at the end ──
+        session = CandidateSession(
             email=candidate_email,
             phone=phone,
             resume_text=resume_text,
         )
-        await log_event("Database", f"Candidate saved (id={candidate_id})",
-                        {"candidate_id": candidate_id}, "success")
 
         # 2. Screening
         await log_event("Screening Agent", "Analyzing candidate fit score...",
                         {"logic": "Matching keywords & experience"})
         screening_result = screen_resume(resume_text)
-        if candidate_id:
-            save_screening_result(candidate_id, screening_result)
+        session.add_screening_result(screening_result)
         await log_event("Screening Agent", "Screening Complete",
                         {"result": screening_result}, "success")
 
@@ -136,8 +194,7 @@ async def run_hiring_pipeline(resume_path: str, phone: str):
         await log_event("Verification Agent", "Verifying background credentials...",
                         {"targets": ["LinkedIn", "GitHub", "Email"]})
         verification_result = verify_background(resume_text, candidate_email)
-        if candidate_id:
-            save_background_check(candidate_id, verification_result)
+        session.add_background_check(verification_result)
         await log_event("Verification Agent", "Verification Complete",
                         verification_result, "success")
 
@@ -165,15 +222,13 @@ async def run_hiring_pipeline(resume_path: str, phone: str):
 
         if transcript:
             # Save completed interview session
-            if candidate_id:
-                save_interview_session(
-                    candidate_id=candidate_id,
-                    call_id=call_id or "unknown",
-                    phone_number=phone,
-                    questions=questions,
-                    transcript=transcript,
-                    call_status="completed"
-                )
+            session.add_interview_session(
+                call_id=call_id or "unknown",
+                phone_number=phone,
+                questions=questions,
+                transcript=transcript,
+                call_status="completed"
+            )
             await log_event("Voice Agent", "Call Completed",
                             {"transcript_length": len(transcript)}, "success")
 
@@ -204,8 +259,7 @@ async def run_hiring_pipeline(resume_path: str, phone: str):
             await log_event("Evaluation Agent", "Analyzing interview transcript...",
                             {"metrics": ["Sentiment", "Technical Accuracy"]})
             evaluation = evaluate_interview(resume_text, transcript)
-            if candidate_id:
-                save_evaluation_result(candidate_id, evaluation)
+            session.add_evaluation_result(evaluation)
             await log_event("Evaluation Agent", "Evaluation Complete",
                             {"summary": evaluation[:100] + "..."}, "success")
 
@@ -217,36 +271,57 @@ async def run_hiring_pipeline(resume_path: str, phone: str):
                             {"decision": "Decision Processed & HR Notified"}, "success")
         else:
             # Save no-answer session
-            if candidate_id:
-                save_interview_session(
-                    candidate_id=candidate_id,
-                    call_id=call_id or "unknown",
-                    phone_number=phone,
-                    questions=questions,
-                    transcript=None,
-                    call_status="no-answer"
-                )
+            session.add_interview_session(
+                call_id=call_id or "unknown",
+                phone_number=phone,
+                questions=questions,
+                transcript=None,
+                call_status="no-answer"
+            )
             await log_event("Voice Agent", "Call failed or transcript unavailable",
                             status="failed")
 
     except Exception as e:
         await log_event("System", f"Critical Error: {str(e)}", status="failed")
     finally:
-        if os.path.exists(resume_path):
-            os.remove(resume_path)
+        if session is not None:
+            candidate_id = await asyncio.to_thread(session.flush)
+            if session.spooled:
+                await log_event("Database", "Candidate queued in write-behind spool",
+                                {"candidate_id": candidate_id}, "success")
+            else:
+                await log_event("Database", f"Candidate saved (id={candidate_id})",
+                                {"candidate_id": candidate_id},
+                                "success" if candidate_id else "failed")
 
 
 # ── Dashboard data endpoints ─────────────────────
 @app.get("/candidates")
-async def list_candidates():
-    """Return all candidates with their final decision."""
-    return get_all_candidates()
+async def list_candidates(limit: int = Query(50, ge=1, le=500),
+                          cursor: Optional[str] = None,
+                          decision: Optional[str] = None,
+                          min_score: Optional[float] = None,
+                          max_score: Optional[float] = None,
+                          created_from: Optional[datetime] = None,
+                          created_to: Optional[datetime] = None):
+    """
+    Return one page of candidates (newest first) with their final decision.
+    Pass the returned `next_cursor` back as `cursor` for the next page.
+    """
+    try:
+        return await get_candidates_page(
+            limit=limit, cursor=cursor, decision=decision,
+            min_score=min_score, max_score=max_score,
+            created_from=created_from, created_to=created_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.get("/stats")
 async def pipeline_stats():
     """Return aggregate pipeline statistics."""
-    return get_pipeline_stats()
+    return await get_pipeline_stats()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,118 @@
+"""
+tests/conftest.py
+-----------------
+Shared fixtures for the test suite.
+
+    python -m pytest -q
+
+Settings are pinned before any project module is imported, so the suite
+never writes into data/ and never calls the LLM or Vapi APIs. Caches,
+spool and dedupe index live in a throwaway directory.
+
+Tests marked with the `pg` fixture need a scratch Postgres database. They
+are skipped unless TEST_DB_NAME names one (it is wiped between tests);
+the other DB_* settings come from the environment / .env as usual:
+    TEST_DB_NAME=agentforge_test python -m pytest -q
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+_SCRATCH = tempfile.mkdtemp(prefix="agentforge-tests-")
+
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+os.environ.update({
+    "DB_BACKEND": "postgres",
+    "DB_WRITE_BEHIND": "0",
+    "DB_PROBE_INTERVAL": "0",
+    "DB_POOL_MIN": "0",
+    "DB_SPOOL_DIR": os.path.join(_SCRATCH, "spool"),
+    "RESUME_CACHE": "0",
+    "RESUME_CACHE_DIR": os.path.join(_SCRATCH, "parse_cache"),
+    "LLM_CACHE": "0",
+    "LLM_CACHE_DIR": os.path.join(_SCRATCH, "llm_cache"),
+    "DEDUPE_INDEX": os.path.join(_SCRATCH, "dedupe_index.bin"),
+    "SQLITE_PATH": os.path.join(_SCRATCH, "agentforge.db"),
+})
+if os.getenv("TEST_DB_NAME"):
+    os.environ["DB_NAME"] = os.environ["TEST_DB_NAME"]
+
+
+# Tables wiped between Postgres tests (children first).
+_TABLES = ("screening_results", "background_checks", "interview_sessions",
+           "evaluation_results", "candidates", "resume_files", "resume_blobs",
+           "spool_applied", "fallback_replayed")
+
+
+@pytest.fixture(scope="session")
+def _pg_schema():
+    if not os.getenv("TEST_DB_NAME"):
+        pytest.skip("set TEST_DB_NAME to run Postgres tests")
+    from utils import db
+    if not db.test_connection():
+        pytest.skip("Postgres test database unreachable")
+    db.migrate()
+    yield
+    db.close_pool()
+
+
+@pytest.fixture
+def pg(_pg_schema):
+    """utils.db against an empty, fully migrated TEST_DB_NAME database."""
+    from utils import db
+    with db.pooled_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(f"TRUNCATE {', '.join(_TABLES)} RESTART IDENTITY CASCADE;")
+        conn.commit()
+        cur.close()
+    db.refresh_pipeline_stats()
+    return db
+
+
+def build_docx(path, paragraphs: list, table: list = None, header: str = None):
+    """Write a .docx with `paragraphs`, an optional table (list of rows) and header."""
+    from docx import Document
+    doc = Document()
+    if header:
+        doc.sections[0].header.paragraphs[0].text = header
+    for text in paragraphs:
+        doc.add_paragraph(text)
+    if table:
+        grid = doc.add_table(rows=len(table), cols=len(table[0]))
+        for r, row in enumerate(table):
+            for c, value in enumerate(row):
+                grid.cell(r, c).text = value
+    doc.save(str(path))
+    return str(path)
+
+
+@pytest.fixture
+def make_pdf():
+    from benchmarks._pdf import build_pdf
+    return build_pdf
+
+
+@pytest.fixture
+def make_docx():
+    return build_docx
+
+
+@pytest.fixture
+def sqlite_store(tmp_path, monkeypatch):
+    """utils.sqlite_store on a fresh database file."""
+    from utils import sqlite_store
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "agentforge.db"))
+    monkeypatch.setattr(sqlite_store, "_local", threading.local())
+    sqlite_store.init_tables()
+    yield sqlite_store
+    conn = getattr(sqlite_store._local, "conn", None)
+    if conn is not None:
+        conn.close()
@@ -0,0 +1,82 @@
+"""Tests for utils.async_db (user-004)."""
+
+import asyncio
+
+from utils import async_db, db
+
+
+def test_sql_numbers_placeholders_in_order():
+    assert async_db._sql("SELECT %s, %s FROM t WHERE x = %s;") == "SELECT $1, $2 FROM t WHERE x = $3;"
+    assert async_db._sql("SELECT 1;") == "SELECT 1;"
+
+
+def test_shared_queries_convert_cleanly():
+    sql, params = db._candidates_query(decision="pass", min_score=50, limit=10)
+    converted = async_db._sql(sql)
+    assert "%s" not in converted
+    assert f"${len(params)}" in converted and f"${len(params) + 1}" not in converted
+
+
+def run(coro_fn):
+    """Run one test body on a fresh loop with its own asyncpg pool."""
+    async def wrapper():
+        try:
+            return await coro_fn()
+        finally:
+            await async_db.close_pool()
+    return asyncio.run(wrapper())
+
+
+def test_writes_and_reads_match_sync_layer(pg):
+    async def body():
+        assert await async_db.test_connection()
+        candidate_id = await async_db.upsert_candidate(name="Ada", email="ada@example.com",
+                                                       resume_text="resume text")
+        await async_db.save_screening_result(candidate_id, "Decision: Qualified\nReason: ok")
+        await async_db.save_evaluation_result(
+            candidate_id, "Score: 80\nDecision: Pass\nReason: good")
+        text_hash = await async_db.store_resume("resume text", file_hash="f" * 64)
+        return (candidate_id, text_hash,
+                await async_db.get_candidate_by_email("ada@example.com"),
+                await async_db.get_resume_by_file_hash("f" * 64),
+                await async_db.get_candidates_page(limit=10, decision="pass"))
+
+    candidate_id, text_hash, candidate, resume, page = run(body)
+    assert candidate["id"] == candidate_id and candidate["resume_text"] == "resume text"
+    assert text_hash == db.resume_hash("resume text") and resume == "resume text"
+    assert [row["id"] for row in page["items"]] == [candidate_id]
+    assert page["next_cursor"] is None
+    assert pg.get_candidate_by_email("ada@example.com")["id"] == candidate_id
+
+
+def test_page_reports_bad_cursor_as_value_error(pg):
+    async def body():
+        try:
+            await async_db.get_candidates_page(cursor="not-a-cursor")
+        except ValueError:
+            return True
+        return False
+
+    assert run(body)
+
+
+def test_pipeline_flushes_its_session_off_the_event_loop(monkeypatch):
+    import threading
+    import server
+
+    async def cached_resume(file_hash):
+        return "Jane Doe\njane@example.com\nSkills\nReact"
+
+    async def log_event(*args, **kwargs):
+        pass
+
+    flushed = []
+    monkeypatch.setattr(server, "get_resume_by_file_hash", cached_resume)
+    monkeypatch.setattr(server, "log_event", log_event)
+    monkeypatch.setattr(server, "get_dedupe_index", lambda: None)
+    monkeypatch.setattr(server, "screen_resume", lambda text: "Not a fit")
+    monkeypatch.setattr(server.CandidateSession, "flush",
+                        lambda session: flushed.append(threading.current_thread()) or 1)
+
+    asyncio.run(server.run_hiring_pipeline(b"%PDF-1.4", "+14155550100"))
+    assert len(flushed) == 1 and flushed[0] is not threading.main_thread()
@@ -0,0 +1,69 @@
+"""Tests for utils.batch_ingest (user-015)."""
+
+import zipfile
+
+import pytest
+
+from utils import batch_ingest
+from utils.batch_ingest import IngestStats, ingest, iter_resume_sources
+from utils.stats import percentile
+
+
+@pytest.fixture
+def drive(tmp_path, make_pdf, make_docx):
+    """A directory with two PDFs, a DOCX, a broken PDF and a non-resume file."""
+    root = tmp_path / "drive"
+    (root / "nested").mkdir(parents=True)
+    for n in range(2):
+        (root / f"r{n}.pdf").write_bytes(make_pdf([[f"Dev {n}", f"dev{n}@example.com"]]))
+    make_docx(root / "nested" / "r2.docx", ["Dev 2", "dev2@example.com", "+1 415 555 0100"])
+    (root / "broken.pdf").write_bytes(b"%PDF-1.4 garbage")
+    (root / "notes.txt").write_text("not a resume")
+    return root
+
+
+def test_sources_walk_directories_and_zips(drive, tmp_path):
+    names = [p.rsplit("/", 1)[-1] for p, _ in iter_resume_sources(str(drive))]
+    assert sorted(names) == ["broken.pdf", "r0.pdf", "r1.pdf", "r2.docx"]
+
+    archive = tmp_path / "drive.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        z.write(drive / "r0.pdf", "a/r0.pdf")
+        z.write(drive / "notes.txt", "notes.txt")
+    assert list(iter_resume_sources(str(archive))) == [(str(archive), "a/r0.pdf")]
+
+
+def test_ingest_parses_in_parallel_and_reports_failures(drive):
+    stats = IngestStats()
+    results = {r.path.rsplit("/", 1)[-1]: r for r in ingest(str(drive), workers=2,
+                                                             max_in_flight=2, stats=stats)}
+    assert results["r0.pdf"].email == "dev0@example.com"
+    assert results["r2.docx"].email == "dev2@example.com"
+    assert results["broken.pdf"].text is None
+
+    summary = stats.summary()
+    assert summary["files"] == 4 and summary["ok"] == 3 and summary["failed"] == 1
+    assert list(summary["errors"]) == [str(drive / "broken.pdf")]
+    assert summary["parse_ms"]["p50"] == round(percentile(stats.latencies, 50) * 1000, 1)
+
+
+def test_zip_members_are_parsed_in_the_worker(drive, tmp_path):
+    archive = tmp_path / "drive.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        z.write(drive / "nested" / "r2.docx", "r2.docx")
+    [result] = ingest(str(archive), workers=1)
+    assert result.path == f"{archive}::r2.docx" and result.email == "dev2@example.com"
+
+
+def test_summary_without_files():
+    summary = IngestStats().summary()
+    assert summary["files"] == 0 and summary["parse_ms"] == {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+
+def test_cli_writes_jsonl_and_summary(drive, tmp_path, capsys):
+    out, summary = tmp_path / "out.jsonl", tmp_path / "summary.json"
+    batch_ingest._main([str(drive), "--workers", "1", "--out", str(out),
+                        "--summary", str(summary)])
+    assert len(out.read_text().splitlines()) == 4
+    assert '"ok": 3' in summary.read_text()
+    assert "Parsed 3/4 resumes" in capsys.readouterr().out
@@ -0,0 +1,72 @@
+"""Tests for utils.db bulk_import / bulk_export (user-005)."""
+
+import csv
+import io
+from datetime import datetime, timezone
+
+import pytest
+
+from utils import db
+
+
+def test_copy_text_escapes_and_nulls():
+    assert db._copy_text(None) == "\\N"
+    assert db._copy_text(True) == "t"
+    assert db._copy_text("a\tb\nc\\d") == "a\\tb\\nc\\\\d"
+    assert db._copy_text(["x", None, 'say "hi"']) == '{"x",NULL,"say \\\\"hi\\\\""}'
+    stamp = datetime(2026, 3, 7, 12, 0, tzinfo=timezone.utc)
+    assert db._copy_text(stamp) == "2026-03-07T12:00:00+00:00"
+
+
+def test_copy_stream_renders_rows_lazily():
+    rows = ({"name": f"n{i}", "email": None} for i in range(3))
+    stream = db._CopyStream(rows, ("name", "email"))
+    assert stream.read(4) == b"n0\t\\"
+    assert stream.count == 1
+    assert stream.read() == b"N\nn1\t\\N\nn2\t\\N\n"
+    assert stream.count == 3 and stream.read() == b""
+
+
+def test_read_rows_csv_blank_cells_are_null(tmp_path):
+    path = tmp_path / "c.csv"
+    path.write_text("name,email\nAda,\n", encoding="utf-8")
+    assert list(db._read_rows(str(path))) == [{"name": "Ada", "email": None}]
+
+
+def test_unknown_table_is_rejected():
+    with pytest.raises(ValueError):
+        db.bulk_import("users", [])
+    with pytest.raises(ValueError):
+        db.bulk_export("users", io.StringIO())
+
+
+def test_import_upserts_and_export_round_trips(pg):
+    stats = pg.bulk_import("candidates", [
+        {"name": "Ada", "email": "ada@example.com", "resume_text": "first\ttext"},
+        {"name": "Bob", "email": "bob@example.com", "phone": "+1"},
+        {"name": "Ada L.", "email": "ada@example.com", "resume_text": "second"},   # last wins
+        {"name": "No email"},
+    ])
+    assert stats["staged"] == 4 and stats["merged"] == 2
+
+    # NULL fields don't overwrite stored values.
+    pg.bulk_import("candidates", [{"email": "bob@example.com", "name": "Robert"}])
+    bob = pg.get_candidate_by_email("bob@example.com")
+    assert bob["name"] == "Robert" and bob["phone"] == "+1"
+    assert pg.get_candidate_by_email("ada@example.com")["resume_text"] == "second"
+
+    stats = pg.bulk_import("screening_results", [
+        {"email": "ada@example.com", "decision": "Qualified", "reason": "multi\nline"},
+        {"email": "nobody@example.com", "decision": "Qualified"},
+    ])
+    assert stats["merged"] == 1 and stats["skipped"] == 1
+
+    out = io.StringIO()
+    assert pg.bulk_export("screening_results", out)["exported"] == 1
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert rows[0]["email"] == "ada@example.com" and rows[0]["reason"] == "multi\nline"
+
+    out = io.StringIO()
+    pg.bulk_export("candidates", out)
+    exported = {r["email"]: r for r in csv.DictReader(io.StringIO(out.getvalue()))}
+    assert exported["ada@example.com"]["resume_text"] == "second"
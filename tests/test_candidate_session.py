@@ -0,0 +1,116 @@
+"""Tests for utils.db.CandidateSession (user-003)."""
+
+import json
+
+import psycopg2
+import pytest
+
+from utils import db
+from utils.db import CandidateSession
+
+SCREENING = "Decision: Qualified\nReason: Strong MERN experience"
+EVALUATION = "Questions Asked: 5\nPerfect Answers: 3\nScore: 60\nDecision: Pass\nReason: ok"
+VERIFICATION = {"credibility_score": 85, "status": "VERIFIED", "recommendation": "proceed",
+                "checks": {"email": {"valid": True, "confidence": 90}}, "issues": []}
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """Record _write() calls instead of touching Postgres."""
+    calls = []
+
+    def fake_write(session):
+        calls.append((dict(session._candidate), {t: list(r) for t, r in session._rows.items()}))
+        return 42
+
+    monkeypatch.setattr(CandidateSession, "_write", fake_write)
+    monkeypatch.setattr(db, "WRITE_BEHIND", False)
+    return calls
+
+
+def test_with_block_flushes_once_on_exit(writes):
+    with CandidateSession(email="a@example.com") as session:
+        session.add_screening_result(SCREENING)
+        session.add_evaluation_result(EVALUATION)
+        assert session.pending == 2
+    assert session.candidate_id == 42 and session.pending == 0
+    assert len(writes) == 1
+    rows = writes[0][1]
+    assert rows["screening_results"] == [("Qualified", "Strong MERN experience", SCREENING)]
+    assert rows["evaluation_results"][0][:4] == (5, 3, 60.0, "Pass")
+
+
+@pytest.mark.parametrize("exc", [RuntimeError("verification agent crashed"), SystemExit(0)])
+def test_earlier_stages_survive_a_later_failure(writes, exc):
+    with pytest.raises(type(exc)):
+        with CandidateSession(email="a@example.com") as session:
+            session.add_screening_result(SCREENING)
+            raise exc
+    assert len(writes) == 1
+    assert len(writes[0][1]["screening_results"]) == 1
+
+
+def test_flush_without_changes_is_a_no_op(writes):
+    session = CandidateSession(candidate_id=7)
+    assert session.flush() == 7
+    assert writes == []
+
+
+def test_update_candidate_rejects_unknown_fields():
+    with pytest.raises(TypeError):
+        CandidateSession().update_candidate(salary="10 LPA")
+
+
+def test_failed_flush_keeps_buffer_for_retry(monkeypatch):
+    def broken(session):
+        raise psycopg2.errors.NotNullViolation("boom")
+
+    monkeypatch.setattr(CandidateSession, "_write", broken)
+    monkeypatch.setattr(db, "WRITE_BEHIND", False)
+    session = CandidateSession(email="a@example.com")
+    session.add_screening_result(SCREENING)
+    assert session.flush() is None
+    assert session.pending == 1 and not session.spooled
+
+
+def test_unreachable_db_spools_the_whole_flush(monkeypatch):
+    spooled = []
+
+    def down(session):
+        raise psycopg2.OperationalError("connection refused")
+
+    monkeypatch.setattr(CandidateSession, "_write", down)
+    monkeypatch.setattr(db, "WRITE_BEHIND", False)
+    # enqueue() serializes the payload immediately; so does this stand-in.
+    monkeypatch.setattr(db, "_spool", lambda op, payload, reason="":
+                        spooled.append((op, json.loads(json.dumps(payload)))) or True)
+    session = CandidateSession(email="a@example.com")
+    session.add_background_check(VERIFICATION)
+    session.flush()
+    assert session.spooled and session.pending == 0
+    op, payload = spooled[0]
+    assert op == "session" and payload["candidate"]["email"] == "a@example.com"
+    assert len(payload["rows"]["background_checks"]) == 1
+
+
+def test_flush_writes_candidate_and_results_in_one_transaction(pg):
+    with CandidateSession(name="Ada", email="ada@example.com", resume_text="resume") as session:
+        session.add_screening_result(SCREENING)
+        session.add_background_check(VERIFICATION)
+        session.add_interview_session("call-1", "+100", "Q1", transcript="T", duration_seconds=60)
+        session.add_evaluation_result(EVALUATION)
+
+    candidate = pg.get_candidate_by_email("ada@example.com")
+    assert candidate["id"] == session.candidate_id and candidate["resume_text"] == "resume"
+    rows = pg._fetch_all(
+        "SELECT (SELECT COUNT(*) FROM screening_results) AS s,"
+        "       (SELECT COUNT(*) FROM background_checks) AS b,"
+        "       (SELECT COUNT(*) FROM interview_sessions) AS i,"
+        "       (SELECT COUNT(*) FROM evaluation_results) AS e;")
+    assert rows == [{"s": 1, "b": 1, "i": 1, "e": 1}]
+
+    # A second flush for the same candidate only appends the new rows.
+    with CandidateSession(candidate_id=session.candidate_id) as again:
+        again.add_screening_result(SCREENING)
+    assert again.candidate_id == session.candidate_id
+    assert pg._fetch_all("SELECT COUNT(*) AS n FROM screening_results;") == [{"n": 2}]
@@ -0,0 +1,56 @@
+"""Tests for keyset pagination of candidates (user-007)."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from utils import db
+
+
+def test_cursor_round_trip():
+    row = {"created_at": datetime(2026, 3, 7, 9, 30, 0, 123456, tzinfo=timezone.utc), "id": 17}
+    assert db.decode_cursor(db.encode_cursor(row)) == (row["created_at"], 17)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "WzFd", db.encode_cursor(
+    {"created_at": datetime(2026, 1, 1), "id": 1})[:-3]])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        db.decode_cursor(cursor)
+
+
+def test_page_result_only_sets_cursor_when_more_rows():
+    rows = [{"created_at": datetime(2026, 1, 1), "id": i} for i in (3, 2, 1)]
+    assert db._page_result(rows, 3)["next_cursor"] is None
+    page = db._page_result(rows, 2)
+    assert [r["id"] for r in page["items"]] == [3, 2]
+    assert db.decode_cursor(page["next_cursor"])[1] == 2
+
+
+def test_pages_cover_every_row_once_despite_timestamp_ties(pg):
+    # One COPY transaction: every row gets the same created_at.
+    pg.bulk_import("candidates", [{"email": f"c{i}@example.com"} for i in range(7)])
+    seen, cursor = [], None
+    while True:
+        page = pg.get_candidates_page(limit=3, cursor=cursor)
+        seen += [row["id"] for row in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == sorted(seen, reverse=True) and len(seen) == len(set(seen)) == 7
+    assert [row["id"] for row in pg.iter_candidates(itersize=2)] == seen
+
+
+def test_filters_apply_to_latest_evaluation(pg):
+    pg.bulk_import("candidates", [{"email": "pass@example.com"}, {"email": "fail@example.com"},
+                                  {"email": "none@example.com"}])
+    pg.bulk_import("evaluation_results", [
+        {"email": "pass@example.com", "decision": "Pass", "score": 80},
+        {"email": "fail@example.com", "decision": "Fail", "score": 30},
+    ])
+    emails = lambda **f: {r["email"] for r in pg.get_candidates_page(**f)["items"]}  # noqa: E731
+    assert emails(decision="pass") == {"pass@example.com"}
+    assert emails(min_score=50) == {"pass@example.com"}
+    assert emails(max_score=50) == {"fail@example.com"}
+    assert len(emails()) == 3
+    assert emails(created_from=datetime(2100, 1, 1, tzinfo=timezone.utc)) == set()
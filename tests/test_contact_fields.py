@@ -0,0 +1,105 @@
+"""Tests for the single-pass contact extractor (user-018)."""
+
+import re
+
+import pytest
+
+from utils.resume_parser import extract_contact_fields, extract_email, extract_resume_data
+
+RESUME = """Jane Doe
+Full-stack developer
+jane.doe@example.com | +1 415-555-0100
+linkedin.com/in/jane-doe | github.com/janedoe
+"""
+
+
+# The extract_email()/extract_phone() searches the extractor replaced.
+def old_email(text):
+    match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', text)
+    return match.group(0) if match else None
+
+
+def old_phone(text):
+    match = re.search(r'(\+?\d{1,3}[-.\s]?)?(\d{10}|\d{3}[-.\s]?\d{3}[-.\s]?\d{4})', text)
+    return match.group(0).strip() if match else None
+
+
+def values(text):
+    return {field: f["value"] for field, f in extract_contact_fields(text).items()}
+
+
+def test_typical_resume():
+    assert values(RESUME) == {"name": "Jane Doe", "email": "jane.doe@example.com",
+                              "phone": "+1 415-555-0100",
+                              "linkedin": "linkedin.com/in/jane-doe", "github": "janedoe"}
+    assert extract_resume_data(RESUME)["phone"] == "+1 415-555-0100"
+
+
+@pytest.mark.parametrize("text", [
+    RESUME,
+    "Email: a.b-c@mail.example.co.uk\nPhone: 9876543210",
+    "Contact: (no email) 415.555.0100",
+    "Nothing to see here",
+])
+def test_matches_the_old_extractors_on_ordinary_text(text):
+    data = extract_resume_data(text)
+    assert (data["email"], data["phone"]) == (old_email(text), old_phone(text))
+    assert extract_email(text) == old_email(text)
+
+
+def test_digits_inside_urls_and_emails_are_not_a_phone():
+    text = "jane4155550100@example.com\ngithub.com/dev9876543210\nPhone: 212 555 0199"
+    assert old_phone(text) == "4155550100"
+    assert extract_resume_data(text)["phone"] == "212 555 0199"
+
+
+def test_email_tags_and_tlds():
+    assert old_email("jane+jobs@example.com") == "jobs@example.com"
+    assert extract_email("jane+jobs@example.com") == "jane+jobs@example.com"
+    assert old_email("jane@example.c0") == "jane@example.c0"
+    assert extract_email("jane@example.c0") is None
+
+
+def test_confidence_for_absent_and_unresolved_fields():
+    fields = extract_contact_fields("Jane Doe\nReach me @ my desk; see LinkedIn.")
+    assert fields["email"] == {"value": None, "confidence": 0.0}
+    assert fields["linkedin"] == {"value": None, "confidence": 0.0}
+    assert fields["github"] == {"value": None, "confidence": 1.0}
+    assert fields["name"] == {"value": "Jane Doe", "confidence": 0.8}
+
+
+def test_labels_and_name_prefix():
+    fields = extract_contact_fields("Jane Doe\nGitHub: jdoe\nName: Jane Quinn Doe")
+    assert fields["name"]["value"] == "Jane Quinn Doe"
+    assert fields["github"] == {"value": "jdoe", "confidence": 0.8}
+    assert extract_contact_fields("Jane Doe - React Engineer")["name"] == \
+        {"value": "Jane Doe", "confidence": 0.5}
+
+
+def test_llm_is_only_asked_for_unresolved_fields(monkeypatch):
+    from agents import background_verification_agent as agent
+    prompts = []
+    monkeypatch.setattr(agent, "chat", lambda name, prompt: prompts.append(prompt)
+                        or "LinkedIn: https://linkedin.com/in/jd")
+
+    assert agent.extract_candidate_info(RESUME)["email"] == "jane.doe@example.com"
+    assert prompts == []
+
+    info = agent.extract_candidate_info("Jane Doe\njane@example.com\nFind me on LinkedIn")
+    assert info["linkedin"] == "https://linkedin.com/in/jd"
+    assert info["email"] == "jane@example.com"
+    assert "LinkedIn:" in prompts[0] and "Email:" not in prompts[0]
+
+
+def test_llm_sees_markers_outside_the_contact_header(monkeypatch):
+    from agents import background_verification_agent as agent
+    prompts = []
+    monkeypatch.setattr(agent, "chat", lambda name, prompt: prompts.append(prompt)
+                        or "GitHub: jdoe-dev")
+
+    text = ("Jane Doe\njane@example.com\n\nExperience\nBuilt a checkout service\n"
+            "Projects\nMy code lives on GitHub under jdoe-dev\nA todo app\n")
+    assert agent.extract_candidate_info(text)["github"] == "jdoe-dev"
+    [prompt] = prompts
+    assert "Jane Doe" in prompt and "My code lives on GitHub under jdoe-dev" in prompt
+    assert "checkout" not in prompt and "todo" not in prompt
@@ -0,0 +1,89 @@
+"""Tests for the per-host circuit breakers in utils.db.get_connection (user-002)."""
+
+import psycopg2
+import pytest
+
+from utils import db
+from utils.db import CircuitBreaker, CircuitOpenError
+
+
+def test_breaker_opens_after_threshold_and_half_opens_after_cooldown(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(db.time, "monotonic", lambda: clock[0])
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=30)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.snapshot() == {"state": "open", "failures": 2}
+    assert not breaker.allow()
+
+    clock[0] += 30
+    assert breaker.allow()                      # the one trial attempt
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+
+def test_half_open_failure_reopens_and_success_closes(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(db.time, "monotonic", lambda: clock[0])
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=10)
+
+    breaker.record_failure()
+    clock[0] = 10
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    clock[0] = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.snapshot() == {"state": "closed", "failures": 0}
+
+
+@pytest.fixture
+def hosts(monkeypatch):
+    """Two configured hosts with fresh breakers; returns the connect log and the down set."""
+    monkeypatch.setenv("DB_HOST", "direct")
+    monkeypatch.setenv("DB_POOLER_HOST", "pooler")
+    monkeypatch.setenv("DB_PROBE_INTERVAL", "0")
+    monkeypatch.setattr(db, "_breakers", {})
+    monkeypatch.setattr(db, "_last_good_host", None)
+    attempts, down = [], set()
+
+    def connect(host):
+        attempts.append(host)
+        if host in down:
+            raise psycopg2.OperationalError(f"{host} unreachable")
+        return host
+
+    monkeypatch.setattr(db, "_connect", connect)
+    return attempts, down
+
+
+def test_falls_back_and_sticks_to_working_host(hosts):
+    attempts, down = hosts
+    down.add("direct")
+    assert db.get_connection() == "pooler"
+    assert db.get_connection() == "pooler"
+    assert attempts == ["direct", "pooler", "pooler"]
+    status = db.get_host_status()
+    assert status["active_host"] == "pooler"
+    assert status["hosts"]["direct"]["state"] == "open"
+
+
+def test_all_hosts_cooling_down_raises_circuit_open(hosts):
+    attempts, down = hosts
+    down.update({"direct", "pooler"})
+    with pytest.raises(psycopg2.OperationalError):
+        db.get_connection()
+    with pytest.raises(CircuitOpenError):
+        db.get_connection()
+    assert attempts == ["direct", "pooler"]
+
+
+def test_no_host_configured(monkeypatch):
+    monkeypatch.delenv("DB_HOST", raising=False)
+    monkeypatch.delenv("DB_POOLER_HOST", raising=False)
+    with pytest.raises(psycopg2.OperationalError, match="No DB host"):
+        db.get_connection()
@@ -0,0 +1,177 @@
+"""Tests for utils.db.ConnectionPool / pooled_connection (user-001)."""
+
+import threading
+
+import psycopg2
+import psycopg2.extensions
+import pytest
+
+from utils import db
+from utils.db import ConnectionPool, PoolTimeout
+
+
+class FakeConn:
+    """Just enough of a psycopg2 connection for the pool."""
+
+    def __init__(self, ping_ok=True):
+        self.closed = 0
+        self.ping_ok = ping_ok
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        self.rollbacks = 0
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def cursor(self):
+        conn = self
+
+        class Cursor:
+            def execute(self, sql):
+                if not conn.ping_ok:
+                    raise psycopg2.OperationalError("server closed the connection")
+
+            def fetchone(self):
+                return (1,)
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+    def close(self):
+        self.closed = 1
+
+
+def make_pool(**kwargs):
+    opened = []
+
+    def connect():
+        conn = FakeConn()
+        opened.append(conn)
+        return conn
+
+    kwargs.setdefault("timeout", 0.2)
+    return ConnectionPool(connect, **kwargs), opened
+
+
+def test_reuses_idle_connection_lifo():
+    pool, opened = make_pool(maxconn=3)
+    a, b = pool.getconn(), pool.getconn()
+    pool.putconn(a)
+    pool.putconn(b)
+    assert pool.getconn() is b
+    assert len(opened) == 2
+    assert pool.stats()["checkouts"] == 3
+
+
+def test_rejects_invalid_sizes():
+    with pytest.raises(ValueError):
+        ConnectionPool(FakeConn, minconn=3, maxconn=2)
+    with pytest.raises(ValueError):
+        ConnectionPool(FakeConn, maxconn=0)
+
+
+def test_checkout_times_out_when_exhausted():
+    pool, _ = make_pool(maxconn=1, timeout=0.05)
+    pool.getconn()
+    with pytest.raises(PoolTimeout):
+        pool.getconn()
+    assert pool.stats()["waits"] >= 1
+
+
+def test_waiter_gets_returned_connection():
+    pool, _ = make_pool(maxconn=1, timeout=2)
+    conn = pool.getconn()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.getconn()))
+    waiter.start()
+    pool.putconn(conn)
+    waiter.join(2)
+    assert got == [conn]
+
+
+def test_open_transaction_is_rolled_back_on_return():
+    pool, _ = make_pool()
+    conn = pool.getconn()
+    conn.status = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+    pool.putconn(conn)
+    assert conn.rollbacks == 1
+    assert pool.stats()["idle"] == 1
+
+
+def test_broken_and_discarded_connections_are_dropped():
+    pool, _ = make_pool()
+    conn = pool.getconn()
+    conn.status = psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN
+    pool.putconn(conn)
+    assert conn.closed and pool.stats()["size"] == 0
+
+    conn = pool.getconn()
+    pool.putconn(conn, discard=True)
+    assert conn.closed and pool.stats()["size"] == 0
+
+
+def test_stale_connection_is_pinged_and_replaced():
+    pool, opened = make_pool(ping_after=0)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    conn.ping_ok = False
+    fresh = pool.getconn()
+    assert fresh is not conn and conn.closed
+    assert pool.stats()["failed_pings"] == 1
+    assert len(opened) == 2
+
+
+def test_expired_connections_are_evicted_above_minconn():
+    pool, _ = make_pool(minconn=0, max_lifetime=0)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    other = pool.getconn()
+    assert other is not conn and conn.closed
+
+
+def test_connect_failure_frees_the_slot():
+    def connect():
+        raise psycopg2.OperationalError("down")
+
+    pool = ConnectionPool(connect, maxconn=1, timeout=0.05)
+    for _ in range(2):
+        with pytest.raises(psycopg2.OperationalError):
+            pool.getconn()
+    assert pool.stats()["size"] == 0
+
+
+def test_warm_opens_minconn_and_closeall_closes_idle():
+    pool, opened = make_pool(minconn=2, maxconn=4)
+    pool.warm()
+    assert pool.stats()["idle"] == 2
+    pool.closeall()
+    assert all(c.closed for c in opened)
+    with pytest.raises(psycopg2.InterfaceError):
+        pool.getconn()
+
+
+def test_pooled_connection_discards_on_operational_error(monkeypatch):
+    pool, _ = make_pool()
+    monkeypatch.setattr(db, "get_pool", lambda: pool)
+    with pytest.raises(psycopg2.OperationalError):
+        with db.pooled_connection():
+            raise psycopg2.OperationalError("lost")
+    assert pool.stats()["size"] == 0
+
+    with db.pooled_connection() as conn:
+        pass
+    assert pool.stats()["idle"] == 1 and not conn.closed
+
+
+def test_pooled_connection_round_trip(pg):
+    with pg.pooled_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT 1;")
+        assert cur.fetchone() == (1,)
+        cur.close()
+    assert pg.get_pool().stats()["idle"] >= 1
@@ -0,0 +1,119 @@
+"""Tests for the MinHash/LSH near-duplicate index (user-023)."""
+
+import os
+import random
+
+import pytest
+
+from utils import dedupe_index
+from utils.dedupe_index import DedupeIndex, signature, similarity
+
+_WORDS = ("react node mongodb express docker kubernetes python typescript graphql "
+          "redis postgres aws lambda kafka built shipped led designed scaled migrated "
+          "service api team latency users checkout payments search queue cache").split()
+
+
+def resume(seed, words=200, name="Jane Doe", email="jane@example.com"):
+    rng = random.Random(seed)
+    body = " ".join(rng.choice(_WORDS) for _ in range(words))
+    return f"{name}\n{email}\n\nExperience\n{body}\n"
+
+
+def edited(text, changes, seed=0):
+    words = text.split(" ")
+    rng = random.Random(seed)
+    for _ in range(changes):
+        words[rng.randrange(len(words))] = "changed"
+    return " ".join(words)
+
+
+@pytest.fixture
+def index(tmp_path):
+    return DedupeIndex(str(tmp_path / "index.bin"))
+
+
+def test_similarity_tracks_edits():
+    base = resume(1)
+    assert similarity(signature(base), signature(base)) == 1.0
+    assert similarity(signature(base), signature(edited(base, 3))) > 0.8
+    assert similarity(signature(base), signature(resume(2))) < 0.3
+
+
+def test_contact_header_is_ignored():
+    a = resume(1)
+    b = resume(1, name="John Roe", email="john.roe@agency.example")
+    assert signature(a) == signature(b)
+
+
+def test_copy_under_another_key_is_flagged(index):
+    assert index.check_and_add("jane@example.com", resume(1)) == []
+    assert index.check_and_add("other@example.com", resume(2)) == []
+    [(key, score)] = index.check_and_add("copy@example.com",
+                                         edited(resume(1, name="Copy Cat"), 3))
+    assert key == "jane@example.com" and score > 0.8
+    # The same candidate re-applying is not their own duplicate.
+    assert index.check_and_add("jane@example.com", resume(1)) == \
+        [("copy@example.com", pytest.approx(score))]
+
+
+@pytest.mark.parametrize("text", ["", "   \n", "Jane Doe\njane@example.com",
+                                  "Scanned resume, no text layer " * 2])
+def test_empty_and_short_texts_are_neither_checked_nor_indexed(index, text):
+    assert signature(text) is None
+    assert index.check_and_add("a@example.com", text) == []
+    assert index.check_and_add("b@example.com", text) == []
+    assert index.add("c@example.com", text) is None
+    assert index.query(text) == []
+    assert len(index) == 0 and not os.path.exists(index.path)
+
+
+def test_same_key_and_signature_is_not_appended_again(index):
+    text = resume(1)
+    index.check_and_add("jane@example.com", text)
+    size = os.path.getsize(index.path)
+    index.check_and_add("jane@example.com", text)
+    index.add("jane@example.com", text)
+    assert len(index) == 1 and os.path.getsize(index.path) == size
+
+    index.check_and_add("jane@example.com", edited(text, 20))     # an updated resume
+    assert len(index) == 2
+
+
+def test_index_is_shared_through_the_file(index):
+    other = DedupeIndex(index.path)
+    index.add("jane@example.com", resume(1))
+    assert [key for key, _ in other.query(resume(1))] == ["jane@example.com"]
+    # Already indexed by the other process: not appended twice.
+    size = os.path.getsize(index.path)
+    other.add("jane@example.com", resume(1))
+    assert os.path.getsize(index.path) == size
+
+
+def test_torn_tail_is_cut_before_the_next_append(index):
+    index.add("jane@example.com", resume(1))
+    with open(index.path, "ab") as f:
+        f.write(b"\x05\x00ab")                  # crash mid-append
+    assert len(DedupeIndex(index.path)) == 1
+    index.add("john@example.com", resume(2))
+    fresh = DedupeIndex(index.path)
+    assert len(fresh) == 2 and fresh._offset == os.path.getsize(index.path)
+
+
+def test_wrong_index_file_is_rejected(tmp_path):
+    path = tmp_path / "index.bin"
+    path.write_bytes(b"NOPE\x80\x00")
+    with pytest.raises(ValueError, match="not a 128-bin dedupe index"):
+        DedupeIndex(str(path))
+
+
+def test_bands_sit_below_the_threshold():
+    for threshold in (0.5, 0.8, 0.9):
+        bands = dedupe_index._bands_for(threshold, 128)
+        assert (1 / bands) ** (bands / 128) <= threshold
+
+
+def test_in_memory_index():
+    index = DedupeIndex(path=None)
+    index.add("jane@example.com", resume(1))
+    assert index.query(resume(1), exclude_key="jane@example.com") == []
+    assert index.query(resume(1))[0][0] == "jane@example.com"
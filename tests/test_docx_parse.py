@@ -0,0 +1,69 @@
+"""Tests for the streaming DOCX extractor (user-022)."""
+
+import io
+import zipfile
+
+import pytest
+
+from utils.resume_parser import extract_resume_text, iter_docx_lines, parse_docx
+
+_NS = ('xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+       'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"')
+
+
+def raw_docx(body, **parts):
+    """A .docx holding only word/document.xml (plus any extra parts)."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr("word/document.xml", f"<w:document {_NS}><w:body>{body}</w:body></w:document>")
+        for name, xml in parts.items():
+            z.writestr(f"word/{name}.xml", f"<w:hdr {_NS}>{xml}</w:hdr>")
+    buf.seek(0)
+    return buf
+
+
+def test_paragraphs_and_tables(tmp_path, make_docx):
+    path = make_docx(tmp_path / "cv.docx", ["Jane Doe", "", "Skills"],
+                     table=[["React", "Node.js"], ["MongoDB", ""]])
+    assert list(iter_docx_lines(path)) == ["Jane Doe", "Skills", "React | Node.js", "MongoDB"]
+
+
+def test_repeated_headers_are_kept_once(tmp_path, make_docx):
+    from docx import Document
+    path = make_docx(tmp_path / "cv.docx", ["Body"], header="Jane Doe · jane@example.com")
+    doc = Document(path)
+    doc.sections[0].different_first_page_header_footer = True
+    doc.sections[0].first_page_header.paragraphs[0].text = "Jane Doe · jane@example.com"
+    doc.save(path)
+    assert parse_docx(path) == "Jane Doe · jane@example.com\nBody"
+
+
+def test_runs_tabs_breaks_and_fallback_content():
+    body = ("<w:p><w:r><w:t>Jane</w:t></w:r><w:r><w:t xml:space='preserve'> Doe</w:t></w:r></w:p>"
+            "<w:p><w:r><w:t>a</w:t><w:tab/><w:t>b</w:t><w:br/><w:t>c</w:t></w:r></w:p>"
+            "<w:p><mc:AlternateContent><mc:Choice><w:r><w:t>shape</w:t></w:r></mc:Choice>"
+            "<mc:Fallback><w:p><w:r><w:t>shape</w:t></w:r></w:p></mc:Fallback>"
+            "</mc:AlternateContent></w:p>")
+    assert list(iter_docx_lines(raw_docx(body))) == ["Jane Doe", "a\tb\nc", "shape"]
+
+
+def test_headers_come_first_and_footers_last():
+    source = raw_docx("<w:p><w:r><w:t>Body</w:t></w:r></w:p>",
+                      footer1="<w:p><w:r><w:t>Page</w:t></w:r></w:p>",
+                      header1="<w:p><w:r><w:t>Top</w:t></w:r></w:p>")
+    assert list(iter_docx_lines(source)) == ["Top", "Body", "Page"]
+
+
+def test_zip_without_a_document_part_is_rejected(tmp_path):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr("xl/workbook.xml", "<workbook/>")
+    with pytest.raises(ValueError, match="not a .docx"):
+        list(iter_docx_lines(io.BytesIO(buf.getvalue())))
+    with pytest.raises(ValueError, match="not a .docx"):
+        extract_resume_text(buf.getvalue())
+
+
+def test_char_limit(tmp_path, make_docx):
+    path = make_docx(tmp_path / "cv.docx", ["x" * 30] * 10)
+    assert len(parse_docx(path, max_chars=50)) == 50
@@ -0,0 +1,78 @@
+"""Tests for the cached DB health monitor (user-010)."""
+
+import asyncio
+
+from utils import async_db, health
+from utils.health import HealthMonitor
+
+
+def test_snapshot_before_first_check_is_not_ready():
+    snap = HealthMonitor().snapshot()
+    assert snap["ready"] is False and snap["stale"] is True
+    assert snap["error"] == "not checked yet"
+
+
+def test_refresh_records_success_and_failure(monkeypatch):
+    state = {"ok": True}
+
+    async def ping():
+        if not state["ok"]:
+            raise ConnectionRefusedError("connection refused")
+
+    monkeypatch.setattr(async_db, "ping", ping)
+    monitor = HealthMonitor(ttl=5, timeout=1)
+
+    assert asyncio.run(monitor.refresh()) is True
+    snap = monitor.snapshot()
+    assert snap["ready"] and snap["database"] == "connected" and snap["error"] is None
+
+    state["ok"] = False
+    assert asyncio.run(monitor.refresh()) is False
+    snap = monitor.snapshot()
+    assert not snap["ready"] and snap["error"] == "connection refused"
+
+
+def test_hung_ping_times_out(monkeypatch):
+    async def ping():
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(async_db, "ping", ping)
+    monitor = HealthMonitor(ttl=5, timeout=0.05)
+    assert asyncio.run(monitor.refresh()) is False
+    assert monitor.snapshot()["error"] == "timed out after 0.05s"
+
+
+def test_stale_snapshot_is_not_ready(monkeypatch):
+    async def ping():
+        pass
+
+    monkeypatch.setattr(async_db, "ping", ping)
+    monitor = HealthMonitor(ttl=1, timeout=1)
+    asyncio.run(monitor.refresh())
+    checked_at = monitor._checked_at
+    monkeypatch.setattr(health.time, "monotonic", lambda: checked_at + 10)
+    snap = monitor.snapshot()
+    assert snap["stale"] and not snap["ready"] and snap["database"] == "connected"
+
+
+def test_background_loop_refreshes_until_stopped(monkeypatch):
+    calls = []
+
+    async def ping():
+        calls.append(1)
+
+    monkeypatch.setattr(async_db, "ping", ping)
+
+    async def body():
+        monitor = HealthMonitor(ttl=0.01, timeout=1)
+        monitor.start()
+        monitor.start()                         # idempotent
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+        count = len(calls)
+        await asyncio.sleep(0.05)
+        return monitor, count
+
+    monitor, count = asyncio.run(body())
+    assert count >= 2 and len(calls) == count
+    assert monitor.snapshot()["ready"]
@@ -0,0 +1,86 @@
+"""Tests for the append-only JSONL fallback log (user-012)."""
+
+import json
+import multiprocessing
+
+from utils import json_store
+
+
+def test_append_and_read_back(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    json_store.append_records([{"n": 1}, {"n": 2, "name": "Zoë"}], path)
+    json_store.append_records([{"n": 3}], path)
+    assert [r["n"] for r in json_store.iter_candidate_records(path)] == [1, 2, 3]
+    assert "Zoë" in open(path, encoding="utf-8").read()
+
+
+def test_torn_and_blank_lines_are_skipped(tmp_path):
+    path = tmp_path / "log.jsonl"
+    path.write_bytes(b'{"n": 1}\n\n{"n": 2}\n{"n": ')
+    assert [r["n"] for r in json_store.iter_candidate_records(str(path))] == [1, 2]
+
+
+def test_rotation_gzips_segments_and_keeps_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(json_store, "_ROTATE_BYTES", 40)
+    monkeypatch.setattr(json_store, "_GZIP_ROTATED", True)
+    path = str(tmp_path / "log.jsonl")
+    for n in range(6):
+        json_store.append_records([{"n": n, "pad": "x" * 20}], path)
+    files = json_store.log_files(path)
+    assert any(name.endswith(".gz") for name in files)
+    assert [r["n"] for r in json_store.iter_candidate_records(path)] == list(range(6))
+
+
+def test_convert_legacy_array(tmp_path):
+    src, dst = tmp_path / "old.json", str(tmp_path / "log.jsonl")
+    src.write_text(json.dumps([{"n": 1}, {"n": 2}]), encoding="utf-8")
+    assert json_store.convert_legacy_json(str(src), dst) == 2
+    assert not src.exists() and (tmp_path / "old.json.migrated").exists()
+    assert [r["n"] for r in json_store.iter_candidate_records(dst)] == [1, 2]
+    assert json_store.convert_legacy_json(str(src), dst) == 0
+
+
+def _append_many(path, worker):
+    for i in range(50):
+        json_store.append_records([{"worker": worker, "i": i, "pad": "y" * 500}], path)
+
+
+def test_concurrent_processes_never_interleave_lines(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_append_many, args=(path, w)) for w in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    with open(path, "rb") as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 200
+
+
+def test_results_the_db_loses_go_to_the_log(tmp_path, monkeypatch):
+    import psycopg2
+    from utils import db, write_spool
+
+    def down():
+        raise psycopg2.OperationalError("connection refused")
+
+    def disk_full(op, payload):
+        raise OSError("No space left on device")
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(db, "WRITE_BEHIND", False)
+    monkeypatch.setattr(db, "pooled_connection", down)
+    monkeypatch.setattr(write_spool, "enqueue", disk_full)
+    json_store.store_candidate_json({"decision": "Pass", "remarks": "lost"})
+
+    # Spooled instead: nothing for the log.
+    monkeypatch.setattr(write_spool, "enqueue", lambda op, payload: "id")
+    json_store.store_candidate_json({"decision": "Pass", "remarks": "queued"})
+
+    monkeypatch.setattr(json_store, "store_candidate_result", lambda data: 1 / 0)
+    json_store.store_candidate_json({"decision": "Fail", "remarks": "raised"})
+
+    records = list(json_store.iter_candidate_records())
+    assert [r["remarks"] for r in records] == ["lost", "raised"]
+    assert all("timestamp" in r for r in records)
@@ -0,0 +1,66 @@
+"""Tests for the shared LLM gateway (user-024)."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from utils import llm
+
+
+class FakeCompletions:
+    def __init__(self, reply="  ok  "):
+        self.reply = reply
+        self.calls = []
+
+    def create(self, **params):
+        self.calls.append(params)
+        message = SimpleNamespace(content=self.reply)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    fake = FakeCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=fake))
+    monkeypatch.setattr(llm, "get_client", lambda: client)
+    return fake
+
+
+def test_max_tokens_defaults_to_the_provider(completions):
+    assert all(config.max_tokens is None for config in llm.AGENTS.values())
+    assert llm.chat("questions", "Ask something") == "ok"
+    [params] = completions.calls
+    assert "max_tokens" not in params
+    assert params["messages"] == [{"role": "user", "content": "Ask something"}]
+    assert params["temperature"] == 0.4 and params["model"] == llm.LLM_MODEL
+
+
+def test_settings_come_from_the_environment(monkeypatch):
+    monkeypatch.setenv("LLM_CURVEBALL_MAX_TOKENS", "300")
+    monkeypatch.setenv("LLM_CURVEBALL_MODEL", "some/model")
+    monkeypatch.setenv("LLM_CURVEBALL_TEMPERATURE", "0.9")
+    monkeypatch.setenv("LLM_CURVEBALL_CACHE_TTL", "60")
+    config = llm._agent("curveball", 0.5)
+    assert config == llm.AgentConfig(model="some/model", temperature=0.9,
+                                     timeout=llm.LLM_TIMEOUT, max_tokens=300, cache_ttl=60)
+    assert llm._agent("screening", 0.2).max_tokens is None
+
+
+def test_per_call_overrides(completions):
+    llm.chat("evaluation", "Score this", max_tokens=50, temperature=0.0)
+    [params] = completions.calls
+    assert params["max_tokens"] == 50 and params["temperature"] == 0.0
+
+
+def test_unknown_agent():
+    with pytest.raises(KeyError):
+        llm.chat("nobody", "hi")
+
+
+def test_client_is_built_once_and_closed(monkeypatch):
+    monkeypatch.setattr(llm, "_client", None)
+    client = llm.get_client()
+    assert llm.get_client() is client
+    assert str(client.base_url).rstrip("/") == llm.LLM_BASE_URL.rstrip("/")
+    llm.close_client()
+    assert llm._client is None
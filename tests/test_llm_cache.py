@@ -0,0 +1,109 @@
+"""Tests for the LLM response cache (user-025)."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utils import llm, llm_cache
+from utils.llm_cache import ResponseCache, normalize_prompt
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(tmp_path / "llm_cache", mem_entries=2)
+
+
+def test_normalize_prompt():
+    assert normalize_prompt("  Score this:  \r\nJane   \n\n") == "Score this:\nJane"
+    key = ResponseCache.key
+    assert key("m", "a\r\nb  \n", 0.1, None) == key("m", "a\nb", 0.1, None)
+    assert key("m", "a b", 0.1, None) != key("m", "a  b", 0.1, None)
+    assert key("m", "a", 0.1, None) != key("m", "a", 0.1, 500)
+    assert key("m", "a", 0.1, None) != key("other", "a", 0.1, None)
+
+
+def test_memory_then_disk_hits(cache, tmp_path):
+    cache.put("k", "Pass")
+    assert cache.get("k", ttl=60) == "Pass"
+
+    # A fresh process only has the disk tier; the hit is promoted to memory.
+    other = ResponseCache(tmp_path / "llm_cache")
+    assert other.get("k", ttl=60) == "Pass"
+    assert other.get("k", ttl=60) == "Pass"
+    stats = other.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["memory_entries"]) == (1, 1, 1)
+
+
+def test_ttl_expiry_and_misses(cache, monkeypatch):
+    cache.put("k", "Pass")
+    later = time.time() + 120
+    monkeypatch.setattr(llm_cache.time, "time", lambda: later)
+    assert cache.get("k", ttl=60) is None
+    assert cache.get("k", ttl=600) == "Pass"
+    assert cache.get("missing", ttl=600) is None
+    stats = cache.stats()
+    assert stats["expired"] == 1 and stats["misses"] == 1 and stats["stores"] == 1
+    assert stats["hit_rate"] == pytest.approx(1 / 3, abs=0.001)
+
+
+def test_memory_tier_is_an_lru(tmp_path):
+    cache = ResponseCache(directory=None, mem_entries=2)
+    for key in ("a", "b"):
+        cache.put(key, key.upper())
+    cache.get("a", ttl=60)
+    cache.put("c", "C")
+    assert cache.get("b", ttl=60) is None
+    assert cache.get("a", ttl=60) == "A" and cache.get("c", ttl=60) == "C"
+
+
+def test_stats_when_disabled(monkeypatch):
+    monkeypatch.setattr(llm_cache, "CACHE_ENABLED", False)
+    assert llm_cache.get_cache() is None
+    assert llm_cache.stats() == {"enabled": False}
+
+
+@pytest.fixture
+def calls(monkeypatch, cache):
+    calls = []
+
+    def create(**params):
+        calls.append(params)
+        message = SimpleNamespace(content=f" reply {len(calls)} ")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(llm, "get_client", lambda: client)
+    monkeypatch.setattr(llm, "get_cache", lambda: cache)
+    return calls
+
+
+def test_chat_answers_repeats_from_the_cache(calls):
+    assert llm.chat("screening", "Screen Jane") == "reply 1"
+    assert llm.chat("screening", "Screen Jane\n") == "reply 1"
+    assert llm.chat("screening", "Screen John") == "reply 2"
+    # A different temperature is a different request.
+    assert llm.chat("screening", "Screen Jane", temperature=0.9) == "reply 3"
+    assert len(calls) == 3
+
+
+def test_uncached_agents_and_empty_replies(calls, cache):
+    assert llm.chat("questions", "Ask") == "reply 1"
+    assert llm.chat("questions", "Ask") == "reply 2"
+    assert cache.stats()["stores"] == 0
+
+    llm.get_client().chat.completions.create = lambda **p: SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="  "))])
+    assert llm.chat("evaluation", "Score") == ""
+    assert cache.stats()["stores"] == 0
+
+
+def test_stats_endpoint(monkeypatch, cache):
+    from fastapi.testclient import TestClient
+    import server
+    monkeypatch.setattr(llm_cache, "CACHE_ENABLED", True)
+    monkeypatch.setattr(llm_cache, "_cache", cache)
+    cache.put("k", "Pass")
+    cache.get("k", ttl=60)
+    body = TestClient(server.app).get("/llm-cache").json()
+    assert body["enabled"] is True and body["memory_hits"] == 1 and body["hit_rate"] == 1.0
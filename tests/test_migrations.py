@@ -0,0 +1,72 @@
+"""Tests for the versioned schema migrations (user-008)."""
+
+import threading
+
+import psycopg2
+import pytest
+
+from utils import db
+
+
+def test_migration_versions_are_strictly_increasing():
+    versions = [version for version, _, _ in db.MIGRATIONS]
+    assert versions == sorted(set(versions)) and versions[0] == 1
+    assert db.LATEST_SCHEMA_VERSION == versions[-1]
+
+
+def test_migrated_database_is_a_single_select(pg):
+    assert pg.migrate() == pg.LATEST_SCHEMA_VERSION
+    with pg.pooled_connection() as conn:
+        assert pg.get_schema_version(conn) == pg.LATEST_SCHEMA_VERSION
+
+
+@pytest.fixture
+def fresh_db(pg, monkeypatch):
+    """An empty scratch database next to TEST_DB_NAME, with its own pool."""
+    name = db._connect_params()["database"] + "_fresh"
+    admin = db.get_connection()
+    admin.autocommit = True
+    cur = admin.cursor()
+    cur.execute(f"DROP DATABASE IF EXISTS {name};")
+    cur.execute(f"CREATE DATABASE {name};")
+    monkeypatch.setenv("DB_NAME", name)
+    monkeypatch.setattr(db, "_pool", None)
+    yield name
+    db.close_pool()
+    cur.execute(f"DROP DATABASE IF EXISTS {name};")
+    admin.close()
+
+
+def test_concurrent_startups_apply_each_migration_once(fresh_db):
+    with db.pooled_connection() as conn:
+        assert db.get_schema_version(conn) == 0
+
+    results, errors = [], []
+
+    def start():
+        try:
+            results.append(db.migrate())
+        except Exception as e:                  # pragma: no cover - reported below
+            errors.append(e)
+
+    workers = [threading.Thread(target=start) for _ in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    assert not errors
+    assert results == [db.LATEST_SCHEMA_VERSION] * 4
+
+    rows = db._fetch_all("SELECT version FROM schema_version ORDER BY version;")
+    assert [r["version"] for r in rows] == [v for v, _, _ in db.MIGRATIONS]
+    assert db.get_pipeline_stats()["total_candidates"] == 0
+
+
+def test_failed_migration_rolls_back(fresh_db, monkeypatch):
+    broken = db.MIGRATIONS + [(db.LATEST_SCHEMA_VERSION + 1, "broken", "SELECT nope;")]
+    monkeypatch.setattr(db, "MIGRATIONS", broken)
+    monkeypatch.setattr(db, "LATEST_SCHEMA_VERSION", broken[-1][0])
+    with pytest.raises(psycopg2.errors.UndefinedColumn):
+        db.migrate()
+    with db.pooled_connection() as conn:
+        assert db.get_schema_version(conn) == 0
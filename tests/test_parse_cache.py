@@ -0,0 +1,96 @@
+"""Tests for the on-disk parse cache (user-017)."""
+
+import os
+import time
+
+import pytest
+
+from utils import parse_cache, resume_parser
+from utils.parse_cache import ParseCache, buffer_hash, file_hash
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ParseCache(tmp_path / "cache", max_bytes=1 << 20)
+    monkeypatch.setattr(resume_parser, "get_cache", lambda: cache)
+    return cache
+
+
+def test_hashes_agree(tmp_path):
+    path = tmp_path / "cv.bin"
+    path.write_bytes(b"resume bytes" * 100_000)
+    assert file_hash(str(path)) == buffer_hash(path.read_bytes())
+    assert buffer_hash(memoryview(path.read_bytes())) == file_hash(str(path))
+
+
+def test_key_depends_on_version():
+    assert ParseCache.key("abc", "5:10:20000") != ParseCache.key("abc", "6:10:20000")
+    assert ParseCache.key("abc", "5:10:20000") == ParseCache.key("abc", "5:10:20000")
+
+
+def test_put_get_and_corrupt_entries(cache):
+    key = ParseCache.key("abc", "v")
+    assert cache.get(key) is None
+    cache.put(key, {"text": "Zoë", "fields": {"email": None}})
+    assert cache.get(key) == {"text": "Zoë", "fields": {"email": None}}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache._path(key).write_bytes(b"not zlib")
+    assert cache.get(key) is None
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = ParseCache(tmp_path)
+    keys = [ParseCache.key(str(n), "v") for n in range(4)]
+    past = time.time() - 100
+    for n, key in enumerate(keys[:3]):
+        cache.put(key, {"text": os.urandom(1000).hex()})
+        os.utime(cache._path(key), (past + n, past + n))
+    # Room for three and a half entries, and keys[0] is touched by a hit.
+    cache.max_bytes = int(cache._path(keys[0]).stat().st_size * 3.5)
+    assert cache.get(keys[0]) is not None
+    cache.put(keys[3], {"text": os.urandom(1000).hex()})
+
+    assert cache.get(keys[1]) is None
+    assert all(cache.get(key) is not None for key in (keys[0], keys[2], keys[3]))
+    assert cache._size <= cache.max_bytes * 0.9
+
+
+def test_overwriting_an_entry_does_not_grow_the_size(tmp_path):
+    cache = ParseCache(tmp_path)
+    key = ParseCache.key("a", "v")
+    cache.put(ParseCache.key("b", "v"), {"text": "other"})
+    for _ in range(3):
+        cache.put(key, {"text": os.urandom(500).hex()})
+    assert cache._size == sum(size for _, size, _ in cache._entries())
+
+
+def test_extract_resume_text_reuses_cached_parse(cache, tmp_path, make_pdf, monkeypatch):
+    path = tmp_path / "cv.pdf"
+    path.write_bytes(make_pdf([["Jane Doe", "jane@example.com"]]))
+    text = resume_parser.extract_resume_text(str(path))
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    # Same bytes, from disk or memory: served from the cache, fields included.
+    def not_called(source):
+        raise AssertionError("parser ran on a cache hit")
+    monkeypatch.setattr(resume_parser, "_PARSERS", {".pdf": not_called, ".docx": not_called})
+    monkeypatch.setattr(resume_parser, "_recent_fields", {})
+    assert resume_parser.extract_resume_text(str(path)) == text
+    assert resume_parser.extract_resume_text(path.read_bytes()) == text
+    assert cache.hits == 2
+    assert resume_parser.extract_resume_data(text)["email"] == "jane@example.com"
+
+
+def test_version_bump_misses(cache, tmp_path, make_pdf, monkeypatch):
+    path = tmp_path / "cv.pdf"
+    path.write_bytes(make_pdf([["Jane Doe"]]))
+    resume_parser.extract_resume_text(str(path))
+    monkeypatch.setattr(resume_parser, "PARSER_VERSION", "test")
+    resume_parser.extract_resume_text(str(path))
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_disabled_cache(monkeypatch):
+    monkeypatch.setattr(parse_cache, "CACHE_ENABLED", False)
+    assert parse_cache.get_cache() is None
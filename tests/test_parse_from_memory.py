@@ -0,0 +1,77 @@
+"""Tests for parsing uploads from memory (user-020)."""
+
+import io
+import mmap
+import tempfile
+
+import pytest
+
+from utils.resume_parser import extract_resume_text, read_resume_bytes, sniff_format
+
+
+@pytest.fixture
+def pdf_bytes(make_pdf):
+    return make_pdf([["Jane Doe", "jane@example.com"]])
+
+
+@pytest.fixture
+def docx_bytes(tmp_path, make_docx):
+    path = make_docx(tmp_path / "cv.docx", ["Jane Doe", "jane@example.com"])
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_sniff_format(pdf_bytes, docx_bytes):
+    assert sniff_format(pdf_bytes) == ".pdf"
+    assert sniff_format(b"\xef\xbb\xbf junk " + pdf_bytes) == ".pdf"    # header within 1 KB
+    assert sniff_format(docx_bytes) == ".docx"
+    assert sniff_format(memoryview(docx_bytes)) == ".docx"
+    assert sniff_format(b"plain text") is None
+
+
+def test_spooled_upload_in_memory_and_rolled_over(pdf_bytes):
+    for max_size in (1 << 20, 10):
+        with tempfile.SpooledTemporaryFile(max_size=max_size) as upload:
+            upload.write(pdf_bytes)
+            data = read_resume_bytes(upload)
+        # Plain bytes that outlive the closed upload.
+        assert type(data) is bytes and data == pdf_bytes
+
+
+def test_extract_from_every_in_memory_form(pdf_bytes, docx_bytes):
+    expected = "Jane Doe\njane@example.com"
+    for source in (pdf_bytes, bytearray(pdf_bytes), memoryview(docx_bytes),
+                   io.BytesIO(docx_bytes)):
+        assert extract_resume_text(source) == expected
+    with tempfile.TemporaryFile() as f:
+        f.write(pdf_bytes)
+        assert extract_resume_text(f) == expected
+        f.flush()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            assert extract_resume_text(mapped) == expected
+
+
+def test_unsupported_content_and_paths(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported file format"):
+        extract_resume_text(b"just some text")
+    (tmp_path / "cv.txt").write_text("text")
+    with pytest.raises(ValueError, match="Unsupported file format"):
+        extract_resume_text(str(tmp_path / "cv.txt"))
+    with pytest.raises(FileNotFoundError):
+        extract_resume_text(str(tmp_path / "missing.pdf"))
+
+
+def test_start_process_hands_the_upload_bytes_to_the_pipeline(pdf_bytes, monkeypatch):
+    from fastapi.testclient import TestClient
+    import server
+    received = []
+
+    async def pipeline(resume_bytes, phone):
+        received.append((bytes(resume_bytes), phone))
+    monkeypatch.setattr(server, "run_hiring_pipeline", pipeline)
+
+    response = TestClient(server.app).post(
+        "/start-process", data={"phone": "+14155550100"},
+        files={"file": ("cv.pdf", pdf_bytes, "application/pdf")})
+    assert response.json() == {"status": "started", "file": "cv.pdf"}
+    assert received == [(pdf_bytes, "+14155550100")]
@@ -0,0 +1,39 @@
+"""Tests for the bounded PDF parse (user-016)."""
+
+from utils import resume_parser
+from utils.resume_parser import iter_pdf_pages, parse_pdf, sectionize
+
+
+def test_pages_are_joined_with_newlines(tmp_path, make_pdf):
+    path = tmp_path / "cv.pdf"
+    path.write_bytes(make_pdf([["Jane Doe", "jane@example.com"], ["Skills", "React, Node.js"]]))
+    text = parse_pdf(str(path))
+    assert text == "Jane Doe\njane@example.com\nSkills\nReact, Node.js"
+    # The heading at the top of page 2 is still a heading line.
+    [(start, end)] = sectionize(text)["skills"]
+    assert text[start:end] == "Skills\nReact, Node.js"
+
+
+def test_page_limit(tmp_path, make_pdf):
+    path = tmp_path / "long.pdf"
+    path.write_bytes(make_pdf([[f"page {n}"] for n in range(5)]))
+    assert list(iter_pdf_pages(str(path), max_pages=2)) == ["page 0", "page 1"]
+    assert parse_pdf(str(path), max_pages=2, max_chars=0) == "page 0\npage 1"
+    assert parse_pdf(str(path), max_pages=0, max_chars=0).count("page") == 5
+
+
+def test_char_limit_stops_reading_pages(tmp_path, make_pdf, monkeypatch):
+    path = tmp_path / "long.pdf"
+    path.write_bytes(make_pdf([["x" * 40] for _ in range(5)]))
+    read = []
+    pages = resume_parser.iter_pdf_pages
+    monkeypatch.setattr(resume_parser, "iter_pdf_pages",
+                        lambda *a: (read.append(p) or p for p in pages(*a)))
+    assert len(parse_pdf(str(path), max_pages=0, max_chars=60)) == 60
+    assert len(read) == 2
+
+
+def test_blank_pages_are_skipped(tmp_path, make_pdf):
+    path = tmp_path / "blank.pdf"
+    path.write_bytes(make_pdf([["one"], [], ["two"]]))
+    assert parse_pdf(str(path)) == "one\ntwo"
@@ -0,0 +1,126 @@
+"""Tests for the sandboxed resume parser pool (user-021)."""
+
+import asyncio
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+from utils import parse_sandbox, resume_parser
+from utils.parse_sandbox import ParserPool, ResumeParseError
+
+
+# Worker-side stand-ins; spawn workers import them from this module.
+def _hang():
+    signal.signal(signal.SIGALRM, signal.SIG_IGN)       # stuck where the alarm can't reach
+    time.sleep(60)
+
+
+def _crash():
+    os._exit(1)
+
+
+@pytest.fixture
+def pool():
+    pool = ParserPool(workers=1, timeout=5, memory_mb=0)
+    yield pool
+    pool.close()
+
+
+def run_in_worker(pool, monkeypatch, fn):
+    def submit(source):
+        executor = pool._get_executor()
+        return executor, executor.submit(fn)
+    monkeypatch.setattr(pool, "_submit", submit)
+
+
+def test_parses_paths_and_buffers(pool, tmp_path, make_pdf):
+    data = make_pdf([["Jane Doe", "jane@example.com"]])
+    (tmp_path / "cv.pdf").write_bytes(data)
+    assert pool.parse(str(tmp_path / "cv.pdf")) == "Jane Doe\njane@example.com"
+    assert pool.parse(memoryview(data)) == "Jane Doe\njane@example.com"
+    assert asyncio.run(pool.parse_async(data)) == "Jane Doe\njane@example.com"
+
+
+def test_bad_file_is_a_parse_error_and_keeps_the_pool(pool):
+    executor = pool._get_executor()
+    with pytest.raises(ResumeParseError, match="Unsupported file format"):
+        pool.parse(b"not a resume")
+    with pytest.raises(ResumeParseError, match="could not be parsed"):
+        pool.parse(b"%PDF-1.4 truncated")
+    assert pool._executor is executor
+
+
+def test_other_errors_keep_their_type_and_the_pool(pool, make_pdf):
+    executor = pool._get_executor()
+    with pytest.raises(TypeError, match="pickle"):
+        pool.parse(threading.Lock())
+    assert pool._executor is executor
+    assert pool.parse(make_pdf([["Jane Doe"]])) == "Jane Doe"
+
+
+def test_stuck_worker_times_out_and_the_pool_restarts(pool, monkeypatch, make_pdf):
+    monkeypatch.setattr(parse_sandbox, "_KILL_GRACE", 0)
+    pool.timeout = 0.5
+    run_in_worker(pool, monkeypatch, _hang)
+    executor = pool._get_executor()
+    with pytest.raises(ResumeParseError, match="timed out after 0.5s"):
+        pool.parse("ignored")
+    with pytest.raises(ResumeParseError, match="timed out"):
+        asyncio.run(pool.parse_async("ignored"))
+    assert pool._executor is not executor
+
+    monkeypatch.undo()
+    pool.timeout = 5
+    assert pool.parse(make_pdf([["Jane Doe"]])) == "Jane Doe"
+
+
+def test_crashed_worker(pool, monkeypatch):
+    run_in_worker(pool, monkeypatch, _crash)
+    executor = pool._get_executor()
+    with pytest.raises(ResumeParseError, match="crashed"):
+        pool.parse("ignored")
+    assert pool._executor is None and executor is not None
+
+
+def test_alarm_gets_past_broad_except_blocks(monkeypatch):
+    def stubborn(source):
+        while True:
+            try:
+                time.sleep(10)
+            except Exception:           # pypdf-style recovery
+                pass
+    monkeypatch.setattr(resume_parser, "extract_resume_text", stubborn)
+    previous = signal.getsignal(signal.SIGALRM)
+    try:
+        with pytest.raises(ResumeParseError, match="timed out after 0.2s"):
+            parse_sandbox._parse_in_worker("ignored", 0.2)
+    finally:
+        signal.signal(signal.SIGALRM, previous)
+
+
+def test_parse_sharing_a_pool_with_a_stuck_one_is_resubmitted(pool, monkeypatch, make_pdf):
+    # One worker: the good parse is queued behind the stuck one when the
+    # pool is killed, and must be run again on the new pool.
+    monkeypatch.setattr(parse_sandbox, "_KILL_GRACE", 0)
+    pool.timeout = 2
+    submit = pool._submit
+
+    def route(source):
+        if source != "hang":
+            return submit(source)
+        executor = pool._get_executor()
+        return executor, executor.submit(_hang)
+    monkeypatch.setattr(pool, "_submit", route)
+
+    with ThreadPoolExecutor(2) as threads:
+        stuck = threads.submit(pool.parse, "hang")
+        time.sleep(0.5)
+        good = threads.submit(pool.parse, make_pdf([["Jane Doe"]]))
+        with pytest.raises(ResumeParseError, match="timed out"):
+            stuck.result()
+        assert good.result() == "Jane Doe"
@@ -0,0 +1,49 @@
+"""Tests for the trigger-maintained funnel rollup behind get_pipeline_stats (user-006)."""
+
+from utils.db import CandidateSession
+
+PASSED = {"credibility_score": 90}
+FAILED = {"credibility_score": 40}
+
+
+def add_candidate(email, screening, verification=None, evaluation=None):
+    with CandidateSession(email=email) as session:
+        session.add_screening_result(f"Decision: {screening}")
+        if verification:
+            session.add_background_check(verification)
+        if evaluation:
+            session.add_evaluation_result(f"Decision: {evaluation}")
+    return session.candidate_id
+
+
+def test_rollup_tracks_inserts_and_deletes(pg):
+    add_candidate("a@example.com", "Qualified", PASSED, "Pass")
+    add_candidate("b@example.com", "Qualified", PASSED, "Fail")
+    gone = add_candidate("c@example.com", "Qualified", FAILED)
+    add_candidate("d@example.com", "Not Qualified")
+
+    expected = {"total_candidates": 4, "passed_screening": 3, "passed_verification": 2,
+                "final_passed": 1, "final_failed": 1}
+    assert pg.get_pipeline_stats() == expected
+
+    # A repeated result for the same candidate is not counted twice.
+    add_candidate("a@example.com", "Qualified", PASSED, "Pass")
+    assert pg.get_pipeline_stats() == expected
+
+    with pg.pooled_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM candidates WHERE id = %s;", (gone,))
+        conn.commit()
+        cur.close()
+    expected.update(total_candidates=3, passed_screening=2)
+    assert pg.get_pipeline_stats() == expected
+
+
+def test_refresh_rebuilds_the_same_totals(pg):
+    add_candidate("a@example.com", "Qualified", PASSED, "Pass")
+    add_candidate("b@example.com", "Qualified", FAILED, "Fail")
+    before = pg.get_pipeline_stats()
+    pg.refresh_pipeline_stats()
+    assert pg.get_pipeline_stats() == before == {
+        "total_candidates": 2, "passed_screening": 2, "passed_verification": 1,
+        "final_passed": 1, "final_failed": 1}
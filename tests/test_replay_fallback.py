@@ -0,0 +1,102 @@
+"""Tests for utils.replay_fallback (user-013)."""
+
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from utils import json_store, replay_fallback
+
+
+def record(n, **extra):
+    return {"decision": "Pass", "remarks": f"candidate {n}", "evaluation_summary": "",
+            "timestamp": "2026-03-07 10:00:00", **extra}
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return {"log_path": str(tmp_path / "log.jsonl"),
+            "checkpoint_path": str(tmp_path / "checkpoint.json"),
+            "rejected_path": str(tmp_path / "rejected.jsonl")}
+
+
+def replayed(paths, checkpoint):
+    return [r["remarks"] for _, _, _, batch in
+            replay_fallback._batches(paths["log_path"], checkpoint, 100) for _, r in batch]
+
+
+def test_content_hash_ignores_key_order():
+    assert replay_fallback.content_hash({"a": 1, "b": 2}) == replay_fallback.content_hash({"b": 2, "a": 1})
+
+
+def test_checkpoint_resumes_within_the_same_file(paths):
+    json_store.append_records([record(1), record(2)], paths["log_path"])
+    checkpoint = {}
+    for key, file_id, offset, _ in replay_fallback._batches(paths["log_path"], checkpoint, 100):
+        checkpoint[key] = {"file_id": file_id, "offset": offset}
+    json_store.append_records([record(3)], paths["log_path"])
+    assert replayed(paths, checkpoint) == ["candidate 3"]
+
+
+def test_rotated_log_with_a_larger_successor_is_read_from_the_start(paths):
+    # Checkpoint the live log part way, then rotate it and let the new live
+    # log grow past the old offset under the same name.
+    json_store.append_records([record(1)], paths["log_path"])
+    [(key, file_id, offset, _)] = replay_fallback._batches(paths["log_path"], {}, 100)
+    checkpoint = {key: {"file_id": file_id, "offset": offset}}
+
+    os.replace(paths["log_path"], paths["log_path"][:-len(".jsonl")] + ".20260307-100000-000000.jsonl")
+    json_store.append_records([record(n, pad="x" * 200) for n in (2, 3, 4)], paths["log_path"])
+    assert os.path.getsize(paths["log_path"]) > offset
+
+    assert replayed(paths, checkpoint) == ["candidate 1", "candidate 2", "candidate 3", "candidate 4"]
+
+
+def test_legacy_integer_checkpoint_restarts_the_file(paths):
+    json_store.append_records([record(1), record(2)], paths["log_path"])
+    assert replayed(paths, {"log.jsonl": 10 ** 6}) == ["candidate 1", "candidate 2"]
+
+
+def test_file_without_a_complete_line_is_skipped(paths):
+    with open(paths["log_path"], "wb") as f:
+        f.write(b'{"decision": "Pa')
+    assert replayed(paths, {}) == []
+
+
+def test_replay_inserts_once_and_rejects_bad_records(pg, paths):
+    json_store.append_records([record(1), record(2), record(2),
+                               record(3, candidate_id=999999)], paths["log_path"])
+    stats = replay_fallback.replay(**paths, batch_size=2)
+    assert stats["read"] == 4 and stats["inserted"] == 2
+    assert stats["duplicates"] == 1 and stats["rejected"] == 1
+    with open(paths["rejected_path"]) as f:
+        assert json.loads(f.readline())["record"]["candidate_id"] == 999999
+
+    # Everything is checkpointed; a fresh checkpoint still dedupes by content.
+    assert replay_fallback.replay(**paths)["read"] == 0
+    os.remove(paths["checkpoint_path"])
+    again = replay_fallback.replay(**paths)
+    assert again["inserted"] == 0 and again["duplicates"] == 3
+    rows = pg._fetch_all("SELECT reason FROM evaluation_results ORDER BY id;")
+    assert [r["reason"] for r in rows] == ["candidate 1", "candidate 2"]
+
+
+@pytest.fixture
+def new_york(monkeypatch):
+    """Run with the process's local time zone set to America/New_York."""
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_local_timestamps_are_stored_as_utc(pg, paths, new_york):
+    json_store.append_records([record(1)], paths["log_path"])
+    replay_fallback.replay(**paths)
+    [row] = pg._fetch_all("SELECT evaluated_at FROM evaluation_results;")
+    # 10:00 EST is 15:00 UTC, whatever the server's own zone is.
+    assert row["evaluated_at"] == datetime(2026, 3, 7, 15, 0, tzinfo=timezone.utc)
+    assert replay_fallback._evaluated_at("yesterday") == "yesterday"
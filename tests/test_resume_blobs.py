@@ -0,0 +1,41 @@
+"""Tests for content-addressed resume storage (user-014)."""
+
+import hashlib
+
+from utils import db
+
+
+def test_resume_hash_is_sha256_of_utf8():
+    assert db.resume_hash("Zoë") == hashlib.sha256("Zoë".encode("utf-8")).hexdigest()
+
+
+def test_identical_text_is_stored_once(pg):
+    text = "React / Node.js developer\n" * 50
+    a = pg.upsert_candidate(email="a@example.com", resume_text=text)
+    b = pg.upsert_candidate(email="b@example.com", resume_text=text)
+    assert a != b
+    assert pg.store_resume(text, file_hash="file-1") == pg.resume_hash(text)
+    assert pg._fetch_all("SELECT COUNT(*) AS n FROM resume_blobs;") == [{"n": 1}]
+    assert pg.get_candidate_by_email("b@example.com")["resume_text"] == text
+    assert pg.get_resume_by_file_hash("file-1") == text
+    assert pg.get_resume_by_file_hash("file-2") is None
+
+
+def test_sql_hash_matches_python_hash(pg):
+    text = "Zoë — MERN\tdeveloper"
+    rows = pg._fetch_all(f"SELECT {pg._SQL_SHA256.format('%s')} AS h;", (text,))
+    assert rows == [{"h": pg.resume_hash(text)}]
+
+
+def test_toast_compresses_only_rows_past_the_threshold(pg):
+    # What the _RESUME_BLOBS_SQL comment promises: no compression below
+    # ~2 kB, aggressive compression above it.
+    sizes = {}
+    for length in (1500, 6000):
+        text = ("MERN developer, React and Node. " * 300)[:length]
+        pg.store_resume(text)
+        rows = pg._fetch_all("SELECT pg_column_size(content) AS size FROM resume_blobs "
+                             "WHERE text_hash = %s;", (pg.resume_hash(text),))
+        sizes[length] = rows[0]["size"]
+    assert sizes[1500] >= 1500
+    assert sizes[6000] < 1000
@@ -0,0 +1,69 @@
+"""Tests for the resume sectionizer (user-019)."""
+
+from utils import resume_parser
+from utils.resume_parser import resume_sections, sectionize
+
+RESUME = """Jane Doe
+jane@example.com
+
+PROFESSIONAL SUMMARY
+MERN developer.
+
+Technical Skills:
+React, Node.js, MongoDB
+
+• Work Experience
+Acme Corp - built the checkout service.
+
+Projects
+Resume screener
+
+Education
+B.Tech, 2022
+
+Skills
+Docker
+"""
+
+
+def text_of(spans):
+    return [RESUME[start:end].strip() for start, end in spans]
+
+
+def test_headings_split_the_resume():
+    spans = sectionize(RESUME)
+    assert set(spans) == {"contact", "summary", "skills", "experience", "projects", "education"}
+    assert text_of(spans["contact"]) == ["Jane Doe\njane@example.com"]
+    assert text_of(spans["experience"]) == ["• Work Experience\nAcme Corp - built the checkout service."]
+    # A section may appear more than once.
+    assert text_of(spans["skills"]) == ["Technical Skills:\nReact, Node.js, MongoDB",
+                                        "Skills\nDocker"]
+
+
+def test_heading_words_inside_a_sentence_are_not_headings():
+    text = "Jane Doe\nSkills in React and experience with Node.\n"
+    assert list(sectionize(text)) == ["contact"]
+
+
+def test_resume_sections_keeps_resume_order_and_limit():
+    picked = resume_sections(RESUME, "education", "skills")
+    assert picked == ("Technical Skills:\nReact, Node.js, MongoDB\n"
+                      "Education\nB.Tech, 2022\nSkills\nDocker")
+    assert resume_sections(RESUME, "skills", limit=16) == "Technical Skills"
+
+
+def test_missing_sections_fall_back_to_the_whole_resume():
+    assert resume_sections("Just a paragraph about me.", "skills") == "Just a paragraph about me."
+    assert resume_sections(RESUME, "other") == RESUME
+
+
+def test_spans_cached_with_the_parse_are_reused(monkeypatch):
+    monkeypatch.setattr(resume_parser, "_recent_fields", {})
+    resume_parser._remember_fields(RESUME, {"sections": {"skills": [[0, 8]]}})
+    assert resume_sections(RESUME, "skills") == "Jane Doe"
+
+
+def test_docx_paragraphs_are_heading_lines(tmp_path, make_docx):
+    path = make_docx(tmp_path / "cv.docx", ["Jane Doe", "Skills", "React", "Education", "B.Tech"])
+    text = resume_parser.parse_docx(path)
+    assert resume_sections(text, "skills") == "Skills\nReact"
@@ -0,0 +1,74 @@
+"""Tests for the embedded SQLite backend (user-009)."""
+
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+SCREENING = "Decision: Qualified\nReason: ok"
+VERIFICATION = {"credibility_score": 80, "status": "VERIFIED", "issues": ["no github"]}
+
+
+def test_session_and_reads(sqlite_store):
+    with sqlite_store.CandidateSession(name="Ada", email="ada@example.com") as session:
+        session.add_screening_result(SCREENING)
+        session.add_background_check(VERIFICATION)
+        session.add_evaluation_result("Score: 75\nDecision: Pass")
+    candidate_id = session.candidate_id
+
+    candidate = sqlite_store.get_candidate_by_email("ada@example.com")
+    assert candidate["id"] == candidate_id
+    assert candidate["created_at"].tzinfo == timezone.utc
+    assert sqlite_store.get_pipeline_stats() == {
+        "total_candidates": 1, "passed_screening": 1, "passed_verification": 1,
+        "final_passed": 1, "final_failed": 0}
+    issues = sqlite_store._fetch_all("SELECT issues FROM background_checks;")
+    assert issues == [{"issues": ["no github"]}]
+
+
+def test_upsert_keeps_one_row_per_email(sqlite_store):
+    first = sqlite_store.upsert_candidate(name="Ada", email="ada@example.com")
+    second = sqlite_store.upsert_candidate(name="Ada L.", email="ada@example.com")
+    assert first == second
+    assert sqlite_store.get_candidate_by_email("ada@example.com")["name"] == "Ada L."
+
+
+def test_keyset_pages(sqlite_store):
+    ids = [sqlite_store.upsert_candidate(email=f"c{i}@example.com") for i in range(5)]
+    seen, cursor = [], None
+    while True:
+        page = sqlite_store.get_candidates_page(limit=2, cursor=cursor)
+        seen += [row["id"] for row in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == sorted(ids, reverse=True)
+    assert [r["id"] for r in sqlite_store.iter_candidates(itersize=2)] == seen
+    future = datetime(2100, 1, 1, tzinfo=timezone.utc)
+    assert sqlite_store.get_candidates_page(created_from=future)["items"] == []
+
+
+def test_resume_blobs_are_compressed_and_deduplicated(sqlite_store):
+    text = "MERN developer " * 200
+    assert sqlite_store.store_resume(text, file_hash="a") == sqlite_store.store_resume(text, file_hash="b")
+    assert sqlite_store.get_resume_by_file_hash("b") == text
+    rows = sqlite_store.get_connection().execute(
+        "SELECT length(content) FROM resume_blobs;").fetchall()
+    assert len(rows) == 1 and rows[0][0] < len(text) // 4
+
+
+def test_init_tables_is_idempotent(sqlite_store):
+    sqlite_store.init_tables()
+    version = sqlite_store.get_connection().execute("PRAGMA user_version;").fetchone()[0]
+    assert version == sqlite_store._SCHEMA_VERSION
+
+
+def test_db_backend_switch_reexports_sqlite_api(tmp_path):
+    code = ("from utils import db, sqlite_store; "
+            "assert db.CandidateSession is sqlite_store.CandidateSession; "
+            "assert db.upsert_candidate is sqlite_store.upsert_candidate; "
+            "assert db.WRITE_BEHIND is False")
+    env = {"DB_BACKEND": "sqlite", "SQLITE_PATH": str(tmp_path / "x.db"), "PATH": ""}
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True)
@@ -0,0 +1,198 @@
+"""Tests for the durable write-behind spool and save_transcript (user-011)."""
+
+import json
+import uuid
+
+import psycopg2
+import pytest
+
+from utils import db, write_spool
+from utils.write_spool import SpoolFlusher, SpoolWriter
+
+
+def record(op="insert", **payload):
+    payload = payload or {"table": "screening_results", "columns": ["decision"],
+                          "values": ["Qualified"]}
+    return {"id": str(uuid.uuid4()), "op": op, "payload": payload}
+
+
+def lines(path):
+    return [json.loads(line) for line in path.read_bytes().splitlines()]
+
+
+def test_append_is_durable_and_shares_fsyncs(tmp_path):
+    writer = SpoolWriter(tmp_path / "p1")
+    rec = record()
+    writer.append(rec)
+    assert writer.fsyncs >= 1
+    assert lines(write_spool._segment_path(writer.directory, writer.segment)) == [rec]
+    writer.close()
+    with pytest.raises(RuntimeError):
+        writer.append(record())
+    writer.release()
+
+
+def test_torn_tail_is_cut_before_new_appends(tmp_path):
+    directory = tmp_path / "p1"
+    directory.mkdir()
+    segment = write_spool._segment_path(directory, 1)
+    good = record()
+    segment.write_bytes(json.dumps(good).encode() + b"\n" + b'{"id": "half')
+    writer = SpoolWriter(directory)
+    second = record()
+    writer.append(second)
+    writer.close()
+    writer.release()
+    assert lines(segment) == [good, second]
+
+
+def test_segments_rotate_at_size_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(write_spool, "SEGMENT_BYTES", 200)
+    writer = SpoolWriter(tmp_path / "p1")
+    for _ in range(4):
+        writer.append(record())
+    writer.close()
+    writer.release()
+    assert len(write_spool._segments(writer.directory)) > 1
+
+
+def test_flusher_applies_once_and_dead_letters_bad_records(pg, tmp_path):
+    writer = SpoolWriter(tmp_path / "p1")
+    good = record()
+    writer.append(good)
+    writer.append(good)                                   # same id: applied once
+    writer.append(record(table="screening_results", columns=["nope"], values=[1]))
+    writer._file.write(b"not json\n")
+    writer._file.flush()
+    writer.append(record())
+
+    flusher = SpoolFlusher(tmp_path, writer)
+    assert flusher.drain_once() == 5
+    assert flusher.dead == 2
+    assert pg._fetch_all("SELECT COUNT(*) AS n FROM screening_results;") == [{"n": 2}]
+    dead = lines(writer.directory / write_spool._DEAD_LETTER)
+    assert sorted(d["error"].split(":")[0] for d in dead) == [
+        "Unknown column(s) for screening_results", "unreadable record"]
+    assert flusher.drain_once() == 0                      # checkpoint advanced
+    writer.close()
+    writer.release()
+
+
+def test_abandoned_directory_is_adopted_and_removed(pg, tmp_path):
+    old = SpoolWriter(tmp_path / "dead-process")
+    old.append(record(op="session", candidate_id=None,
+                      candidate={"name": "Ada", "email": "ada@example.com", "phone": None,
+                                 "resume_text": None, "linkedin_url": None,
+                                 "github_username": None},
+                      candidate_dirty=True,
+                      rows={"screening_results": [["Qualified", "", "raw"]]}))
+    old.close()
+    old.release()
+
+    flusher = SpoolFlusher(tmp_path)
+    assert flusher.drain_once() == 1
+    assert not old.directory.exists()
+    candidate = pg.get_candidate_by_email("ada@example.com")
+    rows = pg._fetch_all("SELECT candidate_id FROM screening_results;")
+    assert rows == [{"candidate_id": candidate["id"]}]
+
+
+def test_transient_errors_leave_the_checkpoint_alone(tmp_path, monkeypatch):
+    def down(records):
+        raise psycopg2.OperationalError("connection refused")
+
+    monkeypatch.setattr(write_spool, "_apply", down)
+    writer = SpoolWriter(tmp_path / "p1")
+    writer.append(record())
+    flusher = SpoolFlusher(tmp_path, writer)
+    with pytest.raises(psycopg2.OperationalError):
+        flusher.drain_once()
+    assert write_spool._read_checkpoint(writer.directory) == (1, 0)
+    writer.close()
+    writer.release()
+
+
+def server_error(pg, sql):
+    """The exception Postgres raises for `sql` (with a real SQLSTATE)."""
+    with pg.pooled_connection() as conn:
+        cur = conn.cursor()
+        try:
+            cur.execute(sql)
+        except psycopg2.Error as e:
+            conn.rollback()
+            return e
+        finally:
+            cur.close()
+    raise AssertionError(f"{sql!r} did not fail")
+
+
+def test_only_connection_failures_are_transient(pg):
+    timeout = server_error(pg, "SET LOCAL statement_timeout = 1; SELECT pg_sleep(1);")
+    assert timeout.pgcode == "57014" and isinstance(timeout, psycopg2.OperationalError)
+    assert not db._is_transient(timeout)
+    assert not db._is_transient(server_error(pg, "SELECT 1/0;"))
+
+    assert db._is_transient(psycopg2.OperationalError("server closed the connection unexpectedly"))
+    assert db._is_transient(psycopg2.InterfaceError("connection already closed"))
+    assert db._is_transient(db.PoolTimeout("pool exhausted"))
+    assert not db._is_transient(ValueError("bad record"))
+
+
+def test_statement_timeout_dead_letters_the_record(pg, tmp_path, monkeypatch):
+    timeout = server_error(pg, "SET LOCAL statement_timeout = 1; SELECT pg_sleep(1);")
+    poison = record(table="screening_results", columns=["decision"], values=["slow"])
+    apply = write_spool._apply
+
+    def slow_on_poison(records):
+        if any(r["id"] == poison["id"] for r in records):
+            raise timeout
+        apply(records)
+    monkeypatch.setattr(write_spool, "_apply", slow_on_poison)
+
+    writer = SpoolWriter(tmp_path / "p1")
+    writer.append(record())
+    writer.append(poison)
+    flusher = SpoolFlusher(tmp_path, writer)
+    assert flusher.drain_once() == 2 and flusher.dead == 1
+    [dead] = lines(writer.directory / write_spool._DEAD_LETTER)
+    assert "statement timeout" in dead["error"]
+    assert pg._fetch_all("SELECT decision FROM screening_results;") == [{"decision": "Qualified"}]
+    writer.close()
+    writer.release()
+
+
+TRANSCRIPT = {"name": "Ada", "email": "ada@example.com", "transcript": "Q: hi\nA: hello",
+              "duration": 120, "status": "completed"}
+
+
+def test_save_transcript_is_spooled_during_an_outage(monkeypatch):
+    spooled = []
+
+    def down(session):
+        raise psycopg2.OperationalError("connection refused")
+
+    monkeypatch.setattr(db.CandidateSession, "_write", down)
+    monkeypatch.setattr(db, "WRITE_BEHIND", False)
+    monkeypatch.setattr(db, "_spool", lambda op, payload, reason="":
+                        spooled.append((op, json.loads(json.dumps(payload)))) or True)
+    db.save_transcript(TRANSCRIPT)
+
+    [(op, payload)] = spooled
+    assert op == "session" and payload["candidate"]["email"] == "ada@example.com"
+    [row] = payload["rows"]["interview_sessions"]
+    assert row == ["webhook", "", "completed", "", TRANSCRIPT["transcript"], 120]
+
+
+def test_save_transcript_writes_candidate_and_session(pg):
+    pg.save_transcript(TRANSCRIPT)
+    candidate = pg.get_candidate_by_email("ada@example.com")
+    rows = pg._fetch_all("SELECT candidate_id, transcript, duration_seconds "
+                         "FROM interview_sessions;")
+    assert rows == [{"candidate_id": candidate["id"], "transcript": TRANSCRIPT["transcript"],
+                     "duration_seconds": 120}]
+
+
+def test_sqlite_save_transcript(sqlite_store):
+    sqlite_store.save_transcript(TRANSCRIPT)
+    rows = sqlite_store._fetch_all("SELECT transcript FROM interview_sessions;")
+    assert rows == [{"transcript": TRANSCRIPT["transcript"]}]
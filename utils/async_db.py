@@ -0,0 +1,268 @@
+"""
+utils/async_db.py
+-----------------
+asyncio counterpart of utils/db.py for the FastAPI server (asyncpg).
+
+Same function names and return shapes as utils/db.py, but each call is a
+coroutine on its own asyncpg pool, so waiting on Postgres never blocks the
+event loop (SSE streaming, other dashboard requests).
+
+SQL, row builders and connection settings are shared with utils/db.py.
+Pool sizing is controlled by DB_ASYNC_POOL_MIN / DB_ASYNC_POOL_MAX in .env.
+"""
+
+import asyncio
+import itertools
+import os
+import re
+from typing import Optional
+
+import asyncpg
+
+from utils import db
+
+
+# ──────────────────────────────────────────────
+# Pool
+# ──────────────────────────────────────────────
+
+_pool = None
+_pool_lock = asyncio.Lock()
+
+
+async def get_pool() -> asyncpg.Pool:
+    """Return the process-wide asyncpg pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                params = db._connect_params()
+                hosts = db._hosts_by_preference()
+                if not hosts:
+                    raise asyncpg.InterfaceError("No DB host configured (set DB_HOST)")
+                _pool = await asyncpg.create_pool(
+                    host=hosts,                     # tried in order, like get_connection()
+                    port=params["port"],
+                    database=params["database"],
+                    user=params["user"],
+                    password=params["password"],
+                    ssl=params["sslmode"],
+                    timeout=params["connect_timeout"],
+                    min_size=int(os.getenv("DB_ASYNC_POOL_MIN", 1)),
+                    max_size=int(os.getenv("DB_ASYNC_POOL_MAX", 10)),
+                    max_inactive_connection_lifetime=float(os.getenv("DB_POOL_MAX_IDLE", 300)),
+                )
+    return _pool
+
+
+async def close_pool():
+    """Close the asyncpg pool (call from the server's shutdown hook)."""
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.close()
+
+
+def _sql(query: str) -> str:
+    """Rewrite psycopg2 %s placeholders as asyncpg $1, $2, ..."""
+    counter = itertools.count(1)
+    return re.sub(r"%s", lambda _: f"${next(counter)}", query)
+
+
+async def ping():
+    """SELECT 1 on a pooled connection. Raises on failure."""
+    pool = await get_pool()
+    await pool.fetchval("SELECT 1;")
+
+
+async def test_connection() -> bool:
+    """Quick connectivity test (SELECT 1 on a pooled connection). Returns True/False."""
+    try:
+        await ping()
+        return True
+    except Exception as e:
+        print(f"❌ Supabase connection failed: {e}")
+        return False
+
+
+# ──────────────────────────────────────────────
+# Writes
+# ──────────────────────────────────────────────
+
+async def upsert_candidate(name=None, email=None, phone=None, resume_text=None,
+                           linkedin_url=None, github_username=None) -> Optional[int]:
+    """Insert or update a candidate row. Returns its id, or None on failure."""
+    try:
+        pool = await get_pool()
+        async with pool.acquire() as conn, conn.transaction():
+            text_hash = await _put_resume(conn, resume_text)
+            candidate_id = await conn.fetchval(
+                _sql(db._UPSERT_CANDIDATE_SQL),
+                name, email, phone, text_hash, linkedin_url, github_username)
+        print(f"📁 Candidate saved (id={candidate_id})")
+        return candidate_id
+    except Exception as e:
+        print(f"❌ upsert_candidate failed: {e}")
+        return None
+
+
+async def _put_resume(conn, text: Optional[str]) -> Optional[str]:
+    """Async db._put_resume(): store `text` in resume_blobs unless known; return its hash."""
+    if not text:
+        return None
+    text_hash = db.resume_hash(text)
+    if await conn.fetchval(_sql(db._RESUME_EXISTS_SQL), text_hash) is None:
+        await conn.execute(_sql(db._INSERT_RESUME_SQL), text_hash, text)
+    return text_hash
+
+
+async def store_resume(text: str, file_hash: str = None) -> Optional[str]:
+    """Store extracted resume text and its source file hash. Returns the text hash."""
+    try:
+        pool = await get_pool()
+        async with pool.acquire() as conn, conn.transaction():
+            text_hash = await _put_resume(conn, text)
+            if text_hash and file_hash:
+                await conn.execute(_sql(db._INSERT_RESUME_FILE_SQL), file_hash, text_hash)
+        return text_hash
+    except Exception as e:
+        print(f"❌ store_resume failed: {e}")
+        return None
+
+
+async def _insert_result(table: str, candidate_id: int, row: tuple, success_msg: str):
+    columns = ("candidate_id",) + db._RESULT_COLUMNS[table]
+    query = (f"INSERT INTO {table} ({', '.join(columns)}) "
+             f"VALUES ({', '.join(f'${i}' for i in range(1, len(columns) + 1))});")
+    try:
+        pool = await get_pool()
+        await pool.execute(query, candidate_id, *row)
+        print(success_msg)
+    except Exception as e:
+        print(f"❌ DB write failed: {e}")
+
+
+async def save_screening_result(candidate_id: int, raw_output: str):
+    """Parse and save the screening agent's raw output."""
+    await _insert_result("screening_results", candidate_id, db._screening_row(raw_output),
+                         success_msg="📋 Screening result saved.")
+
+
+async def save_background_check(candidate_id: int, verification_result: dict):
+    """Save the output from background_verification_agent.verify_background()."""
+    await _insert_result("background_checks", candidate_id,
+                         db._background_row(verification_result),
+                         success_msg="🔍 Background check saved.")
+
+
+async def save_interview_session(candidate_id: int, call_id: str, phone_number: str,
+                                 questions: str, transcript: str = None,
+                                 call_status: str = "completed", duration_seconds: int = None):
+    """Save a Vapi interview call session."""
+    row = db._interview_row(call_id, phone_number, questions, transcript,
+                            call_status, duration_seconds)
+    await _insert_result("interview_sessions", candidate_id, row,
+                         success_msg="📞 Interview session saved.")
+
+
+async def save_evaluation_result(candidate_id: int, raw_output: str,
+                                 slack_notified=False, email_sent=False):
+    """Parse and save the final LLM evaluation output."""
+    await _insert_result("evaluation_results", candidate_id,
+                         db._evaluation_row(raw_output, slack_notified, email_sent),
+                         success_msg="📊 Evaluation result saved.")
+
+
+# ──────────────────────────────────────────────
+# Reads
+# ──────────────────────────────────────────────
+
+async def _fetch_all(query: str, *args) -> list[dict]:
+    try:
+        pool = await get_pool()
+        return [dict(r) for r in await pool.fetch(query, *args)]
+    except Exception as e:
+        print(f"❌ DB read failed: {e}")
+        return []
+
+
+async def get_candidate_by_email(email: str) -> Optional[dict]:
+    """Look up a candidate by email. Returns a dict or None."""
+    rows = await _fetch_all(_sql(db._CANDIDATE_BY_EMAIL_SQL), email)
+    return rows[0] if rows else None
+
+
+async def get_resume_by_file_hash(file_hash: str) -> Optional[str]:
+    """Text previously extracted from a file with this hash, or None."""
+    rows = await _fetch_all(_sql(db._RESUME_BY_FILE_SQL), file_hash)
+    return rows[0]["content"] if rows else None
+
+
+async def get_all_candidates() -> list[dict]:
+    """Return all candidates with their latest evaluation decision."""
+    return await _fetch_all(db._ALL_CANDIDATES_SQL)
+
+
+async def get_candidates_page(limit: int = 50, cursor: str = None, **filters) -> dict:
+    """
+    Async get_candidates_page(): one keyset page, newest first. Rows are
+    streamed from a server-side cursor in `prefetch`-sized batches.
+    Raises ValueError for a malformed cursor.
+    """
+    query, params = db._candidates_query(cursor=cursor, limit=limit + 1, **filters)
+    rows = []
+    try:
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                async for record in conn.cursor(_sql(query), *params, prefetch=100):
+                    rows.append(dict(record))
+    except Exception as e:
+        print(f"❌ DB read failed: {e}")
+        return {"items": [], "next_cursor": None}
+    return db._page_result(rows, limit)
+
+
+async def get_pipeline_stats() -> dict:
+    """Return aggregate stats for the dashboard."""
+    rows = await _fetch_all(db._PIPELINE_STATS_SQL)
+    return rows[0] if rows else {}
+
+
+# ──────────────────────────────────────────────
+# SQLite backend (DB_BACKEND=sqlite)
+# sqlite3 is synchronous and local, so each call runs in a worker thread;
+# there is no pool to manage.
+# ──────────────────────────────────────────────
+
+if db.BACKEND == "sqlite":
+    from utils import sqlite_store
+
+    def _threaded(fn):
+        async def wrapper(*args, **kwargs):
+            return await asyncio.to_thread(fn, *args, **kwargs)
+        wrapper.__name__, wrapper.__doc__ = fn.__name__, fn.__doc__
+        return wrapper
+
+    async def get_pool():  # noqa: F811
+        return None
+
+    async def close_pool():  # noqa: F811
+        return None
+
+    def _sqlite_ping():
+        sqlite_store.get_connection().execute("SELECT 1;").fetchone()
+
+    ping = _threaded(_sqlite_ping)
+    test_connection = _threaded(sqlite_store.test_connection)
+    upsert_candidate = _threaded(sqlite_store.upsert_candidate)
+    save_screening_result = _threaded(sqlite_store.save_screening_result)
+    save_background_check = _threaded(sqlite_store.save_background_check)
+    save_interview_session = _threaded(sqlite_store.save_interview_session)
+    save_evaluation_result = _threaded(sqlite_store.save_evaluation_result)
+    get_candidate_by_email = _threaded(sqlite_store.get_candidate_by_email)
+    store_resume = _threaded(sqlite_store.store_resume)
+    get_resume_by_file_hash = _threaded(sqlite_store.get_resume_by_file_hash)
+    get_all_candidates = _threaded(sqlite_store.get_all_candidates)
+    get_candidates_page = _threaded(sqlite_store.get_candidates_page)
+    get_pipeline_stats = _threaded(sqlite_store.get_pipeline_stats)
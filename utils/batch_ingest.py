@@ -0,0 +1,178 @@
+"""
+utils/batch_ingest.py
+---------------------
+Parse a hiring drive's worth of resumes in parallel.
+
+    python -m utils.batch_ingest resumes/            # directory (recursive)
+    python -m utils.batch_ingest drive.zip --workers 8 --out parsed.jsonl
+
+Parsing is CPU-bound, so files are fanned out across a ProcessPoolExecutor.
+At most --in-flight files (default 2 x workers) are queued at once, so
+memory stays flat however many files the drive has, and results stream
+back in completion order as ParsedResume(path, text, email, phone).
+Zip members are read inside the worker, so their bytes never cross the
+process boundary.
+
+A throughput/latency summary (files/s, p50/p95/p99 parse time) is
+printed and, with --summary, written as JSON.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator, NamedTuple, Optional
+
+from utils.resume_parser import extract_resume_data, extract_resume_text
+from utils.stats import percentile
+
+_EXTENSIONS = (".pdf", ".docx")
+
+
+class ParsedResume(NamedTuple):
+    path: str
+    text: Optional[str]          # None if parsing failed
+    email: Optional[str]
+    phone: Optional[str]
+
+
+def iter_resume_sources(path: str) -> Iterator[tuple]:
+    """Yield (path, zip member or None) for every PDF/DOCX in a directory or zip."""
+    if path.lower().endswith(".zip"):           # not is_zipfile(): a .docx is a zip too
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.namelist():
+                if os.path.splitext(member)[1].lower() in _EXTENSIONS:
+                    yield path, member
+        return
+    if os.path.isfile(path):
+        yield path, None
+        return
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in _EXTENSIONS:
+                yield os.path.join(root, name), None
+
+
+def _parse_one(path: str, member: Optional[str]) -> tuple:
+    """Worker: parse one file. Returns (label, text, email, phone, error, seconds, size)."""
+    label = f"{path}::{member}" if member else path
+    start = time.perf_counter()
+    try:
+        if member:
+            with zipfile.ZipFile(path) as archive:
+                data = archive.read(member)
+            text = extract_resume_text(data)
+            size = len(data)
+        else:
+            text = extract_resume_text(path)
+            size = os.path.getsize(path)
+        fields = extract_resume_data(text)
+        return (label, text, fields["email"], fields["phone"], None,
+                time.perf_counter() - start, size)
+    except Exception as e:
+        return label, None, None, None, f"{type(e).__name__}: {e}", time.perf_counter() - start, 0
+
+
+class IngestStats:
+    """Counters and per-file parse latencies for one ingest() run."""
+
+    def __init__(self):
+        self.ok = 0
+        self.failed = 0
+        self.bytes = 0
+        self.latencies = []
+        self.errors = {}
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def summary(self) -> dict:
+        files = self.ok + self.failed
+        return {
+            "files": files,
+            "ok": self.ok,
+            "failed": self.failed,
+            "seconds": round(self.seconds, 3),
+            "files_per_sec": round(files / self.seconds, 1) if self.seconds else 0.0,
+            "mb_per_sec": round(self.bytes / 1e6 / self.seconds, 2) if self.seconds else 0.0,
+            "parse_ms": {f"p{p}": round(percentile(self.latencies, p) * 1000, 1) for p in (50, 95, 99)},
+            "errors": self.errors,
+        }
+
+
+def ingest(path: str, workers: int = None, max_in_flight: int = None,
+           stats: IngestStats = None) -> Iterator[ParsedResume]:
+    """
+    Parse every resume under `path` (directory, single file or zip) across
+    `workers` processes (default: CPU count), yielding results as they finish.
+    Pass an IngestStats to collect throughput and latency figures.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * workers
+    stats = stats if stats is not None else IngestStats()
+    sources = iter_resume_sources(path)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_in_flight:
+                source = next(sources, None)
+                if source is None:
+                    exhausted = True
+                else:
+                    pending.add(pool.submit(_parse_one, *source))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                label, text, email, phone, error, seconds, size = future.result()
+                stats.latencies.append(seconds)
+                stats.bytes += size
+                if error:
+                    stats.failed += 1
+                    stats.errors[label] = error
+                else:
+                    stats.ok += 1
+                stats.seconds = time.perf_counter() - stats.started
+                yield ParsedResume(label, text, email, phone)
+
+
+def _main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.batch_ingest",
+        description="Parse a directory or zip of PDF/DOCX resumes in parallel.")
+    parser.add_argument("path", help="directory, zip archive or single resume")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    parser.add_argument("--in-flight", type=int, default=None,
+                        help="max files queued at once (default: 2 x workers)")
+    parser.add_argument("--out", help="write results as JSONL (path, email, phone, text)")
+    parser.add_argument("--summary", help="write the throughput/latency summary as JSON")
+    args = parser.parse_args(argv)
+
+    stats = IngestStats()
+    out = open(args.out, "w", encoding="utf-8") if args.out else None
+    try:
+        for result in ingest(args.path, args.workers, args.in_flight, stats):
+            if result.text is None:
+                print(f"❌ {result.path}: {stats.errors[result.path]}", file=sys.stderr)
+            if out:
+                out.write(json.dumps(result._asdict(), ensure_ascii=False) + "\n")
+    finally:
+        if out:
+            out.close()
+
+    summary = stats.summary()
+    print(f"📄 Parsed {summary['ok']}/{summary['files']} resumes in {summary['seconds']}s "
+          f"({summary['files_per_sec']} files/s, {summary['mb_per_sec']} MB/s) "
+          f"parse p50={summary['parse_ms']['p50']}ms p95={summary['parse_ms']['p95']}ms "
+          f"p99={summary['parse_ms']['p99']}ms")
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    _main()
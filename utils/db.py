@@ -10,62 +10,495 @@ Tables managed here:
   - background_checks    → verification scores
   - interview_sessions   → call info + transcript
   - evaluation_results   → final score + decision
+
+All helpers borrow connections from a process-wide pool (see
+ConnectionPool) instead of opening a fresh TLS session per query.
+Pool sizing is controlled by DB_POOL_MIN / DB_POOL_MAX in .env.
+
+Bulk backfills / exports go through COPY (see bulk_import / bulk_export):
+    python -m utils.db import candidates historical.csv
+    python -m utils.db export evaluation_results results.csv
 """
 
-from typing import Optional
+from typing import Iterable, Optional
+import argparse
+import atexit
+import base64
+import csv
+import hashlib
+import json
 import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 import psycopg2
+import psycopg2.errors
+import psycopg2.extensions
 import psycopg2.extras
 from datetime import datetime
+from decimal import Decimal
 from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv(dotenv_path=Path(__file__).resolve().parents[1] / ".env")
 
+from utils.parse_cache import buffer_hash, file_hash  # noqa: E402,F401  (resume_files key; re-exported)
+
 
 # ──────────────────────────────────────────────
 # Connection
 # ──────────────────────────────────────────────
 
+class CircuitOpenError(psycopg2.OperationalError):
+    """Raised when every configured DB host is behind an open circuit breaker."""
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker: CLOSED → (failures) → OPEN → (cooldown) → HALF_OPEN.
+    While OPEN the host is skipped without a connect attempt. After the
+    cool-down exactly one caller gets a trial attempt (HALF_OPEN); its
+    outcome closes the breaker again or re-opens it for another cool-down.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold=1, cooldown=30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """True if the caller may try this host right now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures}
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+_last_good_host = None
+_probe_thread = None
+
+
+def _breaker(host: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(
+                failure_threshold=int(os.getenv("DB_BREAKER_FAILURES", 1)),
+                cooldown=float(os.getenv("DB_BREAKER_COOLDOWN", 30)),
+            )
+        return _breakers[host]
+
+
+def _db_hosts() -> list:
+    """Configured hosts in preference order (direct first), de-duplicated."""
+    direct_host = os.getenv("DB_HOST")
+    pooler_host = os.getenv("DB_POOLER_HOST", direct_host)
+    hosts = []
+    for host in (direct_host, pooler_host):
+        if host and host not in hosts:
+            hosts.append(host)
+    return hosts
+
+
+def _connect_params() -> dict:
+    """Connection settings shared by every host (and by utils/async_db.py)."""
+    return {
+        "database": os.getenv("DB_NAME", "postgres"),
+        "user": os.getenv("DB_USER", "postgres"),
+        "password": os.getenv("DB_PASSWORD"),
+        "port": int(os.getenv("DB_PORT", 5432)),
+        "sslmode": os.getenv("DB_SSLMODE", "require"),
+        "connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT", 8)),
+    }
+
+
+def _connect(host: str):
+    return psycopg2.connect(host=host, **_connect_params())
+
+
 def get_connection():
     """
     Return a new psycopg2 connection to Supabase (Postgres).
-    Tries the direct DB host first; falls back to the session pooler
-    if the direct host is unreachable.
-    """
-    direct_host   = os.getenv("DB_HOST")
-    pooler_host   = os.getenv("DB_POOLER_HOST", direct_host)
-    db_name       = os.getenv("DB_NAME", "postgres")
-    db_user       = os.getenv("DB_USER", "postgres")
-    db_password   = os.getenv("DB_PASSWORD")
-    db_port       = int(os.getenv("DB_PORT", 5432))
-
-    for host in [direct_host, pooler_host]:
-        if not host:
+
+    Starts with the host that worked last time, then the remaining hosts
+    in preference order (direct DB host, then session pooler). Hosts whose
+    circuit breaker is open are skipped, so an unreachable direct host
+    costs one connect timeout per cool-down instead of one per query.
+    While running on a fallback host, a background thread keeps probing
+    the preferred host and switches back once it answers.
+    """
+    global _last_good_host
+    hosts = _hosts_by_preference()
+    if not hosts:
+        raise psycopg2.OperationalError("No DB host configured (set DB_HOST)")
+
+    last_err = None
+    for host in hosts:
+        breaker = _breaker(host)
+        if not breaker.allow():
             continue
         try:
-            conn = psycopg2.connect(
-                host=host,
-                database=db_name,
-                user=db_user,
-                password=db_password,
-                port=db_port,
-                sslmode="require",
-                connect_timeout=8,
-            )
-            return conn
+            conn = _connect(host)
         except Exception as e:
+            breaker.record_failure()
+            print(f"⚠️  DB host {host} unreachable, circuit opened: {e}")
             last_err = e  # try next host
             continue
+        breaker.record_success()
+        _last_good_host = host
+        if host != _db_hosts()[0]:
+            _start_probe()
+        return conn
+
+    if last_err is None:
+        raise CircuitOpenError("All DB hosts are cooling down after recent failures")
+    raise last_err  # every allowed host failed
+
+
+def _start_probe():
+    """Start (once) the background thread that re-checks the preferred host."""
+    global _probe_thread
+    interval = float(os.getenv("DB_PROBE_INTERVAL", 15))
+    if interval <= 0:
+        return
+    with _breakers_lock:
+        if _probe_thread is not None and _probe_thread.is_alive():
+            return
+        _probe_thread = threading.Thread(target=_probe_preferred_host, args=(interval,),
+                                         name="db-host-probe", daemon=True)
+        _probe_thread.start()
+
+
+def _probe_preferred_host(interval: float):
+    global _last_good_host
+    while True:
+        time.sleep(interval)
+        hosts = _db_hosts()
+        if not hosts or _last_good_host == hosts[0]:
+            return
+        preferred = hosts[0]
+        breaker = _breaker(preferred)
+        if not breaker.allow():
+            continue
+        try:
+            _connect(preferred).close()
+        except Exception:
+            breaker.record_failure()
+            continue
+        breaker.record_success()
+        _last_good_host = preferred
+        print(f"✅ DB host {preferred} reachable again; switching back.")
+        return
+
+
+def _hosts_by_preference() -> list:
+    """Configured hosts, with the one that last worked first."""
+    hosts = _db_hosts()
+    if _last_good_host in hosts:
+        hosts.remove(_last_good_host)
+        hosts.insert(0, _last_good_host)
+    return hosts
+
+
+def get_host_status() -> dict:
+    """Breaker state per configured host, plus the host currently in use."""
+    return {
+        "active_host": _last_good_host,
+        "hosts": {h: _breaker(h).snapshot() for h in _db_hosts()},
+    }
+
+
+# ──────────────────────────────────────────────
+# Connection pool
+# ──────────────────────────────────────────────
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection frees up within the checkout timeout."""
+
 
-    raise last_err  # both hosts failed
+class ConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections.
+
+    - Keeps between `minconn` and `maxconn` connections open.
+    - Idle connections are handed out LIFO so the warmest one is reused.
+    - Connections idle for longer than `ping_after` seconds are checked
+      with `SELECT 1` before being handed out; dead ones are replaced.
+    - Connections older than `max_lifetime`, or idle beyond `max_idle`
+      while the pool is above `minconn`, are evicted.
+    """
+
+    def __init__(self, connect, minconn=1, maxconn=10, max_idle=300.0,
+                 max_lifetime=1800.0, ping_after=30.0, timeout=10.0):
+        if maxconn < 1 or minconn < 0 or minconn > maxconn:
+            raise ValueError("Invalid pool size: need 0 <= minconn <= maxconn, maxconn >= 1")
+        self._connect = connect
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.ping_after = ping_after
+        self.timeout = timeout
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle = deque()            # (conn, created_at, last_used)
+        self._created = {}              # id(conn) → created_at, for checked-out conns
+        self._size = 0                  # idle + checked out
+        self._closed = False
+        self._stats = {"opened": 0, "closed": 0, "checkouts": 0,
+                       "waits": 0, "failed_pings": 0}
+
+    # ── public API ──────────────────────────────
+
+    def getconn(self):
+        """Check out a healthy connection, opening one if the pool has room."""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise psycopg2.InterfaceError("connection pool is closed")
+                self._evict_idle_locked()
+
+                if self._idle:
+                    conn, created_at, last_used = self._idle.pop()
+                    break
+                if self._size < self.maxconn:
+                    self._size += 1
+                    conn = None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(
+                        f"No DB connection available within {self.timeout}s "
+                        f"(pool max={self.maxconn})"
+                    )
+                self._stats["waits"] += 1
+                self._cond.wait(remaining)
+
+        # Network work happens outside the lock.
+        if conn is None:
+            conn = self._open()
+            with self._cond:
+                self._stats["checkouts"] += 1
+            return conn
+
+        now = time.monotonic()
+        if now - created_at > self.max_lifetime or not self._is_healthy(conn, now - last_used):
+            self._discard(conn)
+            return self.getconn()
+
+        with self._cond:
+            self._created[id(conn)] = created_at
+            self._stats["checkouts"] += 1
+        return conn
+
+    def putconn(self, conn, discard=False):
+        """Return a connection to the pool (or drop it if broken / discard=True)."""
+        if not discard and not conn.closed:
+            try:
+                status = conn.get_transaction_status()
+                if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                    discard = True
+                elif status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            created_at = self._created.pop(id(conn), time.monotonic())
+            if discard or conn.closed or self._closed:
+                pass
+            else:
+                self._idle.append((conn, created_at, time.monotonic()))
+                self._cond.notify()
+                return
+        self._discard(conn)
+
+    def warm(self):
+        """Open connections until `minconn` are idle. Errors are reported, not raised."""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.minconn:
+                    return
+                self._size += 1
+            try:
+                conn = self._open()
+            except Exception as e:
+                print(f"⚠️  DB pool warm-up failed: {e}")
+                return
+            self.putconn(conn)
+
+    def closeall(self):
+        with self._cond:
+            self._closed = True
+            idle = [c for c, _, _ in self._idle]
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                **self._stats,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "min": self.minconn,
+                "max": self.maxconn,
+            }
+
+    # ── internals ───────────────────────────────
+
+    def _open(self):
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created[id(conn)] = time.monotonic()
+            self._stats["opened"] += 1
+        return conn
+
+    def _is_healthy(self, conn, idle_for: float) -> bool:
+        if conn.closed:
+            return False
+        if idle_for < self.ping_after:
+            return True
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1;")
+            cur.fetchone()
+            cur.close()
+            conn.rollback()
+            return True
+        except Exception:
+            with self._cond:
+                self._stats["failed_pings"] += 1
+            return False
+
+    def _discard(self, conn):
+        try:
+            if not conn.closed:
+                conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._stats["closed"] += 1
+            self._cond.notify()
+
+    def _evict_idle_locked(self):
+        """Close the coldest idle connections past max_idle / max_lifetime (lock held)."""
+        now = time.monotonic()
+        while self._idle and self._size > self.minconn:
+            conn, created_at, last_used = self._idle[0]
+            if now - last_used <= self.max_idle and now - created_at <= self.max_lifetime:
+                break
+            self._idle.popleft()
+            try:
+                conn.close()
+            except Exception:
+                pass
+            self._size -= 1
+            self._stats["closed"] += 1
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Return the process-wide pool, creating (and warming) it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = ConnectionPool(
+                    get_connection,
+                    minconn=int(os.getenv("DB_POOL_MIN", 1)),
+                    maxconn=int(os.getenv("DB_POOL_MAX", 10)),
+                    max_idle=float(os.getenv("DB_POOL_MAX_IDLE", 300)),
+                    max_lifetime=float(os.getenv("DB_POOL_MAX_LIFETIME", 1800)),
+                    ping_after=float(os.getenv("DB_POOL_PING_AFTER", 30)),
+                    timeout=float(os.getenv("DB_POOL_TIMEOUT", 10)),
+                )
+                pool.warm()
+                _pool = pool
+    return _pool
+
+
+def close_pool():
+    """Close every pooled connection (registered with atexit)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+atexit.register(close_pool)
+
+
+@contextmanager
+def pooled_connection():
+    """
+    Borrow a connection from the pool for the duration of a `with` block.
+    Uncommitted work is rolled back on return; connections that died
+    mid-query are dropped instead of going back into the pool.
+    """
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        pool.putconn(conn, discard=True)
+        conn = None
+        raise
+    finally:
+        if conn is not None:
+            pool.putconn(conn)
 
 
 def test_connection():
     """Quick connectivity test. Returns True/False."""
     try:
-        conn = get_connection()
-        conn.close()
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT 1;")
+            cur.fetchone()
+            cur.close()
         print("✅ Supabase connection successful!")
         return True
     except Exception as e:
@@ -74,169 +507,588 @@ def test_connection():
 
 
 # ──────────────────────────────────────────────
-# Schema bootstrap  (run once on first deploy)
+# Funnel rollup  (backs get_pipeline_stats)
+# Statement-level triggers keep one flag row per candidate in
+# candidate_funnel, and candidate_funnel's own triggers keep the
+# single-row pipeline_funnel totals in step. /stats then reads one row
+# instead of joining every result table. refresh_pipeline_stats()
+# rebuilds both from scratch (e.g. after manual deletes of result rows).
 # ──────────────────────────────────────────────
 
-def init_tables():
-    """
-    Create all necessary tables if they don't already exist.
-    Safe to call on every startup.
-    """
-    ddl = """
-    -- Master candidate record
-    CREATE TABLE IF NOT EXISTS candidates (
-        id              SERIAL PRIMARY KEY,
-        name            TEXT,
-        email           TEXT UNIQUE,
-        phone           TEXT,
-        resume_text     TEXT,
-        linkedin_url    TEXT,
-        github_username TEXT,
-        created_at      TIMESTAMPTZ DEFAULT NOW()
-    );
-
-    -- Resume screening outcome
-    CREATE TABLE IF NOT EXISTS screening_results (
-        id              SERIAL PRIMARY KEY,
-        candidate_id    INT REFERENCES candidates(id) ON DELETE CASCADE,
-        decision        TEXT NOT NULL,          -- 'Qualified' | 'Not Qualified'
-        reason          TEXT,
-        raw_output      TEXT,
-        screened_at     TIMESTAMPTZ DEFAULT NOW()
-    );
-
-    -- Background verification
-    CREATE TABLE IF NOT EXISTS background_checks (
-        id                  SERIAL PRIMARY KEY,
-        candidate_id        INT REFERENCES candidates(id) ON DELETE CASCADE,
-        credibility_score   INT,
-        status              TEXT,               -- 'VERIFIED' | 'PARTIALLY_VERIFIED' | 'UNVERIFIED'
-        recommendation      TEXT,
-        email_valid         BOOLEAN,
-        email_confidence    INT,
-        linkedin_found      BOOLEAN,
-        linkedin_confidence INT,
-        github_found        BOOLEAN,
-        github_repos        INT,
-        github_mern_projects INT,
-        issues              TEXT[],
-        verified_at         TIMESTAMPTZ DEFAULT NOW()
-    );
-
-    -- Interview call session
-    CREATE TABLE IF NOT EXISTS interview_sessions (
-        id                  SERIAL PRIMARY KEY,
-        candidate_id        INT REFERENCES candidates(id) ON DELETE CASCADE,
-        call_id             TEXT,               -- Vapi call ID
-        phone_number        TEXT,
-        call_status         TEXT,               -- 'completed' | 'no-answer' | 'failed'
-        questions_asked     TEXT,
-        transcript          TEXT,
-        duration_seconds    INT,
-        called_at           TIMESTAMPTZ DEFAULT NOW()
-    );
-
-    -- Final evaluation + decision
-    CREATE TABLE IF NOT EXISTS evaluation_results (
-        id                  SERIAL PRIMARY KEY,
-        candidate_id        INT REFERENCES candidates(id) ON DELETE CASCADE,
-        questions_asked     INT,
-        perfect_answers     INT,
-        score               NUMERIC(5,2),
-        decision            TEXT NOT NULL,      -- 'Pass' | 'Fail'
-        reason              TEXT,
-        raw_output          TEXT,
-        slack_notified      BOOLEAN DEFAULT FALSE,
-        email_sent          BOOLEAN DEFAULT FALSE,
-        evaluated_at        TIMESTAMPTZ DEFAULT NOW()
-    );
-    """
-
-    conn = None
+_FUNNEL_DDL = """
+CREATE TABLE IF NOT EXISTS candidate_funnel (
+    candidate_id        INT PRIMARY KEY REFERENCES candidates(id) ON DELETE CASCADE,
+    passed_screening    BOOLEAN NOT NULL DEFAULT FALSE,
+    passed_verification BOOLEAN NOT NULL DEFAULT FALSE,
+    final_passed        BOOLEAN NOT NULL DEFAULT FALSE,
+    final_failed        BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+CREATE TABLE IF NOT EXISTS pipeline_funnel (
+    id                  INT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    total_candidates    BIGINT NOT NULL DEFAULT 0,
+    passed_screening    BIGINT NOT NULL DEFAULT 0,
+    passed_verification BIGINT NOT NULL DEFAULT 0,
+    final_passed        BIGINT NOT NULL DEFAULT 0,
+    final_failed        BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION funnel_count_candidates() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE pipeline_funnel
+           SET total_candidates = total_candidates + (SELECT COUNT(*) FROM new_rows)
+         WHERE id = 1;
+    ELSE
+        UPDATE pipeline_funnel
+           SET total_candidates = total_candidates - (SELECT COUNT(*) FROM old_rows)
+         WHERE id = 1;
+    END IF;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION funnel_mark_results() RETURNS trigger AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'screening_results' THEN
+        INSERT INTO candidate_funnel (candidate_id, passed_screening)
+        SELECT DISTINCT candidate_id, TRUE FROM new_rows
+         WHERE candidate_id IS NOT NULL
+           AND decision ILIKE '%qualified%' AND decision NOT ILIKE '%not%'
+        ON CONFLICT (candidate_id) DO UPDATE SET passed_screening = TRUE
+         WHERE NOT candidate_funnel.passed_screening;
+    ELSIF TG_TABLE_NAME = 'background_checks' THEN
+        INSERT INTO candidate_funnel (candidate_id, passed_verification)
+        SELECT DISTINCT candidate_id, TRUE FROM new_rows
+         WHERE candidate_id IS NOT NULL AND credibility_score >= 70
+        ON CONFLICT (candidate_id) DO UPDATE SET passed_verification = TRUE
+         WHERE NOT candidate_funnel.passed_verification;
+    ELSIF TG_TABLE_NAME = 'evaluation_results' THEN
+        INSERT INTO candidate_funnel (candidate_id, final_passed, final_failed)
+        SELECT candidate_id, bool_or(decision ILIKE 'pass'), bool_or(decision ILIKE 'fail')
+          FROM new_rows
+         WHERE candidate_id IS NOT NULL AND (decision ILIKE 'pass' OR decision ILIKE 'fail')
+         GROUP BY candidate_id
+        ON CONFLICT (candidate_id) DO UPDATE SET
+            final_passed = candidate_funnel.final_passed OR EXCLUDED.final_passed,
+            final_failed = candidate_funnel.final_failed OR EXCLUDED.final_failed
+         WHERE (EXCLUDED.final_passed AND NOT candidate_funnel.final_passed)
+            OR (EXCLUDED.final_failed AND NOT candidate_funnel.final_failed);
+    END IF;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION funnel_rollup() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE pipeline_funnel p SET
+            passed_screening    = p.passed_screening    + d.ps,
+            passed_verification = p.passed_verification + d.pv,
+            final_passed        = p.final_passed        + d.fp,
+            final_failed        = p.final_failed        + d.ff
+        FROM (SELECT COUNT(*) FILTER (WHERE passed_screening)    AS ps,
+                     COUNT(*) FILTER (WHERE passed_verification) AS pv,
+                     COUNT(*) FILTER (WHERE final_passed)        AS fp,
+                     COUNT(*) FILTER (WHERE final_failed)        AS ff
+                FROM new_rows) d
+        WHERE p.id = 1;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE pipeline_funnel p SET
+            passed_screening    = p.passed_screening    - d.ps,
+            passed_verification = p.passed_verification - d.pv,
+            final_passed        = p.final_passed        - d.fp,
+            final_failed        = p.final_failed        - d.ff
+        FROM (SELECT COUNT(*) FILTER (WHERE passed_screening)    AS ps,
+                     COUNT(*) FILTER (WHERE passed_verification) AS pv,
+                     COUNT(*) FILTER (WHERE final_passed)        AS fp,
+                     COUNT(*) FILTER (WHERE final_failed)        AS ff
+                FROM old_rows) d
+        WHERE p.id = 1;
+    END IF;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS funnel_candidates_insert ON candidates;
+CREATE TRIGGER funnel_candidates_insert AFTER INSERT ON candidates
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION funnel_count_candidates();
+DROP TRIGGER IF EXISTS funnel_candidates_delete ON candidates;
+CREATE TRIGGER funnel_candidates_delete AFTER DELETE ON candidates
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION funnel_count_candidates();
+
+DROP TRIGGER IF EXISTS funnel_screening_insert ON screening_results;
+CREATE TRIGGER funnel_screening_insert AFTER INSERT ON screening_results
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION funnel_mark_results();
+DROP TRIGGER IF EXISTS funnel_background_insert ON background_checks;
+CREATE TRIGGER funnel_background_insert AFTER INSERT ON background_checks
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION funnel_mark_results();
+DROP TRIGGER IF EXISTS funnel_evaluation_insert ON evaluation_results;
+CREATE TRIGGER funnel_evaluation_insert AFTER INSERT ON evaluation_results
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION funnel_mark_results();
+
+DROP TRIGGER IF EXISTS funnel_rollup_insert ON candidate_funnel;
+CREATE TRIGGER funnel_rollup_insert AFTER INSERT ON candidate_funnel
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION funnel_rollup();
+DROP TRIGGER IF EXISTS funnel_rollup_update ON candidate_funnel;
+CREATE TRIGGER funnel_rollup_update AFTER UPDATE ON candidate_funnel
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION funnel_rollup();
+DROP TRIGGER IF EXISTS funnel_rollup_delete ON candidate_funnel;
+CREATE TRIGGER funnel_rollup_delete AFTER DELETE ON candidate_funnel
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION funnel_rollup();
+"""
+
+_FUNNEL_REBUILD_SQL = """
+LOCK TABLE pipeline_funnel IN EXCLUSIVE MODE;
+TRUNCATE candidate_funnel;
+UPDATE pipeline_funnel SET
+    total_candidates    = (SELECT COUNT(*) FROM candidates),
+    passed_screening    = 0,
+    passed_verification = 0,
+    final_passed        = 0,
+    final_failed        = 0
+WHERE id = 1;
+-- The rollup trigger on candidate_funnel adds the flag counts back.
+INSERT INTO candidate_funnel
+    (candidate_id, passed_screening, passed_verification, final_passed, final_failed)
+SELECT * FROM (
+    SELECT c.id,
+        EXISTS (SELECT 1 FROM screening_results sr WHERE sr.candidate_id = c.id
+                AND sr.decision ILIKE '%qualified%' AND sr.decision NOT ILIKE '%not%'),
+        EXISTS (SELECT 1 FROM background_checks bc WHERE bc.candidate_id = c.id
+                AND bc.credibility_score >= 70),
+        EXISTS (SELECT 1 FROM evaluation_results er WHERE er.candidate_id = c.id
+                AND er.decision ILIKE 'pass'),
+        EXISTS (SELECT 1 FROM evaluation_results er WHERE er.candidate_id = c.id
+                AND er.decision ILIKE 'fail')
+    FROM candidates c
+) f (candidate_id, ps, pv, fp, ff)
+WHERE ps OR pv OR fp OR ff;
+"""
+
+
+def refresh_pipeline_stats():
+    """Rebuild the funnel rollup from the result tables (one transaction)."""
+    with pooled_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(_FUNNEL_REBUILD_SQL)
+        conn.commit()
+        cur.close()
+    print("📊 Pipeline funnel rollup rebuilt.")
+
+
+# ──────────────────────────────────────────────
+# Schema migrations
+# Ordered, append-only list of (version, description, sql). Never edit a
+# migration that has shipped — add a new one. Applied versions are
+# recorded in schema_version; startup only runs the missing ones.
+# ──────────────────────────────────────────────
+
+_SCHEMA_TABLES_SQL = """
+-- Master candidate record
+CREATE TABLE IF NOT EXISTS candidates (
+    id              SERIAL PRIMARY KEY,
+    name            TEXT,
+    email           TEXT UNIQUE,
+    phone           TEXT,
+    resume_text     TEXT,
+    linkedin_url    TEXT,
+    github_username TEXT,
+    created_at      TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Resume screening outcome
+CREATE TABLE IF NOT EXISTS screening_results (
+    id              SERIAL PRIMARY KEY,
+    candidate_id    INT REFERENCES candidates(id) ON DELETE CASCADE,
+    decision        TEXT NOT NULL,          -- 'Qualified' | 'Not Qualified'
+    reason          TEXT,
+    raw_output      TEXT,
+    screened_at     TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Background verification
+CREATE TABLE IF NOT EXISTS background_checks (
+    id                  SERIAL PRIMARY KEY,
+    candidate_id        INT REFERENCES candidates(id) ON DELETE CASCADE,
+    credibility_score   INT,
+    status              TEXT,               -- 'VERIFIED' | 'PARTIALLY_VERIFIED' | 'UNVERIFIED'
+    recommendation      TEXT,
+    email_valid         BOOLEAN,
+    email_confidence    INT,
+    linkedin_found      BOOLEAN,
+    linkedin_confidence INT,
+    github_found        BOOLEAN,
+    github_repos        INT,
+    github_mern_projects INT,
+    issues              TEXT[],
+    verified_at         TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Interview call session
+CREATE TABLE IF NOT EXISTS interview_sessions (
+    id                  SERIAL PRIMARY KEY,
+    candidate_id        INT REFERENCES candidates(id) ON DELETE CASCADE,
+    call_id             TEXT,               -- Vapi call ID
+    phone_number        TEXT,
+    call_status         TEXT,               -- 'completed' | 'no-answer' | 'failed'
+    questions_asked     TEXT,
+    transcript          TEXT,
+    duration_seconds    INT,
+    called_at           TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Final evaluation + decision
+CREATE TABLE IF NOT EXISTS evaluation_results (
+    id                  SERIAL PRIMARY KEY,
+    candidate_id        INT REFERENCES candidates(id) ON DELETE CASCADE,
+    questions_asked     INT,
+    perfect_answers     INT,
+    score               NUMERIC(5,2),
+    decision            TEXT NOT NULL,      -- 'Pass' | 'Fail'
+    reason              TEXT,
+    raw_output          TEXT,
+    slack_notified      BOOLEAN DEFAULT FALSE,
+    email_sent          BOOLEAN DEFAULT FALSE,
+    evaluated_at        TIMESTAMPTZ DEFAULT NOW()
+);
+"""
+
+_RESULT_INDEXES_SQL = """
+-- Foreign-key lookups (+ "latest result per candidate") and dashboard ordering
+CREATE INDEX IF NOT EXISTS idx_candidates_created_at
+    ON candidates (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_screening_results_candidate
+    ON screening_results (candidate_id, screened_at DESC);
+CREATE INDEX IF NOT EXISTS idx_background_checks_candidate
+    ON background_checks (candidate_id, verified_at DESC);
+CREATE INDEX IF NOT EXISTS idx_interview_sessions_candidate
+    ON interview_sessions (candidate_id, called_at DESC);
+CREATE INDEX IF NOT EXISTS idx_evaluation_results_candidate
+    ON evaluation_results (candidate_id, evaluated_at DESC);
+"""
+
+# Ids of write-behind spool records already applied (see utils/write_spool.py).
+_SPOOL_APPLIED_SQL = """
+CREATE TABLE IF NOT EXISTS spool_applied (
+    record_id   UUID PRIMARY KEY,
+    applied_at  TIMESTAMPTZ DEFAULT NOW()
+);
+"""
+
+# Content hashes of json_store fallback records already replayed
+# (see utils/replay_fallback.py).
+_FALLBACK_REPLAYED_SQL = """
+CREATE TABLE IF NOT EXISTS fallback_replayed (
+    content_hash TEXT PRIMARY KEY,
+    replayed_at  TIMESTAMPTZ DEFAULT NOW()
+);
+"""
+
+# SQL twin of resume_hash(): hex SHA-256 of the UTF-8 text.
+_SQL_SHA256 = "encode(sha256(convert_to({}, 'UTF8')), 'hex')"
+
+# Resume text lives once per distinct text, keyed by its SHA-256; candidates
+# point at it through resume_hash. resume_files maps the SHA-256 of an
+# uploaded file to the text extracted from it, so a re-upload skips the parse.
+# TOAST only steps in once a row passes TOAST_TUPLE_THRESHOLD (about 2 kB),
+# so shorter resumes are stored uncompressed. toast_tuple_target = 256
+# doesn't lower that threshold; it makes the toaster, once it runs, keep
+# compressing (and moving values out of line) until the row is under
+# 256 bytes instead of stopping at ~2 kB.
+_RESUME_BLOBS_SQL = f"""
+CREATE TABLE IF NOT EXISTS resume_blobs (
+    text_hash   TEXT PRIMARY KEY,
+    content     TEXT NOT NULL,
+    created_at  TIMESTAMPTZ DEFAULT NOW()
+) WITH (toast_tuple_target = 256);
+
+CREATE TABLE IF NOT EXISTS resume_files (
+    file_hash   TEXT PRIMARY KEY,
+    text_hash   TEXT NOT NULL REFERENCES resume_blobs(text_hash),
+    created_at  TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE candidates
+    ADD COLUMN IF NOT EXISTS resume_hash TEXT REFERENCES resume_blobs(text_hash);
+
+-- Move existing inline resume_text out of the candidates heap.
+INSERT INTO resume_blobs (text_hash, content)
+SELECT DISTINCT ON (text_hash) text_hash, resume_text
+FROM (SELECT {_SQL_SHA256.format("resume_text")} AS text_hash, resume_text
+      FROM candidates WHERE resume_text IS NOT NULL) s
+ON CONFLICT (text_hash) DO NOTHING;
+
+UPDATE candidates
+SET resume_hash = {_SQL_SHA256.format("resume_text")}, resume_text = NULL
+WHERE resume_text IS NOT NULL;
+"""
+
+MIGRATIONS = [
+    (1, "core tables", _SCHEMA_TABLES_SQL),
+    (2, "candidate_id / timestamp indexes", _RESULT_INDEXES_SQL),
+    (3, "funnel rollup for get_pipeline_stats",
+     _FUNNEL_DDL
+     + "INSERT INTO pipeline_funnel (id) VALUES (1) ON CONFLICT (id) DO NOTHING;\n"
+     + _FUNNEL_REBUILD_SQL),
+    (4, "write-behind spool dedupe", _SPOOL_APPLIED_SQL),
+    (5, "fallback replay dedupe", _FALLBACK_REPLAYED_SQL),
+    (6, "content-addressed resume_blobs", _RESUME_BLOBS_SQL),
+]
+
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# Arbitrary constant shared by every worker running migrations.
+_MIGRATION_LOCK_KEY = 0x4147_4601
+
+
+def get_schema_version(conn) -> int:
+    """Highest applied migration (0 if schema_version doesn't exist yet)."""
+    cur = conn.cursor()
     try:
-        conn = get_connection()
+        cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version;")
+        return cur.fetchone()[0]
+    except psycopg2.errors.UndefinedTable:
+        return 0
+    finally:
+        cur.close()
+        conn.rollback()
+
+
+def migrate() -> int:
+    """
+    Bring the schema up to LATEST_SCHEMA_VERSION and return the version.
+
+    The common case is one SELECT. Otherwise pending migrations run in a
+    single transaction under a transaction-scoped advisory lock, so when
+    several workers start together one applies them and the others wait,
+    re-check the version and find nothing left to do.
+    """
+    with pooled_connection() as conn:
+        current = get_schema_version(conn)
+        if current >= LATEST_SCHEMA_VERSION:
+            return current
+
         cur = conn.cursor()
-        cur.execute(ddl)
+        cur.execute("SELECT pg_advisory_xact_lock(%s);", (_MIGRATION_LOCK_KEY,))
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version     INT PRIMARY KEY,
+            description TEXT,
+            applied_at  TIMESTAMPTZ DEFAULT NOW()
+        );
+        """)
+        cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version;")
+        current = cur.fetchone()[0]
+        for version, description, sql in MIGRATIONS:
+            if version <= current:
+                continue
+            cur.execute(sql)
+            cur.execute("INSERT INTO schema_version (version, description) VALUES (%s, %s);",
+                        (version, description))
+            print(f"🛠️  Applied migration {version}: {description}")
+            current = version
         conn.commit()
         cur.close()
-        print("✅ Supabase tables initialised.")
+        return current
+
+
+def init_tables():
+    """
+    Apply any pending schema migrations (see MIGRATIONS).
+    Safe and cheap to call on every startup.
+    """
+    try:
+        version = migrate()
+        print(f"✅ Supabase schema ready (v{version}).")
     except Exception as e:
         print(f"❌ Failed to initialise tables: {e}")
-        if conn:
-            conn.rollback()
         raise
-    finally:
-        if conn:
-            conn.close()
+    # Apply writes spooled by earlier runs (see utils/write_spool.py).
+    from utils import write_spool
+    write_spool.resume_pending()
+
+
+# ──────────────────────────────────────────────
+# Resume blobs  (content-addressed, see _RESUME_BLOBS_SQL)
+# ──────────────────────────────────────────────
+
+_RESUME_EXISTS_SQL = "SELECT 1 FROM resume_blobs WHERE text_hash = %s;"
+_INSERT_RESUME_SQL = ("INSERT INTO resume_blobs (text_hash, content) VALUES (%s, %s) "
+                      "ON CONFLICT (text_hash) DO NOTHING;")
+_INSERT_RESUME_FILE_SQL = ("INSERT INTO resume_files (file_hash, text_hash) VALUES (%s, %s) "
+                           "ON CONFLICT (file_hash) DO NOTHING;")
+_RESUME_BY_FILE_SQL = """
+SELECT rb.content
+FROM resume_files rf
+JOIN resume_blobs rb ON rb.text_hash = rf.text_hash
+WHERE rf.file_hash = %s;
+"""
+
+
+def resume_hash(text: str) -> str:
+    """Hex SHA-256 of extracted resume text (the resume_blobs key)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _put_resume(cur, text: Optional[str]) -> Optional[str]:
+    """Make sure `text` is in resume_blobs and return its hash. Known text isn't resent."""
+    if not text:
+        return None
+    text_hash = resume_hash(text)
+    cur.execute(_RESUME_EXISTS_SQL, (text_hash,))
+    if cur.fetchone() is None:
+        cur.execute(_INSERT_RESUME_SQL, (text_hash, text))
+    return text_hash
+
+
+def store_resume(text: str, file_hash: str = None) -> Optional[str]:
+    """
+    Store extracted resume text (and which uploaded file it came from).
+    Returns the text hash, or None on failure.
+    """
+    try:
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+            text_hash = _put_resume(cur, text)
+            if text_hash and file_hash:
+                cur.execute(_INSERT_RESUME_FILE_SQL, (file_hash, text_hash))
+            conn.commit()
+            cur.close()
+        return text_hash
+    except Exception as e:
+        print(f"❌ store_resume failed: {e}")
+        return None
+
+
+def get_resume_by_file_hash(file_hash: str) -> Optional[str]:
+    """Text previously extracted from a file with this hash, or None."""
+    rows = _fetch_all(_RESUME_BY_FILE_SQL, (file_hash,))
+    return rows[0]["content"] if rows else None
 
 
 # ──────────────────────────────────────────────
 # Candidate  (upsert by email)
 # ──────────────────────────────────────────────
 
+# resume_text is stored in resume_blobs; the row only carries its hash.
+_UPSERT_CANDIDATE_SQL = """
+INSERT INTO candidates (name, email, phone, resume_hash, linkedin_url, github_username)
+VALUES (%s, %s, %s, %s, %s, %s)
+ON CONFLICT (email) DO UPDATE SET
+    name            = EXCLUDED.name,
+    phone           = EXCLUDED.phone,
+    resume_hash     = EXCLUDED.resume_hash,
+    linkedin_url    = EXCLUDED.linkedin_url,
+    github_username = EXCLUDED.github_username
+RETURNING id;
+"""
+
+
 def upsert_candidate(name=None, email=None, phone=None, resume_text=None,
                      linkedin_url=None, github_username=None) -> Optional[int]:
     """
     Insert or update a candidate row.
     Returns the candidate's integer id, or None on failure.
     """
-    sql = """
-    INSERT INTO candidates (name, email, phone, resume_text, linkedin_url, github_username)
-    VALUES (%s, %s, %s, %s, %s, %s)
-    ON CONFLICT (email) DO UPDATE SET
-        name            = EXCLUDED.name,
-        phone           = EXCLUDED.phone,
-        resume_text     = EXCLUDED.resume_text,
-        linkedin_url    = EXCLUDED.linkedin_url,
-        github_username = EXCLUDED.github_username
-    RETURNING id;
-    """
-    conn = None
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute(sql, (name, email, phone, resume_text, linkedin_url, github_username))
-        row = cur.fetchone()
-        conn.commit()
-        cur.close()
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+            text_hash = _put_resume(cur, resume_text)
+            cur.execute(_UPSERT_CANDIDATE_SQL,
+                        (name, email, phone, text_hash, linkedin_url, github_username))
+            row = cur.fetchone()
+            conn.commit()
+            cur.close()
         candidate_id = row[0] if row else None
         print(f"📁 Candidate saved (id={candidate_id})")
         return candidate_id
     except Exception as e:
         print(f"❌ upsert_candidate failed: {e}")
-        if conn:
-            conn.rollback()
         return None
-    finally:
-        if conn:
-            conn.close()
+
+
+_CANDIDATE_BY_EMAIL_SQL = """
+SELECT c.id, c.name, c.email, c.phone,
+       COALESCE(rb.content, c.resume_text) AS resume_text, c.resume_hash,
+       c.linkedin_url, c.github_username, c.created_at
+FROM candidates c
+LEFT JOIN resume_blobs rb ON rb.text_hash = c.resume_hash
+WHERE c.email = %s
+LIMIT 1;
+"""
 
 
 def get_candidate_by_email(email: str) -> Optional[dict]:
-    """Look up a candidate by email. Returns a dict or None."""
-    sql = "SELECT * FROM candidates WHERE email = %s LIMIT 1;"
-    conn = None
+    """Look up a candidate by email (resume_text joined in). Returns a dict or None."""
+    sql = _CANDIDATE_BY_EMAIL_SQL
     try:
-        conn = get_connection()
-        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-        cur.execute(sql, (email,))
-        row = cur.fetchone()
-        cur.close()
+        with pooled_connection() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+            cur.execute(sql, (email,))
+            row = cur.fetchone()
+            cur.close()
         return dict(row) if row else None
     except Exception as e:
         print(f"❌ get_candidate_by_email failed: {e}")
         return None
-    finally:
-        if conn:
-            conn.close()
+
+
+# ──────────────────────────────────────────────
+# Result rows
+# Column order for each result table (candidate_id is always first and
+# is prepended at write time). The _*_row() builders turn agent output
+# into a tuple in this order; both the save_*() helpers and
+# CandidateSession use them.
+# ──────────────────────────────────────────────
+
+_RESULT_COLUMNS = {
+    "screening_results": ("decision", "reason", "raw_output"),
+    "background_checks": (
+        "credibility_score", "status", "recommendation",
+        "email_valid", "email_confidence",
+        "linkedin_found", "linkedin_confidence",
+        "github_found", "github_repos", "github_mern_projects",
+        "issues",
+    ),
+    "interview_sessions": (
+        "call_id", "phone_number", "call_status",
+        "questions_asked", "transcript", "duration_seconds",
+    ),
+    "evaluation_results": (
+        "questions_asked", "perfect_answers", "score", "decision",
+        "reason", "raw_output", "slack_notified", "email_sent",
+    ),
+}
+
+
+# Timestamp column of each result table (defaults to NOW()).
+_RESULT_TIMESTAMPS = {
+    "screening_results": "screened_at",
+    "background_checks": "verified_at",
+    "interview_sessions": "called_at",
+    "evaluation_results": "evaluated_at",
+}
+
+
+def _insert_result(table: str, candidate_id: int, row: tuple, success_msg: str):
+    payload = {"table": table,
+               "columns": ("candidate_id",) + _RESULT_COLUMNS[table],
+               "values": (candidate_id,) + row}
+    _write_or_spool("insert", payload, success_msg=success_msg)
 
 
 # ──────────────────────────────────────────────
 # Screening Result
 # ──────────────────────────────────────────────
 
-def save_screening_result(candidate_id: int, raw_output: str):
-    """Parse and save the screening agent's raw output."""
+def _screening_row(raw_output: str) -> tuple:
     decision = "Not Qualified"
     reason = ""
     for line in raw_output.splitlines():
@@ -244,37 +1096,25 @@ def save_screening_result(candidate_id: int, raw_output: str):
             decision = line.split(":", 1)[1].strip()
         elif line.startswith("Reason:"):
             reason = line.split(":", 1)[1].strip()
+    return (decision, reason, raw_output)
 
-    sql = """
-    INSERT INTO screening_results (candidate_id, decision, reason, raw_output)
-    VALUES (%s, %s, %s, %s);
-    """
-    _execute(sql, (candidate_id, decision, reason, raw_output),
-             success_msg="📋 Screening result saved.")
+
+def save_screening_result(candidate_id: int, raw_output: str):
+    """Parse and save the screening agent's raw output."""
+    _insert_result("screening_results", candidate_id, _screening_row(raw_output),
+                   success_msg="📋 Screening result saved.")
 
 
 # ──────────────────────────────────────────────
 # Background Verification
 # ──────────────────────────────────────────────
 
-def save_background_check(candidate_id: int, verification_result: dict):
-    """Save the output from background_verification_agent.verify_background()."""
+def _background_row(verification_result: dict) -> tuple:
     checks = verification_result.get("checks", {})
     email_check = checks.get("email", {})
     linkedin_check = checks.get("linkedin", {})
     github_check = checks.get("github", {})
-
-    sql = """
-    INSERT INTO background_checks (
-        candidate_id, credibility_score, status, recommendation,
-        email_valid, email_confidence,
-        linkedin_found, linkedin_confidence,
-        github_found, github_repos, github_mern_projects,
-        issues
-    ) VALUES (%s,%s,%s,%s, %s,%s, %s,%s, %s,%s,%s, %s);
-    """
-    values = (
-        candidate_id,
+    return (
         verification_result.get("credibility_score"),
         verification_result.get("status"),
         verification_result.get("recommendation"),
@@ -287,43 +1127,40 @@ def save_background_check(candidate_id: int, verification_result: dict):
         github_check.get("mern_projects"),
         verification_result.get("issues", []),
     )
-    _execute(sql, values, success_msg="🔍 Background check saved.")
+
+
+def save_background_check(candidate_id: int, verification_result: dict):
+    """Save the output from background_verification_agent.verify_background()."""
+    _insert_result("background_checks", candidate_id, _background_row(verification_result),
+                   success_msg="🔍 Background check saved.")
 
 
 # ──────────────────────────────────────────────
 # Interview Session
 # ──────────────────────────────────────────────
 
+def _interview_row(call_id: str, phone_number: str, questions: str, transcript: str = None,
+                   call_status: str = "completed", duration_seconds: int = None) -> tuple:
+    return (call_id, phone_number, call_status, questions, transcript, duration_seconds)
+
+
 def save_interview_session(candidate_id: int, call_id: str, phone_number: str,
                            questions: str, transcript: str = None,
                            call_status: str = "completed", duration_seconds: int = None):
     """Save a Vapi interview call session."""
-    sql = """
-    INSERT INTO interview_sessions
-        (candidate_id, call_id, phone_number, call_status, questions_asked, transcript, duration_seconds)
-    VALUES (%s, %s, %s, %s, %s, %s, %s);
-    """
-    _execute(sql, (candidate_id, call_id, phone_number, call_status,
-                   questions, transcript, duration_seconds),
-             success_msg="📞 Interview session saved.")
+    row = _interview_row(call_id, phone_number, questions, transcript,
+                         call_status, duration_seconds)
+    _insert_result("interview_sessions", candidate_id, row,
+                   success_msg="📞 Interview session saved.")
 
 
 # ──────────────────────────────────────────────
 # Evaluation Result
 # ──────────────────────────────────────────────
 
-def save_evaluation_result(candidate_id: int, raw_output: str,
-                           slack_notified=False, email_sent=False):
-    """Parse and save the final LLM evaluation output."""
+def _evaluation_row(raw_output: str, slack_notified=False, email_sent=False) -> tuple:
     parsed = _parse_evaluation(raw_output)
-    sql = """
-    INSERT INTO evaluation_results
-        (candidate_id, questions_asked, perfect_answers, score, decision,
-         reason, raw_output, slack_notified, email_sent)
-    VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s);
-    """
-    values = (
-        candidate_id,
+    return (
         parsed["questions_asked"],
         parsed["perfect_answers"],
         parsed["score"],
@@ -333,7 +1170,14 @@ def save_evaluation_result(candidate_id: int, raw_output: str,
         slack_notified,
         email_sent,
     )
-    _execute(sql, values, success_msg="📊 Evaluation result saved.")
+
+
+def save_evaluation_result(candidate_id: int, raw_output: str,
+                           slack_notified=False, email_sent=False):
+    """Parse and save the final LLM evaluation output."""
+    _insert_result("evaluation_results", candidate_id,
+                   _evaluation_row(raw_output, slack_notified, email_sent),
+                   success_msg="📊 Evaluation result saved.")
 
 
 def _parse_evaluation(raw: str) -> dict:
@@ -369,43 +1213,287 @@ def _parse_evaluation(raw: str) -> dict:
     return result
 
 
+# ──────────────────────────────────────────────
+# Unit of work  (one transaction per candidate)
+# ──────────────────────────────────────────────
+
+class CandidateSession:
+    """
+    Buffers one candidate's pipeline writes and flushes them together.
+
+    A flush borrows one pooled connection and runs one transaction:
+      1. upsert the candidate row (RETURNING id)
+      2. one multi-statement round trip with a multi-row INSERT per
+         result table (rows rendered with mogrify, as execute_values does)
+      3. COMMIT
+    Either every buffered row lands or none does. If Postgres is
+    unreachable the whole flush goes to the write-behind spool; on any
+    other failure the buffer is kept so flush() can be retried.
+
+    Usage:
+        with CandidateSession(email=email, resume_text=text) as session:
+            session.add_screening_result(raw)
+            ...
+        session.candidate_id   # set after the block flushes
+
+    Leaving the `with` block flushes, including on SystemExit/exceptions,
+    so stages that already finished are not lost when a later one fails.
+    """
+
+    def __init__(self, name=None, email=None, phone=None, resume_text=None,
+                 linkedin_url=None, github_username=None, candidate_id: int = None):
+        self.candidate_id = candidate_id
+        self._candidate = {
+            "name": name, "email": email, "phone": phone, "resume_text": resume_text,
+            "linkedin_url": linkedin_url, "github_username": github_username,
+        }
+        self._candidate_dirty = candidate_id is None
+        self._rows = {table: [] for table in _RESULT_COLUMNS}
+        self.spooled = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
+
+    # ── buffering ───────────────────────────────
+
+    def update_candidate(self, **fields):
+        """Change candidate columns (name, email, phone, ...) before the flush."""
+        unknown = set(fields) - set(self._candidate)
+        if unknown:
+            raise TypeError(f"Unknown candidate field(s): {', '.join(sorted(unknown))}")
+        self._candidate.update(fields)
+        self._candidate_dirty = True
+
+    def add_screening_result(self, raw_output: str):
+        self._rows["screening_results"].append(_screening_row(raw_output))
+
+    def add_background_check(self, verification_result: dict):
+        self._rows["background_checks"].append(_background_row(verification_result))
+
+    def add_interview_session(self, call_id: str, phone_number: str, questions: str,
+                              transcript: str = None, call_status: str = "completed",
+                              duration_seconds: int = None):
+        self._rows["interview_sessions"].append(
+            _interview_row(call_id, phone_number, questions, transcript,
+                           call_status, duration_seconds))
+
+    def add_evaluation_result(self, raw_output: str, slack_notified=False, email_sent=False):
+        self._rows["evaluation_results"].append(
+            _evaluation_row(raw_output, slack_notified, email_sent))
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered result rows."""
+        return sum(len(rows) for rows in self._rows.values())
+
+    # ── flushing ────────────────────────────────
+
+    def flush(self) -> Optional[int]:
+        """
+        Write everything buffered in one transaction. Returns the candidate id.
+
+        If the write goes to the spool instead (DB_WRITE_BEHIND=1, or
+        Postgres unreachable) `spooled` is set and the id is only returned
+        when it was already known.
+        """
+        if not self._candidate_dirty and not self.pending:
+            return self.candidate_id
+
+        if WRITE_BEHIND:
+            return self._spool()
+        try:
+            candidate_id = self._write()
+        except _TRANSIENT_ERRORS as e:
+            return self._spool(reason=f" (DB unavailable: {e})")
+        except Exception as e:
+            print(f"❌ CandidateSession flush failed ({self.pending} rows kept): {e}")
+            return None
+
+        written = self.pending
+        self.candidate_id = candidate_id
+        self._clear()
+        print(f"📁 Candidate saved (id={candidate_id}) with {written} result row(s) in one transaction.")
+        return candidate_id
+
+    def _write(self) -> int:
+        """Run the flush transaction; returns the candidate id. Raises on failure."""
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+            candidate_id = _write_session(cur, self.candidate_id, self._candidate,
+                                          self._candidate_dirty, self._rows)
+            conn.commit()
+            cur.close()
+        return candidate_id
+
+    def _spool(self, reason: str = "") -> Optional[int]:
+        payload = {"candidate_id": self.candidate_id, "candidate": self._candidate,
+                   "candidate_dirty": self._candidate_dirty, "rows": self._rows}
+        if not _spool("session", payload, reason):
+            return None
+        self.spooled = True
+        self._clear()
+        return self.candidate_id
+
+    def _clear(self):
+        self._candidate_dirty = False
+        for rows in self._rows.values():
+            rows.clear()
+
+
+def _write_session(cur, candidate_id: Optional[int], candidate: dict,
+                   candidate_dirty: bool, rows_by_table: dict) -> int:
+    """
+    Body of a CandidateSession flush on an open cursor (no COMMIT):
+    upsert the candidate if needed, then one multi-row INSERT per table.
+    """
+    c = candidate
+    if candidate_dirty:
+        cur.execute(_UPSERT_CANDIDATE_SQL,
+                    (c["name"], c["email"], c["phone"], _put_resume(cur, c["resume_text"]),
+                     c["linkedin_url"], c["github_username"]))
+        candidate_id = cur.fetchone()[0]
+
+    statements = []
+    for table, rows in rows_by_table.items():
+        if not rows:
+            continue
+        columns = ("candidate_id",) + _RESULT_COLUMNS[table]
+        template = "(" + ", ".join(["%s"] * len(columns)) + ")"
+        # tuple(): rows read back from the spool are JSON lists.
+        values = b", ".join(cur.mogrify(template, (candidate_id,) + tuple(row))
+                            for row in rows)
+        statements.append(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ".encode() + values)
+    if statements:
+        cur.execute(b";\n".join(statements))
+    return candidate_id
+
+
 # ──────────────────────────────────────────────
 # Legacy / compatibility shim
 # (replaces utils/json_store.store_candidate_json)
 # ──────────────────────────────────────────────
 
-def store_candidate_result(candidate_data: dict):
+def store_candidate_result(candidate_data: dict) -> bool:
     """
     Generic save used by final_decision_agent.
     Expects keys: decision, evaluation_summary, remarks (optional).
     Falls back gracefully if candidate_id unavailable.
+    Returns False if the result was neither written nor queued in the spool.
     """
+    if candidate_data.get("candidate_id"):
+        success_msg = "📊 Evaluation result saved."
+    else:
+        success_msg = "📁 Candidate result stored in Supabase."
+    return _write_or_spool("insert", _candidate_result_payload(candidate_data),
+                           success_msg=success_msg)
+
+
+def _candidate_result_payload(candidate_data: dict, evaluated_at=None) -> dict:
+    """The evaluation_results insert for a store_candidate_result() dict."""
     candidate_id = candidate_data.get("candidate_id")
     raw_output = candidate_data.get("evaluation_summary", "")
     slack_notified = candidate_data.get("slack_notified", False)
     email_sent = candidate_data.get("email_sent", False)
 
     if candidate_id:
-        save_evaluation_result(candidate_id, raw_output, slack_notified, email_sent)
+        columns = ("candidate_id",) + _RESULT_COLUMNS["evaluation_results"]
+        values = (candidate_id,) + _evaluation_row(raw_output, slack_notified, email_sent)
     else:
         # Minimal insert without foreign-key link
-        sql = """
-        INSERT INTO evaluation_results (decision, reason, raw_output, slack_notified, email_sent)
-        VALUES (%s, %s, %s, %s, %s);
-        """
-        decision = candidate_data.get("decision", "Fail")
-        reason = candidate_data.get("remarks", "")
-        _execute(sql, (decision, reason, raw_output, slack_notified, email_sent),
-                 success_msg="📁 Candidate result stored in Supabase.")
+        columns = ("decision", "reason", "raw_output", "slack_notified", "email_sent")
+        values = (candidate_data.get("decision", "Fail"), candidate_data.get("remarks", ""),
+                  raw_output, slack_notified, email_sent)
+    if evaluated_at is not None:
+        columns += ("evaluated_at",)
+        values += (evaluated_at,)
+    return {"table": "evaluation_results", "columns": columns, "values": values}
 
 
 # ──────────────────────────────────────────────
 # Read helpers (for dashboard / reporting)
 # ──────────────────────────────────────────────
 
+_ALL_CANDIDATES_SQL = """
+SELECT
+    c.id, c.name, c.email, c.phone, c.github_username, c.created_at,
+    er.decision, er.score, er.evaluated_at
+FROM candidates c
+LEFT JOIN LATERAL (
+    SELECT decision, score, evaluated_at
+    FROM evaluation_results
+    WHERE candidate_id = c.id
+    ORDER BY evaluated_at DESC
+    LIMIT 1
+) er ON TRUE
+ORDER BY c.created_at DESC;
+"""
+
+# Constant-time: reads the trigger-maintained rollup (see _FUNNEL_DDL).
+_PIPELINE_STATS_SQL = """
+SELECT total_candidates, passed_screening, passed_verification,
+       final_passed, final_failed
+FROM pipeline_funnel
+WHERE id = 1;
+"""
+
+
 def get_all_candidates() -> list[dict]:
-    """Return all candidates with their latest evaluation decision."""
-    sql = """
+    """
+    Return all candidates with their latest evaluation decision.
+    Prefer get_candidates_page() / iter_candidates() on large tables.
+    """
+    return _fetch_all(_ALL_CANDIDATES_SQL)
+
+
+# ── Keyset pagination on (created_at, id), newest first ──
+
+def encode_cursor(row: dict) -> str:
+    """Opaque page cursor for the row a page ended on."""
+    raw = json.dumps([row["created_at"].isoformat(), row["id"]])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Inverse of encode_cursor(). Raises ValueError on a malformed cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, candidate_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(candidate_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def _candidates_query(cursor: str = None, decision: str = None,
+                      min_score: float = None, max_score: float = None,
+                      created_from: datetime = None, created_to: datetime = None,
+                      limit: int = None) -> tuple:
+    """Build the filtered keyset query. Returns (sql, params) with %s placeholders."""
+    where, params = [], []
+    if cursor:
+        where.append("(c.created_at, c.id) < (%s, %s)")
+        params.extend(decode_cursor(cursor))
+    if created_from:
+        where.append("c.created_at >= %s")
+        params.append(created_from)
+    if created_to:
+        where.append("c.created_at < %s")
+        params.append(created_to)
+    if decision:
+        where.append("er.decision ILIKE %s")
+        params.append(decision)
+    if min_score is not None:
+        where.append("er.score >= %s")
+        params.append(Decimal(str(min_score)))
+    if max_score is not None:
+        where.append("er.score <= %s")
+        params.append(Decimal(str(max_score)))
+
+    sql = f"""
     SELECT
         c.id, c.name, c.email, c.phone, c.github_username, c.created_at,
         er.decision, er.score, er.evaluated_at
@@ -417,31 +1505,56 @@ def get_all_candidates() -> list[dict]:
         ORDER BY evaluated_at DESC
         LIMIT 1
     ) er ON TRUE
-    ORDER BY c.created_at DESC;
+    {"WHERE " + " AND ".join(where) if where else ""}
+    ORDER BY c.created_at DESC, c.id DESC
+    {"LIMIT %s" if limit else ""};
     """
-    return _fetch_all(sql)
+    if limit:
+        params.append(limit)
+    return sql, tuple(params)
+
+
+def _page_result(rows: list, limit: int) -> dict:
+    """Trim the limit+1 probe row and derive next_cursor from the last item."""
+    items = rows[:limit]
+    has_more = len(rows) > limit
+    return {
+        "items": items,
+        "next_cursor": encode_cursor(items[-1]) if has_more and items else None,
+    }
+
+
+def get_candidates_page(limit: int = 50, cursor: str = None, **filters) -> dict:
+    """
+    One page of candidates (newest first) with their latest evaluation.
+    filters: decision, min_score, max_score, created_from, created_to.
+    Returns {"items": [...], "next_cursor": str | None}.
+    """
+    sql, params = _candidates_query(cursor=cursor, limit=limit + 1, **filters)
+    return _page_result(_fetch_all(sql, params), limit)
+
+
+def iter_candidates(itersize: int = 500, **filters):
+    """
+    Stream every matching candidate through a server-side (named) cursor,
+    `itersize` rows per round trip, so memory stays flat on huge tables.
+    Accepts the same filters as get_candidates_page(), plus `cursor`.
+    """
+    sql, params = _candidates_query(**filters)
+    with pooled_connection() as conn:
+        cur = conn.cursor(name="iter_candidates",
+                          cursor_factory=psycopg2.extras.RealDictCursor)
+        cur.itersize = itersize
+        cur.execute(sql, params)
+        for row in cur:
+            yield dict(row)
+        cur.close()
+        conn.rollback()
 
 
 def get_pipeline_stats() -> dict:
     """Return aggregate stats for the dashboard."""
-    sql = """
-    SELECT
-        COUNT(DISTINCT c.id)                                        AS total_candidates,
-        COUNT(DISTINCT sr.candidate_id)
-            FILTER (WHERE sr.decision ILIKE '%qualified%'
-                    AND sr.decision NOT ILIKE '%not%')              AS passed_screening,
-        COUNT(DISTINCT bc.candidate_id)
-            FILTER (WHERE bc.credibility_score >= 70)               AS passed_verification,
-        COUNT(DISTINCT er.candidate_id)
-            FILTER (WHERE er.decision ILIKE 'pass')                 AS final_passed,
-        COUNT(DISTINCT er.candidate_id)
-            FILTER (WHERE er.decision ILIKE 'fail')                 AS final_failed
-    FROM candidates c
-    LEFT JOIN screening_results  sr ON sr.candidate_id = c.id
-    LEFT JOIN background_checks  bc ON bc.candidate_id = c.id
-    LEFT JOIN evaluation_results er ON er.candidate_id = c.id;
-    """
-    rows = _fetch_all(sql)
+    rows = _fetch_all(_PIPELINE_STATS_SQL)
     return rows[0] if rows else {}
 
 
@@ -449,40 +1562,109 @@ def get_pipeline_stats() -> dict:
 # Internal helpers
 # ──────────────────────────────────────────────
 
-def _execute(sql: str, values: tuple, success_msg: str = ""):
-    conn = None
-    try:
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute(sql, values)
-        conn.commit()
-        cur.close()
-        if success_msg:
-            print(success_msg)
-    except Exception as e:
-        print(f"❌ DB write failed: {e}")
-        if conn:
-            conn.rollback()
-    finally:
-        if conn:
-            conn.close()
-
-
 def _fetch_all(sql: str, values: tuple = ()) -> list[dict]:
-    conn = None
     try:
-        conn = get_connection()
-        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-        cur.execute(sql, values)
-        rows = [dict(r) for r in cur.fetchall()]
-        cur.close()
+        with pooled_connection() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+            # No params → no %-interpolation, so LIKE patterns such as '%not%' survive.
+            cur.execute(sql, values or None)
+            rows = [dict(r) for r in cur.fetchall()]
+            cur.close()
         return rows
     except Exception as e:
         print(f"❌ DB read failed: {e}")
         return []
-    finally:
-        if conn:
-            conn.close()
+
+
+# ──────────────────────────────────────────────
+# Write-behind  (durable spool, see utils/write_spool.py)
+# With DB_WRITE_BEHIND=1 result rows and CandidateSession flushes are
+# appended to the local spool and applied by its background flusher, so
+# the pipeline never waits on Postgres. Otherwise they are written
+# directly, and only spooled if Postgres is unreachable.
+# ──────────────────────────────────────────────
+
+WRITE_BEHIND = os.getenv("DB_WRITE_BEHIND", "0").strip().lower() in ("1", "true", "yes")
+
+# Errors a direct write is spooled for instead of dropped: Postgres is
+# unreachable or failing. Which of them are worth retrying is decided by
+# _is_transient(); the spool flusher dead-letters the rest.
+_TRANSIENT_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError, PoolTimeout)
+
+# SQLSTATEs outside class 08 that also mean the server went away.
+_SHUTDOWN_CODES = ("57P01", "57P02", "57P03")     # admin/crash shutdown, cannot connect now
+
+
+def _is_transient(error: BaseException) -> bool:
+    """
+    True if `error` means "Postgres is unreachable right now", not "this
+    write is bad": a connection-class failure (SQLSTATE 08xxx, a server
+    shutdown, or a client-side error with no SQLSTATE such as a refused or
+    closed connection), an open breaker or an exhausted pool. A statement
+    or lock timeout on one record is not; retrying it would never end.
+    """
+    if isinstance(error, (PoolTimeout, CircuitOpenError, psycopg2.InterfaceError)):
+        return True
+    if isinstance(error, psycopg2.OperationalError):
+        code = error.pgcode
+        return code is None or code.startswith("08") or code in _SHUTDOWN_CODES
+    return False
+
+
+def _apply_insert(cur, payload: dict):
+    """Spool op "insert": one row into a result table."""
+    table, columns = payload["table"], tuple(payload["columns"])
+    allowed = ("candidate_id",) + _RESULT_COLUMNS[table] + (_RESULT_TIMESTAMPS[table],)
+    if not set(columns) <= set(allowed):
+        raise ValueError(f"Unknown column(s) for {table}: {set(columns) - set(allowed)}")
+    cur.execute(f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(['%s'] * len(columns))});", tuple(payload["values"]))
+
+
+def _apply_session(cur, payload: dict) -> int:
+    """Spool op "session": a serialized CandidateSession flush."""
+    return _write_session(cur, payload["candidate_id"], payload["candidate"],
+                          payload["candidate_dirty"], payload["rows"])
+
+
+# Spooled operations by name; each is applied with a cursor inside the
+# flusher's batch transaction.
+SPOOL_OPS = {
+    "insert": _apply_insert,
+    "session": _apply_session,
+}
+
+
+def _spool(op: str, payload: dict, reason: str = "") -> bool:
+    """Append a write to the durable spool. Returns False if even that fails."""
+    from utils import write_spool
+    try:
+        write_spool.enqueue(op, payload)
+    except Exception as e:
+        print(f"❌ Write-behind spool failed, write lost: {e}")
+        return False
+    print(f"📦 Write queued in spool{reason}.")
+    return True
+
+
+def _write_or_spool(op: str, payload: dict, success_msg: str = "") -> bool:
+    """Write now, or spool. Returns False if the write was lost."""
+    if WRITE_BEHIND:
+        return _spool(op, payload)
+    try:
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+            SPOOL_OPS[op](cur, payload)
+            conn.commit()
+            cur.close()
+        if success_msg:
+            print(success_msg)
+        return True
+    except _TRANSIENT_ERRORS as e:
+        return _spool(op, payload, reason=f" (DB unavailable: {e})")
+    except Exception as e:
+        print(f"❌ DB write failed: {e}")
+        return False
 
 
 # ──────────────────────────────────────────────
@@ -494,19 +1676,274 @@ def save_transcript(data: dict):
     Called from webhook_server.py.
     data keys: name, email, role, duration, transcript,
                interview_score, sentiment_score, status
+
+    Candidate upsert and interview row go through one CandidateSession,
+    so during an outage both are spooled instead of the transcript being
+    dropped for lack of a candidate id.
     """
-    # Ensure candidate exists
-    candidate_id = upsert_candidate(
-        name=data.get("name"),
-        email=data.get("email"),
-    )
-    if candidate_id:
-        save_interview_session(
-            candidate_id=candidate_id,
+    with CandidateSession(name=data.get("name"), email=data.get("email")) as session:
+        session.add_interview_session(
             call_id="webhook",
             phone_number="",
             questions="",
             transcript=data.get("transcript"),
             call_status=data.get("status", "completed"),
             duration_seconds=data.get("duration"),
-        )
\ No newline at end of file
+        )
+
+
+# ──────────────────────────────────────────────
+# Bulk import / export  (COPY)
+# Rows are streamed with COPY FROM STDIN into a temporary staging table,
+# then merged in the same transaction:
+#   candidates     → upsert ON CONFLICT (email), keeping the last row
+#                    per email; NULL fields don't overwrite stored ones
+#   result tables  → insert, linked to candidates by email
+# ──────────────────────────────────────────────
+
+_CANDIDATE_COLUMNS = ("name", "email", "phone", "resume_text",
+                      "linkedin_url", "github_username")
+
+_BULK_COLUMNS = {
+    "candidates": _CANDIDATE_COLUMNS + ("created_at",),
+    **{table: ("email",) + columns + (_RESULT_TIMESTAMPS[table],)
+       for table, columns in _RESULT_COLUMNS.items()},
+}
+
+
+def _copy_text(value) -> str:
+    """Render one value in COPY text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (list, tuple)):
+        value = "{" + ",".join(
+            "NULL" if v is None else
+            '"' + str(v).replace("\\", "\\\\").replace('"', '\\"') + '"'
+            for v in value) + "}"
+    elif isinstance(value, datetime):
+        value = value.isoformat()
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+class _CopyStream:
+    """Read-only file object that renders dict rows to COPY text lazily."""
+
+    def __init__(self, rows: Iterable[dict], columns: tuple):
+        self._rows = iter(rows)
+        self._columns = columns
+        self._buf = bytearray()
+        self.count = 0
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buf) < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            line = "\t".join(_copy_text(row.get(c)) for c in self._columns) + "\n"
+            self._buf += line.encode("utf-8")
+            self.count += 1
+        if size < 0:
+            size = len(self._buf)
+        chunk = bytes(self._buf[:size])
+        del self._buf[:size]
+        return chunk
+
+
+def bulk_import(table: str, rows: Iterable[dict]) -> dict:
+    """
+    Stream `rows` (dicts keyed by column name, see _BULK_COLUMNS) into
+    `table` in one transaction. Result rows carry the candidate's email
+    instead of candidate_id; rows whose email is unknown are skipped.
+
+    Returns {"staged", "merged", "skipped", "seconds", "rows_per_sec"}.
+    """
+    if table not in _BULK_COLUMNS:
+        raise ValueError(f"Unknown table for bulk import: {table}")
+    columns = _BULK_COLUMNS[table]
+    column_list = ", ".join(columns)
+
+    pre_merge_sql = None
+    if table == "candidates":
+        # resume_text goes to resume_blobs; candidates get its hash.
+        stored = tuple("resume_hash" if c == "resume_text" else c for c in _CANDIDATE_COLUMNS)
+        selected = ", ".join(_SQL_SHA256.format("resume_text") if c == "resume_text" else c
+                             for c in _CANDIDATE_COLUMNS)
+        updates = ",\n            ".join(
+            f"{c} = COALESCE(EXCLUDED.{c}, candidates.{c})"
+            for c in stored if c != "email")
+        pre_merge_sql = f"""
+        INSERT INTO resume_blobs (text_hash, content)
+        SELECT DISTINCT ON (1) {_SQL_SHA256.format("resume_text")}, resume_text
+        FROM _bulk_stage
+        WHERE resume_text IS NOT NULL
+        ON CONFLICT (text_hash) DO NOTHING;
+        """
+        merge_sql = f"""
+        INSERT INTO candidates ({", ".join(stored)}, created_at)
+        SELECT DISTINCT ON (email)
+            {selected}, COALESCE(created_at, NOW())
+        FROM _bulk_stage
+        WHERE email IS NOT NULL
+        ORDER BY email, _seq DESC
+        ON CONFLICT (email) DO UPDATE SET
+            {updates};
+        """
+    else:
+        result_columns = columns[1:]
+        timestamp = _RESULT_TIMESTAMPS[table]
+        select_list = ", ".join(
+            f"COALESCE(s.{c}, NOW())" if c == timestamp else f"s.{c}"
+            for c in result_columns)
+        merge_sql = f"""
+        INSERT INTO {table} (candidate_id, {", ".join(result_columns)})
+        SELECT c.id, {select_list}
+        FROM _bulk_stage s
+        JOIN candidates c ON c.email = s.email
+        ORDER BY s._seq;
+        """
+
+    source = "candidates" if table == "candidates" else f"{table} r, candidates"
+    stage_select = column_list if table == "candidates" else ", ".join(
+        "candidates.email" if c == "email" else f"r.{c}" for c in columns)
+
+    stream = _CopyStream(rows, columns)
+    start = time.perf_counter()
+    with pooled_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(f"""
+        CREATE TEMP TABLE _bulk_stage ON COMMIT DROP AS
+            SELECT {stage_select} FROM {source} WITH NO DATA;
+        ALTER TABLE _bulk_stage ADD COLUMN _seq BIGSERIAL;
+        """)
+        cur.copy_expert(f"COPY _bulk_stage ({column_list}) FROM STDIN", stream)
+        if pre_merge_sql:
+            cur.execute(pre_merge_sql)
+        cur.execute(merge_sql)
+        merged = cur.rowcount
+        conn.commit()
+        cur.close()
+    seconds = time.perf_counter() - start
+
+    stats = {
+        "staged": stream.count,
+        "merged": merged,
+        "skipped": stream.count - merged,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(stream.count / seconds, 1) if seconds else 0.0,
+    }
+    print(f"📥 {table}: {stats['merged']}/{stats['staged']} rows merged "
+          f"in {stats['seconds']}s ({stats['rows_per_sec']} rows/s)")
+    return stats
+
+
+def bulk_export(table: str, out) -> dict:
+    """
+    COPY `table` TO STDOUT as CSV with a header into the file object `out`.
+    Result tables are exported with the candidate's email instead of
+    candidate_id, so the file can be fed straight back into bulk_import().
+    """
+    if table not in _BULK_COLUMNS:
+        raise ValueError(f"Unknown table for bulk export: {table}")
+    columns = _BULK_COLUMNS[table]
+    if table == "candidates":
+        select_list = ", ".join(
+            "COALESCE(rb.content, c.resume_text) AS resume_text" if col == "resume_text"
+            else f"c.{col}" for col in columns)
+        query = (f"SELECT {select_list} FROM candidates c "
+                 f"LEFT JOIN resume_blobs rb ON rb.text_hash = c.resume_hash ORDER BY c.id")
+    else:
+        select_list = ", ".join("c.email" if col == "email" else f"r.{col}" for col in columns)
+        query = (f"SELECT {select_list} FROM {table} r "
+                 f"JOIN candidates c ON c.id = r.candidate_id ORDER BY r.id")
+
+    start = time.perf_counter()
+    with pooled_connection() as conn:
+        cur = conn.cursor()
+        cur.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)", out)
+        exported = cur.rowcount
+        cur.close()
+    seconds = time.perf_counter() - start
+
+    stats = {
+        "exported": exported,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(exported / seconds, 1) if seconds else 0.0,
+    }
+    print(f"📤 {table}: {exported} rows exported in {stats['seconds']}s "
+          f"({stats['rows_per_sec']} rows/s)", file=sys.stderr)
+    return stats
+
+
+def _read_rows(path: str):
+    """Yield dicts from a .jsonl file or a CSV file (empty cells → NULL)."""
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    csv.field_size_limit(sys.maxsize)
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield {k: (v if v != "" else None) for k, v in row.items()}
+
+
+def _main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.db",
+        description="Bulk COPY import/export for AgentForge tables.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="import a CSV or JSONL file")
+    imp.add_argument("table", choices=sorted(_BULK_COLUMNS))
+    imp.add_argument("path")
+    exp = sub.add_parser("export", help="export a table as CSV ('-' for stdout)")
+    exp.add_argument("table", choices=sorted(_BULK_COLUMNS))
+    exp.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        bulk_import(args.table, _read_rows(args.path))
+    elif args.path == "-":
+        bulk_export(args.table, sys.stdout)
+    else:
+        with open(args.path, "w", newline="", encoding="utf-8") as out:
+            bulk_export(args.table, out)
+
+
+# ──────────────────────────────────────────────
+# Backend selection
+# DB_BACKEND=sqlite swaps the public API for the embedded SQLite store
+# (utils/sqlite_store.py); callers keep importing from utils.db.
+# Pool, breaker and COPY helpers stay Postgres-only.
+# ──────────────────────────────────────────────
+
+BACKEND = os.getenv("DB_BACKEND", "postgres").strip().lower()
+
+if BACKEND == "sqlite":
+    WRITE_BEHIND = False
+    from utils.sqlite_store import (  # noqa: E402,F811
+        CandidateSession,
+        get_all_candidates,
+        get_candidate_by_email,
+        get_candidates_page,
+        get_pipeline_stats,
+        get_resume_by_file_hash,
+        init_tables,
+        iter_candidates,
+        save_background_check,
+        save_evaluation_result,
+        save_interview_session,
+        save_screening_result,
+        save_transcript,
+        store_candidate_result,
+        store_resume,
+        test_connection,
+        upsert_candidate,
+    )
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,349 @@
+"""
+utils/dedupe_index.py
+---------------------
+Near-duplicate resume detection (MinHash + LSH).
+
+Agencies and mass-applicants send the same resume under different names
+and emails, and each copy costs a screening LLM call, a GitHub lookup and
+sometimes a Vapi call. The pipeline checks every new resume against this
+index right after extraction and stops at a near-duplicate.
+
+  - Shingles: word 5-grams of the lower-cased resume, minus the contact
+    header (see resume_parser.sectionize), so a new name or email does not
+    hide a copy. Texts with fewer than MIN_SHINGLES (an empty parse, a
+    scanned PDF) are neither checked nor indexed: they would all look
+    alike.
+  - Signature: one-permutation MinHash with rotation densification
+    (NUM_PERM bins). Each shingle is hashed once, so a signature costs
+    about a millisecond in pure Python with no numpy dependency.
+  - LSH: the signature is cut into bands. The band layout is chosen from
+    DEDUPE_THRESHOLD, and only entries sharing a band are compared.
+    A lookup is a few dict probes.
+
+The index lives in memory and is persisted to an append-only file
+(data/dedupe_index.bin): each add() appends one record under an exclusive
+flock. Every query first reads records appended by other processes, so
+concurrent workers share one index.
+
+Settings (.env):
+  DEDUPE            0 to disable the check (default 1)
+  DEDUPE_INDEX      path of the index file (default data/dedupe_index.bin)
+  DEDUPE_THRESHOLD  estimated Jaccard similarity that counts as a duplicate (default 0.8)
+
+Bootstrap from the candidates already stored, or check a file by hand:
+    python -m utils.dedupe_index rebuild
+    python -m utils.dedupe_index query resumes/resume.pdf
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import struct
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:          # no flock on this platform: appends are unlocked
+    fcntl = None
+
+from utils.resume_parser import sectionize
+
+DEDUPE_ENABLED = os.getenv("DEDUPE", "1").strip().lower() not in ("0", "false", "no")
+INDEX_PATH = os.getenv("DEDUPE_INDEX",
+                       str(Path(__file__).resolve().parents[1] / "data" / "dedupe_index.bin"))
+DEDUPE_THRESHOLD = float(os.getenv("DEDUPE_THRESHOLD", 0.8))
+
+NUM_PERM = 128
+SHINGLE_WORDS = 5
+MIN_SHINGLES = 20
+
+_MAGIC = b"MHIX"
+_HEADER = struct.Struct("<4sH")         # magic, num_perm
+_KEY_LEN = struct.Struct("<H")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+# ─── Signatures ──────────────────────────────────────────────────────
+
+def _shingles(resume_text: str) -> set:
+    spans = sectionize(resume_text).get("contact")
+    if spans and spans[0][0] == 0 and resume_text[spans[0][1]:].strip():
+        resume_text = resume_text[spans[0][1]:]
+    words = _WORD_RE.findall(resume_text.lower())
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def signature(resume_text: str, num_perm: int = NUM_PERM) -> Optional[array]:
+    """
+    MinHash signature of a resume: `num_perm` unsigned 64-bit values, or
+    None if the text has fewer than MIN_SHINGLES shingles.
+    """
+    shingles = _shingles(resume_text)
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    empty = 1 << 64
+    bins = [empty] * num_perm
+    value_bits = 64 - (num_perm - 1).bit_length()
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "little")
+        b, v = h % num_perm, h >> (64 - value_bits)
+        if v < bins[b]:
+            bins[b] = v
+
+    # Densify: an empty bin takes the next non-empty bin's value, offset by
+    # the distance so the borrowed value never collides with a real one.
+    if any(v == empty for v in bins):
+        filled = bins[:]
+        for i in range(num_perm):
+            if bins[i] == empty:
+                j, dist = (i + 1) % num_perm, 1
+                while bins[j] == empty:
+                    j, dist = (j + 1) % num_perm, dist + 1
+                filled[i] = bins[j] + (dist << value_bits)
+        bins = filled
+    return array("Q", bins)
+
+
+def similarity(sig_a, sig_b) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+
+def _bands_for(threshold: float, num_perm: int) -> int:
+    """
+    Number of LSH bands for `threshold`: the layout whose S-curve midpoint
+    (1/b)^(1/r) is the highest one still at or below the threshold, so
+    near-duplicates are rarely missed. Candidates are then verified exactly.
+    """
+    best = num_perm
+    for bands in range(1, num_perm + 1):
+        if num_perm % bands:
+            continue
+        rows = num_perm // bands
+        midpoint = (1 / bands) ** (1 / rows)
+        if midpoint <= threshold:
+            best = bands
+            break
+    return best
+
+
+# ─── Index ───────────────────────────────────────────────────────────
+
+class DedupeIndex:
+    """In-memory LSH index of resume signatures, persisted to an append-only file."""
+
+    def __init__(self, path: str = INDEX_PATH, threshold: float = DEDUPE_THRESHOLD,
+                 num_perm: int = NUM_PERM):
+        self.path = path
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = _bands_for(threshold, num_perm)
+        self.rows = num_perm // self.bands
+        self._keys = []
+        self._sigs = []
+        self._key_sigs = {}             # key -> signatures indexed under it (as bytes)
+        self._buckets = [{} for _ in range(self.bands)]
+        self._offset = 0                # bytes of the file already loaded
+        self._lock = threading.Lock()
+        if path:
+            self.refresh()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _band_keys(self, sig):
+        r = self.rows
+        return [tuple(sig[i * r:(i + 1) * r]) for i in range(self.bands)]
+
+    def _insert(self, key: str, sig):
+        idx = len(self._keys)
+        self._keys.append(key)
+        self._sigs.append(sig)
+        self._key_sigs.setdefault(key, set()).add(sig.tobytes())
+        for bucket, band in zip(self._buckets, self._band_keys(sig)):
+            bucket.setdefault(band, []).append(idx)
+
+    # ── Persistence ──────────────────────────────
+
+    def _decode(self, data: bytes, pos: int) -> int:
+        """Insert every complete record in data[pos:]; return the end of the last one."""
+        sig_bytes = self.num_perm * 8
+        while pos + _KEY_LEN.size <= len(data):
+            (key_len,) = _KEY_LEN.unpack_from(data, pos)
+            end = pos + _KEY_LEN.size + key_len + sig_bytes
+            if end > len(data):
+                break                   # torn tail (crash mid-append): ignore
+            key = data[pos + _KEY_LEN.size:pos + _KEY_LEN.size + key_len].decode("utf-8")
+            sig = array("Q")
+            sig.frombytes(data[end - sig_bytes:end])
+            self._insert(key, sig)
+            pos = end
+        return pos
+
+    def _load(self, f) -> bool:
+        """
+        Insert records from f past the loaded offset (caller holds _lock).
+        Returns True if the file ends in a torn record.
+        """
+        f.seek(self._offset)
+        data = f.read()
+        pos = 0
+        if self._offset == 0 and data:
+            if len(data) < _HEADER.size:
+                return True
+            magic, num_perm = _HEADER.unpack_from(data)
+            if magic != _MAGIC or num_perm != self.num_perm:
+                raise ValueError(f"{self.path} is not a {self.num_perm}-bin dedupe index")
+            pos = _HEADER.size
+        end = self._decode(data, pos)
+        self._offset += end
+        return end < len(data)
+
+    def refresh(self):
+        """Load records appended (by any process) since the last refresh."""
+        with self._lock:
+            try:
+                with open(self.path, "rb") as f:
+                    self._load(f)
+            except FileNotFoundError:
+                pass
+
+    def _append(self, record: bytes):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock, open(self.path, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            # Under the lock every other append is complete, so a torn
+            # tail is left over from a crash: cut it before appending.
+            if self._load(f):
+                f.truncate(self._offset)
+            if self._offset == 0:
+                f.write(_HEADER.pack(_MAGIC, self.num_perm))
+            f.write(record)
+            f.flush()
+            self._load(f)               # our record (and any others) in file order
+
+    # ── Public API ───────────────────────────────
+
+    def query(self, resume_text: str = None, sig=None, threshold: float = None,
+              exclude_key: str = None) -> list:
+        """
+        Indexed resumes similar to `resume_text` (or a precomputed `sig`),
+        as [(key, similarity)] best first, at or above `threshold`
+        (default: the index threshold). Entries under `exclude_key` are skipped.
+        Too short a text matches nothing.
+        """
+        sig = sig if sig is not None else signature(resume_text, self.num_perm)
+        if sig is None:
+            return []
+        if self.path:
+            self.refresh()
+        threshold = self.threshold if threshold is None else threshold
+        with self._lock:
+            candidates = set()
+            for bucket, band in zip(self._buckets, self._band_keys(sig)):
+                candidates.update(bucket.get(band, ()))
+            best = {}
+            for idx in candidates:
+                key = self._keys[idx]
+                if key == exclude_key:
+                    continue
+                score = similarity(sig, self._sigs[idx])
+                if score >= threshold and score > best.get(key, -1.0):
+                    best[key] = score
+        return sorted(best.items(), key=lambda kv: kv[1], reverse=True)
+
+    def add(self, key: str, resume_text: str = None, sig=None):
+        """
+        Index a resume under `key` (e.g. the candidate email) and persist it.
+        Returns the signature, or None if the text is too short to index.
+        Re-adding a signature already indexed under `key` is a no-op.
+        """
+        sig = sig if sig is not None else signature(resume_text, self.num_perm)
+        if sig is None:
+            return None
+        if self.path:
+            self.refresh()
+        with self._lock:
+            if sig.tobytes() in self._key_sigs.get(key, ()):
+                return sig
+        encoded = key.encode("utf-8")
+        if self.path:
+            self._append(_KEY_LEN.pack(len(encoded)) + encoded + sig.tobytes())
+        else:
+            with self._lock:
+                self._insert(key, sig)
+        return sig
+
+    def check_and_add(self, key: str, resume_text: str) -> list:
+        """query() for duplicates under other keys, then add(); returns the matches."""
+        sig = signature(resume_text, self.num_perm)
+        if sig is None:
+            return []
+        matches = self.query(sig=sig, exclude_key=key)
+        self.add(key, sig=sig)
+        return matches
+
+
+_index = None
+
+
+def get_index() -> Optional[DedupeIndex]:
+    """The process-wide index at DEDUPE_INDEX, or None if DEDUPE=0."""
+    global _index
+    if not DEDUPE_ENABLED:
+        return None
+    if _index is None:
+        _index = DedupeIndex()
+    return _index
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────
+
+def _rebuild(path: str):
+    from utils.db import get_candidate_by_email, iter_candidates
+
+    if os.path.exists(path):
+        os.remove(path)
+    index = DedupeIndex(path)
+    count = 0
+    for row in iter_candidates():
+        candidate = get_candidate_by_email(row["email"]) if row.get("email") else None
+        if candidate and candidate.get("resume_text"):
+            if index.add(row["email"], candidate["resume_text"]) is not None:
+                count += 1
+    print(f"✅ Indexed {count} resumes into {path} "
+          f"({index.bands} bands x {index.rows} rows, threshold {index.threshold:g})")
+
+
+def _main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.dedupe_index",
+                                     description="Near-duplicate resume index.")
+    parser.add_argument("--index", default=INDEX_PATH, help="index file")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="re-index every stored candidate's resume")
+    query = sub.add_parser("query", help="list indexed near-duplicates of a resume file")
+    query.add_argument("resume")
+    query.add_argument("--threshold", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild":
+        _rebuild(args.index)
+        return
+    from utils.resume_parser import extract_resume_text
+    matches = DedupeIndex(args.index).query(extract_resume_text(args.resume),
+                                            threshold=args.threshold)
+    if not matches:
+        print("✅ No near-duplicates found.")
+    for key, score in matches:
+        print(f"⚠️  {key}  similarity={score:.2f}")
+    sys.exit(1 if matches else 0)
+
+
+if __name__ == "__main__":
+    _main()
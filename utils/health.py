@@ -0,0 +1,91 @@
+"""
+utils/health.py
+---------------
+Cached database health for the server's /health endpoints.
+
+A background task pings the database (SELECT 1 on a pooled connection,
+see utils.async_db.ping) every DB_HEALTH_TTL seconds and keeps the last
+result in memory. Endpoints only read that snapshot, so load-balancer
+probes never wait on the database or open connections of their own.
+
+Settings (.env):
+  DB_HEALTH_TTL      seconds between background checks (default 5)
+  DB_HEALTH_TIMEOUT  seconds before a single check counts as failed (default 2)
+"""
+
+import asyncio
+import os
+import time
+
+from utils import async_db
+
+HEALTH_TTL = float(os.getenv("DB_HEALTH_TTL", 5))
+HEALTH_TIMEOUT = float(os.getenv("DB_HEALTH_TIMEOUT", 2))
+
+
+class HealthMonitor:
+    """Refreshes a cached DB health snapshot in the background."""
+
+    def __init__(self, ttl: float = HEALTH_TTL, timeout: float = HEALTH_TIMEOUT):
+        self.ttl = ttl
+        self.timeout = timeout
+        self._ok = False
+        self._error = "not checked yet"
+        self._latency_ms = None
+        self._checked_at = None          # time.monotonic() of the last check
+        self._task = None
+
+    async def refresh(self) -> bool:
+        """Run one check now and update the snapshot."""
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(async_db.ping(), self.timeout)
+            ok, error = True, None
+        except asyncio.TimeoutError:
+            ok, error = False, f"timed out after {self.timeout:g}s"
+        except Exception as e:
+            ok, error = False, str(e) or type(e).__name__
+        if ok != self._ok and self._checked_at is not None:
+            print(f"{'✅' if ok else '❌'} DB health changed: {'connected' if ok else error}")
+        self._ok, self._error = ok, error
+        self._latency_ms = round((time.monotonic() - start) * 1000, 2)
+        self._checked_at = time.monotonic()
+        return ok
+
+    async def _run(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.ttl)
+
+    def start(self):
+        """Start the background refresh loop (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        """
+        Last known state. `ready` also requires the snapshot to be fresh:
+        if the refresh loop has stalled for two TTLs, the result is stale.
+        """
+        age = None if self._checked_at is None else time.monotonic() - self._checked_at
+        stale = age is None or age > 2 * self.ttl + self.timeout
+        return {
+            "ready": self._ok and not stale,
+            "database": "connected" if self._ok else "error",
+            "error": self._error,
+            "latency_ms": self._latency_ms,
+            "age_s": None if age is None else round(age, 2),
+            "stale": stale,
+        }
+
+
+monitor = HealthMonitor()
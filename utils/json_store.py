@@ -2,15 +2,38 @@
 utils/json_store.py
 -------------------
 Previously stored candidates in a local JSON file.
-Now forwards all writes to Supabase via utils/db.py.
+Now forwards all writes to Supabase via utils/db.py, which queues them in
+its durable write-behind spool (utils/write_spool.py) when Supabase is
+unreachable.
 
-The local JSON file is kept as a fallback/audit log only.
+The local file is used when a result can be neither written nor spooled
+(or utils.db can't be imported), and replayed into Postgres later with
+utils/replay_fallback.py. It is an append-only JSONL log (data/applied_candidates.jsonl): each write appends
+one line under an exclusive flock, so the cost doesn't grow with history
+and concurrent pipelines can't corrupt it.
+
+Optional rotation (.env):
+  JSON_STORE_ROTATE_MB  rotate the log once it exceeds this size (default 0 = never)
+  JSON_STORE_GZIP       gzip rotated segments (default 1)
+
+Read everything back with iter_candidate_records(). Convert the old
+JSON-array file once with:
+    python -m utils.json_store convert
 """
 
+import glob
+import gzip
 import json
 import os
+import shutil
+import sys
 from datetime import datetime
-from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:          # no flock on this platform: appends are unlocked
+    fcntl = None
 
 # ── Supabase primary store ──────────────────────
 try:
@@ -19,46 +42,143 @@ try:
 except ImportError:
     _DB_AVAILABLE = False
 
-# ── Local JSON fallback ─────────────────────────
-_DATA_FILE = "data/applied_candidates.json"
+# ── Local JSONL fallback ────────────────────────
+_DATA_FILE = "data/applied_candidates.jsonl"
+_LEGACY_FILE = "data/applied_candidates.json"       # pre-JSONL array format
+
+_ROTATE_BYTES = int(float(os.getenv("JSON_STORE_ROTATE_MB", 0)) * 1024 * 1024)
+_GZIP_ROTATED = os.getenv("JSON_STORE_GZIP", "1").strip().lower() in ("1", "true", "yes")
 
 
 def store_candidate_json(candidate_data: dict):
     """
     Save candidate result.
-    Primary:  Supabase (via utils.db)
-    Fallback: local JSON file  (data/applied_candidates.json)
+    Primary:  Supabase (via utils.db, write-behind spool on outage)
+    Fallback: local JSONL log  (data/applied_candidates.jsonl), if the
+              write failed and couldn't be spooled either
     """
     # Attach a timestamp so both stores have it
     candidate_data.setdefault("timestamp",
                               datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
 
-    # ── 1. Write to Supabase ───────────────────
+    # ── 1. Write to Supabase (spooled if it's down) ──
     if _DB_AVAILABLE:
         try:
-            store_candidate_result(candidate_data)
+            if store_candidate_result(candidate_data):
+                return
+            print("⚠️  Supabase write lost, falling back to JSONL")
         except Exception as e:
-            print(f"⚠️  Supabase write failed, falling back to JSON: {e}")
-            _write_json(candidate_data)
-    else:
-        _write_json(candidate_data)
+            print(f"⚠️  Supabase write failed, falling back to JSONL: {e}")
+
+    # ── 2. Local fallback ──
+    _write_json(candidate_data)
 
 
 def _write_json(candidate_data: dict):
-    """Append candidate_data to the local JSON file."""
-    os.makedirs("data", exist_ok=True)
+    """Append candidate_data to the local JSONL log."""
+    append_records([candidate_data])
+    print("📁 Candidate stored in local JSONL (fallback)")
 
-    existing = []
-    if os.path.exists(_DATA_FILE):
+
+# ──────────────────────────────────────────────
+# Append-only log
+# ──────────────────────────────────────────────
+
+def _open_locked(path: str):
+    """
+    Open `path` for appending with an exclusive lock. If another writer
+    rotated the file while we waited for the lock, reopen the new one.
+    """
+    while True:
+        f = open(path, "ab")
+        if fcntl is None:
+            return f
+        fcntl.flock(f, fcntl.LOCK_EX)
         try:
-            with open(_DATA_FILE, "r") as f:
-                existing = json.load(f)
-        except json.JSONDecodeError:
-            existing = []
+            if os.fstat(f.fileno()).st_ino == os.stat(path).st_ino:
+                return f
+        except FileNotFoundError:
+            pass
+        f.close()
+
+
+def append_records(records: list, path: str = _DATA_FILE):
+    """Append `records` (dicts) as JSON lines in one locked write."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    data = b"".join(json.dumps(r, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+                    for r in records)
+    with _open_locked(path) as f:
+        f.write(data)
+        f.flush()
+        if _ROTATE_BYTES and f.tell() >= _ROTATE_BYTES:
+            _rotate(path)
+
 
-    existing.append(candidate_data)
+def _rotate(path: str):
+    """Move the full log aside (gzipped if enabled). Caller holds the lock."""
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    rotated = path[:-len(".jsonl")] + f".{stamp}.jsonl"
+    os.replace(path, rotated)
+    if _GZIP_ROTATED:
+        with open(rotated, "rb") as src, gzip.open(rotated + ".gz", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(rotated)
 
-    with open(_DATA_FILE, "w") as f:
-        json.dump(existing, f, indent=4)
 
-    print("📁 Candidate stored in local JSON (fallback)")
+def log_files(path: str = _DATA_FILE, include_rotated: bool = True) -> list[str]:
+    """The log's files, oldest first: rotated segments, then the live log."""
+    files = sorted(glob.glob(path[:-len(".jsonl")] + ".*.jsonl*")) if include_rotated else []
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def open_log_file(name: str):
+    """Open one log file (plain or gzipped segment) for binary reading."""
+    return gzip.open(name, "rb") if name.endswith(".gz") else open(name, "rb")
+
+
+def iter_candidate_records(path: str = _DATA_FILE, include_rotated: bool = True) -> Iterator[dict]:
+    """
+    Stream records oldest first: rotated segments, then the live log.
+    Blank or torn lines (a crash mid-append) are skipped.
+    """
+    for name in log_files(path, include_rotated):
+        with open_log_file(name) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def convert_legacy_json(src: str = _LEGACY_FILE, dst: str = _DATA_FILE) -> int:
+    """
+    One-shot: append the records of the old JSON-array file to the JSONL
+    log and rename it to <src>.migrated. Returns the number converted.
+    """
+    if not os.path.exists(src):
+        print(f"ℹ️  Nothing to convert ({src} not found)")
+        return 0
+    with open(src, "r", encoding="utf-8") as f:
+        try:
+            records = json.load(f)
+        except json.JSONDecodeError as e:
+            print(f"❌ {src} is not valid JSON: {e}")
+            return 0
+    if not isinstance(records, list):
+        records = [records]
+    append_records(records, dst)
+    os.replace(src, src + ".migrated")
+    print(f"📁 Converted {len(records)} record(s) from {src} to {dst}")
+    return len(records)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["convert"]:
+        convert_legacy_json()
+    else:
+        print("Usage: python -m utils.json_store convert")
+        sys.exit(2)
@@ -0,0 +1,146 @@
+"""
+utils/llm.py
+------------
+Single gateway for every agent's LLM call (OpenRouter, OpenAI-compatible API).
+
+Agents call chat("screening", prompt) instead of each building its own
+OpenAI client at import time. That gives:
+
+  - One lazily built client, shared by all agents, over a pooled
+    keep-alive HTTP transport. The TLS connection opened for screening is
+    reused for verification, question generation and evaluation. Neither
+    the openai package nor the client is loaded until the first call.
+  - Per-agent model / temperature / timeout / max_tokens / cache TTL in
+    AGENTS. Each can be overridden from .env as LLM_<AGENT>_<SETTING>,
+    e.g. LLM_SCREENING_MODEL or LLM_EVALUATION_CACHE_TTL.
+  - Replies of agents with a cache TTL are cached (utils.llm_cache), so a
+    repeated prompt is answered without an API call.
+
+Settings (.env):
+  OPENROUTER_API_KEY   API key
+  LLM_BASE_URL         default https://openrouter.ai/api/v1
+  LLM_MODEL            default model for every agent (meta-llama/llama-3-8b-instruct)
+  LLM_TIMEOUT          default request timeout in seconds (60)
+  LLM_MAX_RETRIES      client retries on connection errors / 429 / 5xx (2)
+  LLM_MAX_CONNECTIONS  pooled HTTP connections (20)
+  LLM_KEEPALIVE        seconds an idle connection is kept open (30)
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv(dotenv_path=Path(__file__).resolve().parents[1] / ".env")
+
+from utils.llm_cache import get_cache  # noqa: E402  (reads .env settings)
+
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://openrouter.ai/api/v1")
+LLM_MODEL = os.getenv("LLM_MODEL", "meta-llama/llama-3-8b-instruct")
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 60))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 2))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", 20))
+LLM_KEEPALIVE = float(os.getenv("LLM_KEEPALIVE", 30))
+
+
+class AgentConfig(NamedTuple):
+    model: str
+    temperature: float
+    timeout: float
+    max_tokens: Optional[int]          # None = provider default
+    cache_ttl: float                   # seconds a reply is reused; 0 = never cached
+
+
+_DAY = 24 * 3600
+
+
+def _agent(name: str, temperature: float, max_tokens: Optional[int] = None,
+           cache_ttl: float = 0) -> AgentConfig:
+    prefix = f"LLM_{name.upper()}_"
+    tokens = os.getenv(prefix + "MAX_TOKENS")
+    return AgentConfig(
+        model=os.getenv(prefix + "MODEL", LLM_MODEL),
+        temperature=float(os.getenv(prefix + "TEMPERATURE", temperature)),
+        timeout=float(os.getenv(prefix + "TIMEOUT", LLM_TIMEOUT)),
+        max_tokens=int(tokens) if tokens else max_tokens,
+        cache_ttl=float(os.getenv(prefix + "CACHE_TTL", cache_ttl)),
+    )
+
+
+# Temperatures are the ones each agent hardcoded before, and max_tokens
+# is left to the provider default as it was; cap an agent with
+# LLM_<AGENT>_MAX_TOKENS. Near-deterministic judgements are cached;
+# question and curveball generation should vary between calls.
+AGENTS = {
+    "screening":    _agent("screening", 0.2, cache_ttl=7 * _DAY),
+    "verification": _agent("verification", 0.1, cache_ttl=7 * _DAY),
+    "questions":    _agent("questions", 0.4),
+    "curveball":    _agent("curveball", 0.5),
+    "evaluation":   _agent("evaluation", 0.1, cache_ttl=7 * _DAY),
+}
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The shared OpenAI client, built on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import httpx
+                from openai import OpenAI
+
+                http_client = httpx.Client(
+                    limits=httpx.Limits(max_connections=LLM_MAX_CONNECTIONS,
+                                        max_keepalive_connections=LLM_MAX_CONNECTIONS,
+                                        keepalive_expiry=LLM_KEEPALIVE),
+                    timeout=httpx.Timeout(LLM_TIMEOUT, connect=10.0),
+                )
+                _client = OpenAI(base_url=LLM_BASE_URL,
+                                 api_key=os.getenv("OPENROUTER_API_KEY"),
+                                 max_retries=LLM_MAX_RETRIES,
+                                 http_client=http_client)
+    return _client
+
+
+def close_client():
+    """Close pooled connections (server shutdown)."""
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
+
+
+def chat(agent: str, prompt: str, **overrides) -> str:
+    """
+    Send `prompt` as a single user message with `agent`'s settings (see
+    AGENTS). Keyword arguments override them per call. Returns the reply
+    text, stripped; cached for the agent's cache_ttl. API errors propagate
+    to the caller and are never cached.
+    """
+    config = AGENTS[agent]._replace(**overrides)
+    cache = get_cache() if config.cache_ttl > 0 else None
+    if cache is not None:
+        key = cache.key(config.model, prompt, config.temperature, config.max_tokens)
+        cached = cache.get(key, config.cache_ttl)
+        if cached is not None:
+            return cached
+
+    params = {
+        "model": config.model,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": config.temperature,
+        "timeout": config.timeout,
+    }
+    if config.max_tokens:
+        params["max_tokens"] = config.max_tokens
+    response = get_client().chat.completions.create(**params)
+    text = response.choices[0].message.content.strip()
+    if cache is not None and text:
+        cache.put(key, text)
+    return text
@@ -0,0 +1,135 @@
+"""
+utils/llm_cache.py
+------------------
+Response cache for utils.llm.chat().
+
+Webhook retries, re-runs and re-applications send byte-identical prompts
+to OpenRouter again and again. For agents that opt in (a cache TTL in
+utils.llm.AGENTS), chat() answers those from here:
+
+  - key: SHA-256 over (model, hash of the normalised prompt, temperature,
+    max_tokens). Normalising strips trailing whitespace and line-ending
+    differences, which do not change the request's meaning.
+  - tier 1: in-process LRU dict (LLM_CACHE_MEM_ENTRIES). A hit costs
+    microseconds.
+  - tier 2: size-bounded on-disk LRU shared by all processes. This is a
+    utils.parse_cache.ParseCache in its own directory. Disk hits are
+    promoted to tier 1.
+  - TTL: each entry records when it was stored; a lookup with a TTL older
+    than that counts as expired and goes to the API.
+
+stats() returns hit/miss counters for the /llm-cache endpoint.
+
+Settings (.env):
+  LLM_CACHE              0 to disable (default 1)
+  LLM_CACHE_DIR          default data/llm_cache
+  LLM_CACHE_MB           disk tier size bound (default 64)
+  LLM_CACHE_MEM_ENTRIES  memory tier entries (default 1024)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from utils.parse_cache import ParseCache
+
+CACHE_ENABLED = os.getenv("LLM_CACHE", "1").strip().lower() not in ("0", "false", "no")
+CACHE_DIR = Path(os.getenv("LLM_CACHE_DIR",
+                           str(Path(__file__).resolve().parents[1] / "data" / "llm_cache")))
+CACHE_MAX_BYTES = int(float(os.getenv("LLM_CACHE_MB", 64)) * 1024 * 1024)
+CACHE_MEM_ENTRIES = int(os.getenv("LLM_CACHE_MEM_ENTRIES", 1024))
+
+
+def normalize_prompt(prompt: str) -> str:
+    return "\n".join(line.rstrip() for line in prompt.strip().splitlines())
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + disk LRU) cache of LLM replies with per-lookup TTLs."""
+
+    def __init__(self, directory: Optional[Path] = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES,
+                 mem_entries: int = CACHE_MEM_ENTRIES):
+        self.disk = ParseCache(directory, max_bytes) if directory else None
+        self.mem_entries = mem_entries
+        self._mem = OrderedDict()        # key -> (text, stored_at)
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(("memory_hits", "disk_hits", "misses", "expired", "stores"), 0)
+
+    @staticmethod
+    def key(model: str, prompt: str, temperature: float, max_tokens: Optional[int]) -> str:
+        prompt_hash = hashlib.sha256(normalize_prompt(prompt).encode("utf-8")).hexdigest()
+        return hashlib.sha256(
+            json.dumps([model, prompt_hash, temperature, max_tokens]).encode()).hexdigest()
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def _remember(self, key: str, text: str, stored_at: float):
+        with self._lock:
+            self._mem[key] = (text, stored_at)
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.mem_entries:
+                self._mem.popitem(last=False)
+
+    def get(self, key: str, ttl: float) -> Optional[str]:
+        """The cached reply if stored less than `ttl` seconds ago, else None."""
+        now = time.time()
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is not None:
+                self._mem.move_to_end(key)
+        if hit is not None and now - hit[1] < ttl:
+            self._count("memory_hits")
+            return hit[0]
+
+        entry = self.disk.get(key) if self.disk is not None else None
+        if entry is not None and now - entry["stored_at"] < ttl:
+            self._count("disk_hits")
+            self._remember(key, entry["text"], entry["stored_at"])
+            return entry["text"]
+
+        self._count("expired" if hit is not None or entry is not None else "misses")
+        return None
+
+    def put(self, key: str, text: str):
+        stored_at = time.time()
+        self._remember(key, text, stored_at)
+        self._count("stores")
+        if self.disk is not None:
+            try:
+                self.disk.put(key, {"text": text, "stored_at": stored_at})
+            except OSError as e:
+                print(f"⚠️  LLM cache write failed: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self._counts)
+            counts["memory_entries"] = len(self._mem)
+        lookups = counts["memory_hits"] + counts["disk_hits"] + counts["misses"] + counts["expired"]
+        counts["hit_rate"] = round((counts["memory_hits"] + counts["disk_hits"]) / lookups, 3) \
+            if lookups else 0.0
+        return counts
+
+
+_cache = None
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """The process-wide response cache, or None if LLM_CACHE=0."""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
+
+
+def stats() -> dict:
+    cache = get_cache()
+    return {"enabled": False} if cache is None else {"enabled": True, **cache.stats()}
@@ -0,0 +1,139 @@
+"""
+utils/parse_cache.py
+--------------------
+On-disk cache of parsed resumes, keyed by the SHA-256 of the file bytes.
+
+Re-applications, retries and the Streamlit app re-parsing the same upload
+all hit the same bytes, so extract_resume_text() checks here before
+running pypdf / the DOCX extractor. Each entry holds the extracted text and the
+fields extract_resume_data() found in it (zlib-compressed JSON).
+
+Keys also include the parser version string from utils/resume_parser.py,
+so bumping it (or changing the page/char limits) invalidates old entries.
+Those entries are never read again and age out of the LRU.
+
+Eviction is LRU by file mtime: hits touch the entry, and once the cache
+grows past RESUME_CACHE_MB the oldest entries are deleted until it is
+back under 90%.
+
+Settings (.env):
+  RESUME_CACHE      0 to disable (default 1)
+  RESUME_CACHE_DIR  default data/parse_cache
+  RESUME_CACHE_MB   size bound (default 256)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zlib
+from pathlib import Path
+from typing import Optional
+
+CACHE_ENABLED = os.getenv("RESUME_CACHE", "1").strip().lower() not in ("0", "false", "no")
+CACHE_DIR = Path(os.getenv("RESUME_CACHE_DIR",
+                           str(Path(__file__).resolve().parents[1] / "data" / "parse_cache")))
+CACHE_MAX_BYTES = int(float(os.getenv("RESUME_CACHE_MB", 256)) * 1024 * 1024)
+
+
+def file_hash(path: str) -> str:
+    """Hex SHA-256 of a file's bytes."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def buffer_hash(data) -> str:
+    """Hex SHA-256 of in-memory contents (bytes, memoryview or mmap); same value as file_hash()."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ParseCache:
+    """Size-bounded LRU of parse results in `directory` (safe across processes)."""
+
+    def __init__(self, directory: Path = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._size = None               # bytes on disk, computed on first put()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.z"
+
+    @staticmethod
+    def key(content_hash: str, version: str) -> str:
+        return hashlib.sha256(f"{version}:{content_hash}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = json.loads(zlib.decompress(f.read()))
+            os.utime(path)                      # LRU: mark as recently used
+        except (FileNotFoundError, ValueError, zlib.error):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: dict):
+        data = zlib.compress(json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        try:
+            replaced = path.stat().st_size     # an overwrite frees the old entry
+        except FileNotFoundError:
+            replaced = 0
+        os.replace(tmp, path)
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += len(data) - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        for sub in os.scandir(self.directory):
+            if sub.is_dir():
+                for entry in os.scandir(sub.path):
+                    if entry.name.endswith(".z"):
+                        st = entry.stat()
+                        yield st.st_mtime, st.st_size, entry.path
+
+    def _evict(self):
+        """Delete least recently used entries until under 90% of max_bytes."""
+        entries = sorted(self._entries())
+        size = sum(s for _, s, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+        self._size = size
+
+
+_cache = None
+
+
+def get_cache() -> Optional[ParseCache]:
+    """The process-wide cache, or None if RESUME_CACHE=0."""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = ParseCache()
+    return _cache
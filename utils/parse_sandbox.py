@@ -0,0 +1,207 @@
+"""
+utils/parse_sandbox.py
+----------------------
+Resume parsing in a pool of sandboxed worker processes.
+
+pypdf is pure Python: a malformed or adversarial PDF can spin a core or
+balloon memory for minutes. Parsed inline, that freezes the server's
+event loop for every request. Here each parse runs in a worker process
+that is:
+
+  - time-limited: SIGALRM interrupts the parse after PARSE_TIMEOUT seconds
+    and the job fails with ResumeParseError. If the worker is stuck in C
+    code and ignores the alarm, the parent gives up after a short grace
+    period, kills the workers and starts a fresh pool. Other parses that
+    were running on the killed pool are resubmitted to the new one.
+  - memory-capped: RLIMIT_AS of PARSE_MEMORY_MB, so a decompression bomb
+    fails with MemoryError inside the worker rather than swapping the host.
+  - page-limited: RESUME_MAX_PAGES / RESUME_MAX_CHARS from utils.resume_parser.
+  - recycled after PARSE_MAX_JOBS parses, so leaked memory or state from a
+    bad file does not accumulate.
+
+The parse cache (utils.parse_cache) is on disk, so cache hits in a worker
+are shared with every other process.
+
+Settings (.env):
+  PARSE_WORKERS    worker processes (default 2)
+  PARSE_TIMEOUT    seconds per resume (default 20)
+  PARSE_MEMORY_MB  address-space cap per worker (default 1024, 0 = none)
+  PARSE_MAX_JOBS   parses before a worker is replaced (default 50)
+"""
+
+import asyncio
+import mmap
+import multiprocessing
+import os
+import signal
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", 2))
+PARSE_TIMEOUT = float(os.getenv("PARSE_TIMEOUT", 20))
+PARSE_MEMORY_MB = int(os.getenv("PARSE_MEMORY_MB", 1024))
+PARSE_MAX_JOBS = int(os.getenv("PARSE_MAX_JOBS", 50))
+
+# Extra time the parent waits beyond PARSE_TIMEOUT before killing workers.
+_KILL_GRACE = 5.0
+
+
+class ResumeParseError(Exception):
+    """The resume could not be parsed (bad format, timeout or memory cap)."""
+
+
+class _ParseTimeout(BaseException):
+    # Not an Exception: pypdf recovers from damaged files with broad
+    # `except Exception` blocks, which would swallow the alarm.
+    pass
+
+
+# ─── Worker side ─────────────────────────────────────────────────────
+
+def _init_worker(memory_mb: int):
+    if memory_mb > 0:
+        import resource
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    signal.signal(signal.SIGINT, signal.SIG_IGN)     # the parent handles Ctrl-C
+
+
+def _on_alarm(signum, frame):
+    raise _ParseTimeout()
+
+
+def _parse_in_worker(source, timeout: float) -> str:
+    from utils.resume_parser import extract_resume_text
+
+    signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return extract_resume_text(source)
+    except _ParseTimeout:
+        raise ResumeParseError(f"Resume parsing timed out after {timeout:g}s") from None
+    except MemoryError:
+        raise ResumeParseError(
+            f"Resume parsing exceeded the {PARSE_MEMORY_MB} MB memory limit") from None
+    except (ValueError, FileNotFoundError) as e:
+        raise ResumeParseError(str(e)) from None
+    except Exception as e:
+        raise ResumeParseError(f"Resume could not be parsed ({type(e).__name__}: {e})") from None
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+# ─── Parent side ─────────────────────────────────────────────────────
+
+class ParserPool:
+    """Process pool that parses resumes under a timeout and memory cap."""
+
+    def __init__(self, workers: int = PARSE_WORKERS, timeout: float = PARSE_TIMEOUT,
+                 memory_mb: int = PARSE_MEMORY_MB, max_jobs: int = PARSE_MAX_JOBS):
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.max_jobs = max_jobs
+        self._executor = None
+        self._lock = threading.Lock()
+        self._killed = weakref.WeakSet()    # pools torn down because a parse got stuck
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: the server has threads and an event loop, which
+                # fork would copy half-initialised; also required for
+                # max_tasks_per_child.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.memory_mb,),
+                    max_tasks_per_child=self.max_jobs or None,
+                )
+            return self._executor
+
+    def _reset(self, executor: ProcessPoolExecutor):
+        """
+        Kill a stuck or broken pool's workers; the next parse starts a new
+        one. The executor does not say which worker runs which job, so
+        every worker goes: other parses in flight on it fail with
+        BrokenProcessPool and are resubmitted (see _collateral).
+        """
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+            self._killed.add(executor)
+        # No public API to stop a running task (terminate_workers() is 3.14+).
+        for process in list((executor._processes or {}).values()):
+            process.kill()
+        executor.shutdown(wait=False)
+
+    def _submit(self, source):
+        if isinstance(source, (memoryview, mmap.mmap)):
+            source = bytes(source)                  # neither pickles; the worker needs a copy
+        executor = self._get_executor()
+        return executor, executor.submit(_parse_in_worker, source, self.timeout)
+
+    def _collateral(self, executor, error) -> bool:
+        """True if the job died only because its pool was reset for another job."""
+        return isinstance(error, BrokenProcessPool) and executor in self._killed
+
+    def _failed(self, executor, error) -> Exception:
+        """
+        The exception to raise for a failed parse. Only a timeout or a
+        crashed worker resets the pool; anything else (a pickling error, a
+        pool shut down by close()) is returned unchanged.
+        """
+        if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+            self._reset(executor)
+            return ResumeParseError(f"Resume parsing timed out after {self.timeout:g}s")
+        if isinstance(error, BrokenProcessPool):
+            self._reset(executor)
+            return ResumeParseError("Resume parser worker crashed")
+        return error
+
+    def parse(self, source) -> str:
+        """Blocking parse of a path, bytes or buffer; raises ResumeParseError if it fails."""
+        while True:
+            executor, future = self._submit(source)
+            try:
+                return future.result(self.timeout + _KILL_GRACE)
+            except Exception as e:
+                if not self._collateral(executor, e):
+                    raise self._failed(executor, e) from None
+
+    async def parse_async(self, source) -> str:
+        """parse() without blocking the event loop."""
+        while True:
+            executor, future = self._submit(source)
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(future),
+                                              self.timeout + _KILL_GRACE)
+            except Exception as e:
+                if not self._collateral(executor, e):
+                    raise self._failed(executor, e) from None
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool = None
+
+
+def get_parser_pool() -> ParserPool:
+    global _pool
+    if _pool is None:
+        _pool = ParserPool()
+    return _pool
+
+
+def close_parser_pool():
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
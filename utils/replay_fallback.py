@@ -0,0 +1,246 @@
+"""
+utils/replay_fallback.py
+------------------------
+Drain the local fallback log (utils/json_store.py) into Postgres.
+
+    python -m utils.replay_fallback [--batch 500] [--dry-run]
+
+- Streams every log file (rotated segments, then the live log) without
+  loading them into memory.
+- Dedupes by content hash: each record's SHA-256 goes into
+  fallback_replayed in the same transaction as its insert, so records
+  that were already replayed are skipped.
+- Inserts in batched transactions, one per --batch records.
+- Checkpoints the byte offset reached in each file
+  (data/replay_checkpoint.json) after every committed batch, so an
+  interrupted run resumes where it stopped. Each offset is stored with a
+  hash of the file's first line: when the live log has been rotated and
+  a new one started under the same name, the hash differs and that file
+  is read from the start.
+- Records Postgres rejects (e.g. a stale candidate_id) go to
+  data/replay_rejected.jsonl and don't block the rest.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import psycopg2.extras
+
+from utils import db, json_store
+
+_CHECKPOINT_FILE = "data/replay_checkpoint.json"
+_REJECTED_FILE = "data/replay_rejected.jsonl"
+
+
+def content_hash(record: dict) -> str:
+    """Stable SHA-256 of a record (key order and whitespace don't matter)."""
+    canonical = json.dumps(record, sort_keys=True, separators=(",", ":"),
+                           ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+# ──────────────────────────────────────────────
+# Checkpoint
+# ──────────────────────────────────────────────
+
+def _load_checkpoint(path: str) -> dict:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _save_checkpoint(path: str, checkpoint: dict):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(checkpoint, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# ──────────────────────────────────────────────
+# Reading
+# ──────────────────────────────────────────────
+
+def _iter_file(name: str, offset: int):
+    """Yield (offset after line, record) for each complete JSON line from `offset`."""
+    with json_store.open_log_file(name) as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                return                      # torn / still being written
+            offset += len(line)
+            if not line.strip():
+                continue
+            try:
+                yield offset, json.loads(line)
+            except ValueError:
+                print(f"⚠️  Skipping unreadable line in {name} before byte {offset}")
+
+
+def _file_id(name: str) -> Optional[str]:
+    """Hash of the file's first line, or None while it has no complete line."""
+    with json_store.open_log_file(name) as f:
+        first = f.readline()
+    if not first.endswith(b"\n"):
+        return None
+    return hashlib.sha256(first).hexdigest()
+
+
+def _start_offset(checkpoint: dict, key: str, file_id: str) -> int:
+    """Checkpointed offset of `key`, or 0 if it was recorded for another file."""
+    saved = checkpoint.get(key)
+    if isinstance(saved, dict) and saved.get("file_id") == file_id:
+        return saved["offset"]
+    return 0                                # new file, rotated-in log or old checkpoint format
+
+
+def _batches(log_path: str, checkpoint: dict, batch_size: int):
+    """Yield (file name, file id, offset after batch, [(hash, record)]) across all log files."""
+    for name in json_store.log_files(log_path):
+        key = os.path.basename(name)
+        file_id = _file_id(name)
+        if file_id is None:
+            continue                        # empty, or first record still being written
+        batch = []
+        for offset, record in _iter_file(name, _start_offset(checkpoint, key, file_id)):
+            batch.append((content_hash(record), record))
+            if len(batch) >= batch_size:
+                yield key, file_id, offset, batch
+                batch = []
+        if batch:
+            yield key, file_id, offset, batch
+
+
+# ──────────────────────────────────────────────
+# Writing
+# ──────────────────────────────────────────────
+
+def _evaluated_at(timestamp):
+    """
+    The record's timestamp as an aware UTC datetime. json_store writes
+    naive local time; inserted as is, TIMESTAMPTZ would read it in the
+    server's zone instead. Unparseable values are passed through for
+    Postgres to reject.
+    """
+    if not isinstance(timestamp, str):
+        return timestamp
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return timestamp
+    # astimezone() on a naive datetime takes it as local time.
+    return parsed.astimezone(timezone.utc)
+
+
+def _payload(record: dict) -> dict:
+    return db._candidate_result_payload(record, evaluated_at=_evaluated_at(record.get("timestamp")))
+
+
+def _apply_batch(batch: list) -> int:
+    """Insert the records not replayed before, in one transaction. Returns rows inserted."""
+    with db.pooled_connection() as conn:
+        cur = conn.cursor()
+        new = {h for (h,) in psycopg2.extras.execute_values(
+            cur, "INSERT INTO fallback_replayed (content_hash) VALUES %s "
+                 "ON CONFLICT DO NOTHING RETURNING content_hash;",
+            [(h,) for h, _ in batch], fetch=True)}
+        # Group rows by column list so each group is one multi-row INSERT.
+        groups = {}
+        for h, record in batch:
+            if h in new:
+                new.discard(h)              # identical records within a batch count once
+                payload = _payload(record)
+                groups.setdefault(tuple(payload["columns"]), []).append(tuple(payload["values"]))
+        for columns, rows in groups.items():
+            psycopg2.extras.execute_values(
+                cur, f"INSERT INTO evaluation_results ({', '.join(columns)}) VALUES %s;",
+                rows, page_size=1000)
+        conn.commit()
+        cur.close()
+    return sum(len(rows) for rows in groups.values())
+
+
+def _apply_one_by_one(batch: list, rejected_path: str) -> tuple[int, int]:
+    """Retry a failed batch record by record; rejects go to `rejected_path`."""
+    inserted = rejected = 0
+    for h, record in batch:
+        try:
+            inserted += _apply_batch([(h, record)])
+        except Exception as e:
+            if db._is_transient(e):
+                raise
+            json_store.append_records([{"error": str(e), "record": record}], rejected_path)
+            rejected += 1
+    return inserted, rejected
+
+
+def replay(log_path: str = json_store._DATA_FILE, batch_size: int = 500,
+           checkpoint_path: str = _CHECKPOINT_FILE, rejected_path: str = _REJECTED_FILE,
+           dry_run: bool = False) -> dict:
+    """Replay every fallback record not yet in Postgres. Returns the run's counters."""
+    checkpoint = _load_checkpoint(checkpoint_path)
+    stats = {"read": 0, "inserted": 0, "duplicates": 0, "rejected": 0}
+    start = time.perf_counter()
+
+    for key, file_id, offset, batch in _batches(log_path, checkpoint, batch_size):
+        stats["read"] += len(batch)
+        if dry_run:
+            continue
+        try:
+            inserted, rejected = _apply_batch(batch), 0
+        except Exception as e:
+            if db._is_transient(e):
+                raise
+            inserted, rejected = _apply_one_by_one(batch, rejected_path)
+        stats["inserted"] += inserted
+        stats["rejected"] += rejected
+        stats["duplicates"] += len(batch) - inserted - rejected
+        checkpoint[key] = {"file_id": file_id, "offset": offset}
+        _save_checkpoint(checkpoint_path, checkpoint)
+
+        elapsed = time.perf_counter() - start
+        print(f"📤 {key}: {stats['read']} read, {stats['inserted']} inserted, "
+              f"{stats['duplicates']} duplicate(s), {stats['rejected']} rejected "
+              f"({stats['read'] / elapsed:,.0f} rows/s)")
+
+    elapsed = time.perf_counter() - start
+    stats["seconds"] = round(elapsed, 3)
+    stats["rows_per_s"] = round(stats["read"] / elapsed) if elapsed else 0
+    return stats
+
+
+def _main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.replay_fallback",
+        description="Replay local fallback records (utils/json_store.py) into Postgres.")
+    parser.add_argument("--log", default=json_store._DATA_FILE, help="JSONL log to replay")
+    parser.add_argument("--batch", type=int, default=500, help="records per transaction")
+    parser.add_argument("--checkpoint", default=_CHECKPOINT_FILE)
+    parser.add_argument("--dry-run", action="store_true", help="read and count only")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(json_store._LEGACY_FILE):
+        print(f"⚠️  {json_store._LEGACY_FILE} is in the old array format; "
+              f"run 'python -m utils.json_store convert' first to include it.")
+    if not args.dry_run:
+        db.init_tables()
+    try:
+        stats = replay(args.log, args.batch, args.checkpoint, dry_run=args.dry_run)
+    except db._TRANSIENT_ERRORS as e:
+        print(f"❌ Replay stopped, database unavailable (progress is checkpointed): {e}")
+        sys.exit(1)
+    print(f"✅ Replay done: {stats}")
+
+
+if __name__ == "__main__":
+    _main()
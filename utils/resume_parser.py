@@ -1,66 +1,397 @@
 # utils/resume_parser.py
 
 from pypdf import PdfReader
-from docx import Document
+import io
+import mmap
 import os
 import re
+import zipfile
+from xml.etree import ElementTree
 
+from utils.parse_cache import buffer_hash, file_hash, get_cache
 
+# Part of the parse-cache key: bump it whenever parsing or field
+# extraction changes, so cached results are re-parsed.
+PARSER_VERSION = "5"
+
+# Stop reading a PDF after this many pages / characters (0 = no limit).
+# Screening only needs the first pages; long portfolio PDFs would
+# otherwise be extracted in full.
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", 10))
+RESUME_MAX_CHARS = int(os.getenv("RESUME_MAX_CHARS", 20000))
 
-def parse_pdf(file_path):
-    text = ""
-    reader = PdfReader(file_path)
 
-    for page in reader.pages:
+def iter_pdf_pages(file_path, max_pages=None):
+    """Yield the text of each non-empty page, extracting pages lazily."""
+    reader = PdfReader(file_path)
+    for i, page in enumerate(reader.pages):
+        if max_pages and i >= max_pages:
+            return
         page_text = page.extract_text()
         if page_text:
-            text += page_text + " "
+            yield page_text
+
+
+def parse_pdf(file_path, max_pages=RESUME_MAX_PAGES, max_chars=RESUME_MAX_CHARS):
+    parts = []
+    total = 0
+    for page_text in iter_pdf_pages(file_path, max_pages):
+        parts.append(page_text)
+        total += len(page_text) + 1
+        if max_chars and total >= max_chars:
+            break       # enough text for screening; skip the remaining pages
+
+    # Newline between pages, so a heading at the top of a page still
+    # starts its own line for sectionize().
+    text = "\n".join(parts).strip()
+    return text[:max_chars] if max_chars else text
+
+
+# ─── DOCX ────────────────────────────────────────────────────────────
+# word/document.xml (plus headers/footers) is streamed out of the zip and
+# iterparsed; each paragraph is cleared as soon as its text is taken, so
+# memory stays flat and python-docx's object model is never built.
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_DOCX_PART = re.compile(r"word/(header|document|footer)\d*\.xml")
+_DOCX_PART_ORDER = {"header": 0, "document": 1, "footer": 2}
+
+
+def _iter_docx_part(stream):
+    """
+    Yield the lines of one WordprocessingML part: one per paragraph, one
+    per table row (cells joined with " | ").
+    """
+    # Stack of open containers: the part itself, table rows and cells.
+    # A finished paragraph/cell/row is appended to the innermost one.
+    stack = [[]]
+    runs = []               # one list per open paragraph (text boxes nest them)
+    skip = 0                # inside mc:Fallback (duplicate of mc:Choice)
+    for event, elem in ElementTree.iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if tag == _MC_FALLBACK:
+            skip += 1 if event == "start" else -1
+            continue
+        if skip:
+            if event == "end":
+                elem.clear()
+            continue
+        if event == "start":
+            if tag == _W + "p":
+                runs.append([])
+            elif tag in (_W + "tr", _W + "tc"):
+                stack.append([])
+            continue
+
+        if tag == _W + "t" and runs:
+            runs[-1].append(elem.text or "")
+            continue
+        if tag == _W + "tab" and runs:
+            runs[-1].append("\t")
+            continue
+        if tag in (_W + "br", _W + "cr") and runs:
+            runs[-1].append("\n")
+            continue
+        if tag == _W + "p":
+            stack[-1].append("".join(runs.pop()).strip())
+            elem.clear()
+        elif tag == _W + "tc":
+            cell = " ".join(filter(None, stack.pop()))
+            stack[-1].append(cell)
+        elif tag == _W + "tr":
+            row = " | ".join(filter(None, stack.pop()))
+            stack[-1].append(row)
+            elem.clear()
+        else:
+            continue
+        if len(stack) == 1:
+            yield from filter(None, stack[0])
+            stack[0].clear()
+
+
+def iter_docx_lines(source):
+    """Yield text lines of a .docx (path or binary file): headers, body, footers."""
+    with zipfile.ZipFile(source) as archive:
+        names = archive.namelist()
+        if "word/document.xml" not in names:
+            raise ValueError("not a .docx")     # some other zip (xlsx, odt, plain archive)
+        parts = sorted((name for name in names if _DOCX_PART.fullmatch(name)),
+                       key=lambda name: (_DOCX_PART_ORDER[_DOCX_PART.fullmatch(name).group(1)],
+                                         name))
+        seen = set()
+        for name in parts:
+            with archive.open(name) as stream:
+                if name == "word/document.xml":
+                    yield from _iter_docx_part(stream)
+                    continue
+                # Headers/footers often repeat (first page, even, default).
+                text = "\n".join(_iter_docx_part(stream))
+            if text and text not in seen:
+                seen.add(text)
+                yield text
 
-    return text.strip()
 
+def parse_docx(file_path, max_chars=RESUME_MAX_CHARS):
+    parts = []
+    total = 0
+    for line in iter_docx_lines(file_path):
+        parts.append(line)
+        total += len(line) + 1
+        if max_chars and total >= max_chars:
+            break
 
-def parse_docx(file_path):
-    text = ""
-    doc = Document(file_path)
+    text = "\n".join(parts).strip()
+    return text[:max_chars] if max_chars else text
 
-    for para in doc.paragraphs:
-        text += para.text + " "
 
-    return text.strip()
+# ─── In-memory sources ───────────────────────────────────────────────
+# Uploads are parsed straight from memory, without a temp-file round
+# trip: the format comes from the magic bytes instead of a file extension.
+_MAGIC = ((b"%PDF-", ".pdf"), (b"PK\x03\x04", ".docx"))
 
+_PARSERS = {".pdf": parse_pdf, ".docx": parse_docx}
 
-def extract_resume_text(file_path):
-    if not os.path.exists(file_path):
-        raise FileNotFoundError("Resume file not found")
 
-    if file_path.endswith(".pdf"):
-        return parse_pdf(file_path)
+def sniff_format(data):
+    """".pdf" or ".docx" from the leading bytes, or None."""
+    head = bytes(data[:1024])
+    for magic, fmt in _MAGIC:
+        # PDF readers accept a header anywhere in the first 1 KB.
+        if head.startswith(magic) or (fmt == ".pdf" and magic in head):
+            return fmt
+    return None
+
+
+def read_resume_bytes(fileobj):
+    """
+    The contents of a binary file object (e.g. FastAPI's UploadFile.file)
+    as bytes. This is a copy, made once: it must outlive the upload, and
+    the sandboxed parser (utils.parse_sandbox) needs picklable bytes.
+    """
+    fileobj.seek(0)
+    return fileobj.read()
+
+
+def _parse_cached(parser, source, content_hash):
+    # Same bytes, same parser version → reuse the earlier parse.
+    cache = get_cache()
+    if cache is None:
+        return parser(source)
+    key = cache.key(content_hash(),
+                    f"{PARSER_VERSION}:{RESUME_MAX_PAGES}:{RESUME_MAX_CHARS}")
+    entry = cache.get(key)
+    if entry is not None:
+        _remember_fields(entry["text"], entry["fields"])
+        return entry["text"]
+
+    text = parser(source)
+    fields = _extract_fields(text)
+    try:
+        cache.put(key, {"text": text, "fields": fields})
+    except OSError as e:
+        print(f"⚠️  Parse cache write failed: {e}")
+    _remember_fields(text, fields)
+    return text
+
 
-    elif file_path.endswith(".docx"):
-        return parse_docx(file_path)
+def extract_resume_text(source):
+    """
+    Text of a PDF/DOCX resume. `source` is a path (format from the
+    extension), or the file's contents as bytes / memoryview / mmap or a
+    binary file object (format sniffed from the magic bytes).
+    """
+    if isinstance(source, (str, os.PathLike)):
+        file_path = os.fspath(source)
+        if not os.path.exists(file_path):
+            raise FileNotFoundError("Resume file not found")
+        parser = _PARSERS.get(os.path.splitext(file_path)[1].lower())
+        if parser is None:
+            raise ValueError("Unsupported file format. Use PDF or DOCX.")
+        return _parse_cached(parser, file_path, lambda: file_hash(file_path))
 
-    else:
+    data = source if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)) \
+        else read_resume_bytes(source)
+    parser = _PARSERS.get(sniff_format(data))
+    if parser is None:
         raise ValueError("Unsupported file format. Use PDF or DOCX.")
+    # An mmap is itself a seekable file object; bytes are wrapped without copying.
+    stream = data if isinstance(data, mmap.mmap) else io.BytesIO(data)
+    stream.seek(0)
+    return _parse_cached(parser, stream, lambda: buffer_hash(data))
+
+# ─── Contact fields ──────────────────────────────────────────────────
+# One precompiled pattern, one left-to-right pass. Alternatives are tried
+# in order at each position, so a LinkedIn/GitHub URL is consumed before
+# the bare "linkedin"/"github" mention alternatives can match it, and
+# digits inside an email or URL are never taken for a phone number.
+#
+# This replaced the separate extract_email()/extract_phone() searches.
+# The phone pattern is the same, but results differ in two cases:
+#   - digits inside an email, LinkedIn or GitHub URL are no longer
+#     returned as the phone number (the next real number is);
+#   - an email keeps a "+tag" in its local part ("jane+jobs@x.com", not
+#     "jobs@x.com") and needs a 2+ letter TLD ("x.c0" is not an email).
+_CONTACT_RE = re.compile(r"""
+    (?P<email>[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[A-Za-z]{2,})
+  | (?P<linkedin>(?i:(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/)[\w%-]+/?)
+  | (?i:(?:https?://)?(?:www\.)?github\.com/)(?P<github>[A-Za-z0-9](?:[A-Za-z0-9-]{0,38}))
+  | (?i:github)\s*(?:username|id)?\s*[:\-|]\s*@?(?P<github_label>[A-Za-z0-9](?:[A-Za-z0-9-]{0,38}))\b(?![.@/])
+  | ^[ \t]*(?i:(?:full[ \t]+)?name)[ \t]*[:\-][ \t]*(?P<name_label>[A-Z][A-Za-z.'-]+(?:[ \t]+[A-Z][A-Za-z.'-]+){0,3})[ \t]*$
+  | (?P<phone>(?:\+?\d{1,3}[-.\s]?)?(?:\d{10}|\d{3}[-.\s]?\d{3}[-.\s]?\d{4}))
+  | (?P<linkedin_mention>(?i:linkedin))
+  | (?P<github_mention>(?i:github))
+  | (?P<at>@)
+""", re.VERBOSE | re.MULTILINE)
+
+# Two to four capitalised words, nothing else: the usual first line of a resume.
+_NAME_LINE_RE = re.compile(r"[A-Z][a-zA-Z'-]+(?:\.|(?:\s+[A-Z][a-zA-Z.'-]+){1,3})")
+_NAME_PREFIX_RE = re.compile(r"[A-Z][a-zA-Z'-]+(?:\s+[A-Z][a-zA-Z'-]+){1,2}")
+
+# Confidence per match kind. A field that is absent and whose marker
+# ("@", "linkedin", "github") never appears is confidently absent (1.0);
+# a marker without a parseable value is unresolved (0.0).
+_CONFIDENCE = {
+    "email": 0.95,
+    "linkedin": 0.95,
+    "github": 0.95,
+    "github_label": 0.8,
+    "name_label": 0.95,
+    "name_line": 0.8,
+    "name_prefix": 0.5,
+    "phone": 0.9,
+}
+CONTACT_FIELDS = ("name", "email", "phone", "linkedin", "github")
+
+
+def _field(value, confidence):
+    return {"value": value, "confidence": confidence}
+
+
+def _scan_contact_fields(resume_text):
+    found = {}
+    markers = set()
+    for match in _CONTACT_RE.finditer(resume_text):
+        kind = match.lastgroup
+        if kind in ("linkedin_mention", "github_mention", "at"):
+            markers.add(kind)
+            continue
+        field = {"github_label": "github", "name_label": "name"}.get(kind, kind)
+        confidence = _CONFIDENCE[kind]
+        if field not in found or confidence > found[field]["confidence"]:
+            found[field] = _field(match.group(kind).strip(), confidence)
+
+    if "name" not in found:
+        first_line = resume_text.lstrip().split("\n", 1)[0].strip()
+        if _NAME_LINE_RE.fullmatch(first_line):
+            found["name"] = _field(first_line, _CONFIDENCE["name_line"])
+        else:
+            # DOCX text is joined with spaces, so the name runs into the headline.
+            prefix = _NAME_PREFIX_RE.match(first_line)
+            if prefix:
+                found["name"] = _field(prefix.group(0), _CONFIDENCE["name_prefix"])
+
+    marker_for = {"email": "at", "linkedin": "linkedin_mention", "github": "github_mention"}
+    for field in CONTACT_FIELDS:
+        if field not in found:
+            marker = marker_for.get(field)
+            found[field] = _field(None, 1.0 if marker and marker not in markers else 0.0)
+    return found
+
+
+def extract_contact_fields(resume_text):
+    """
+    Name, email, phone, LinkedIn URL and GitHub username in a single regex
+    pass, as {field: {"value": str | None, "confidence": 0.0-1.0}}.
+    """
+    fields = _recent_fields.get(resume_text)
+    if fields and "contact" in fields:
+        return fields["contact"]
+    return _scan_contact_fields(resume_text)
+
 
 def extract_email(resume_text):
-    match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', resume_text)
-    if match:
-        return match.group(0)
-    return None
+    return extract_contact_fields(resume_text)["email"]["value"]
+
+
+# ─── Sections ────────────────────────────────────────────────────────
+# A heading is a short line holding only a known title (optionally
+# bulleted or followed by a colon). Each named group is one section.
+_HEADING_RE = re.compile(r"""
+    ^[ \t\u2022*-]*(?:
+        (?P<summary>(?:professional\s+|career\s+)?(?:summary|profile|objective)|about\s+me)
+      | (?P<skills>(?:technical\s+|core\s+|key\s+)?(?:skills|competencies)(?:\s+(?:&|and)\s+\w+)?|tech(?:nical)?\s+stack)
+      | (?P<experience>(?:professional\s+|work\s+)?experience|employment(?:\s+history)?|work\s+history|internships?)
+      | (?P<projects>(?:personal\s+|academic\s+|key\s+)?projects)
+      | (?P<education>education(?:al\s+background)?|academic\s+background|qualifications)
+      | (?P<other>certifications?|achievements|awards|publications|languages|interests|hobbies|references|declaration)
+    )[ \t]*:?[ \t]*$
+""", re.VERBOSE | re.MULTILINE | re.IGNORECASE)
+
+SECTIONS = ("contact", "summary", "skills", "experience", "projects", "education", "other")
+
+
+def _scan_sections(resume_text):
+    """{section: [[start, end], ...]}; text before the first heading is "contact"."""
+    spans = {}
+    start, section = 0, "contact"
+    for match in _HEADING_RE.finditer(resume_text):
+        if resume_text[start:match.start()].strip():
+            spans.setdefault(section, []).append([start, match.start()])
+        start, section = match.start(), match.lastgroup
+    if resume_text[start:].strip():
+        spans.setdefault(section, []).append([start, len(resume_text)])
+    return spans
+
+
+def sectionize(resume_text):
+    """
+    Character spans of each section, as {section: [[start, end], ...]}.
+    Spans include the heading line; a section may appear more than once.
+    """
+    fields = _recent_fields.get(resume_text)
+    if fields and "sections" in fields:
+        return fields["sections"]
+    return _scan_sections(resume_text)
+
+
+def resume_sections(resume_text, *names, limit=None):
+    """
+    The text of the named sections, in resume order. Falls back to the
+    whole resume if none of them were found. `limit` caps the length.
+    """
+    spans = sectionize(resume_text)
+    picked = sorted(span for name in names for span in spans.get(name, ()))
+    text = "\n".join(resume_text[start:end].strip() for start, end in picked) or resume_text
+    return text[:limit] if limit else text
+
+
+def _extract_fields(resume_text):
+    contact = _scan_contact_fields(resume_text)
+    return {
+        "email": contact["email"]["value"],
+        "phone": contact["phone"]["value"],
+        "contact": contact,
+        "sections": _scan_sections(resume_text),
+    }
+
+
+# Fields of recently extracted texts (from the parse cache or a fresh
+# parse), so extract_resume_data() on that text doesn't redo the work.
+_recent_fields = {}
+_RECENT_FIELDS_MAX = 256
+
+
+def _remember_fields(resume_text, fields):
+    if len(_recent_fields) >= _RECENT_FIELDS_MAX:
+        _recent_fields.pop(next(iter(_recent_fields)))
+    _recent_fields[resume_text] = fields
 
-def extract_phone(resume_text):
-    # Regex to match common phone number formats (with or without country code)
-    # Plus sign, optional digits, dashboard/space, more digits
-    phone_pattern = r'(\+?\d{1,3}[-.\s]?)?(\d{10}|\d{3}[-.\s]?\d{3}[-.\s]?\d{4})'
-    match = re.search(phone_pattern, resume_text)
-    if match:
-        return match.group(0).strip()
-    return None
 
 def extract_resume_data(resume_text):
+    fields = _recent_fields.get(resume_text) or _extract_fields(resume_text)
     return {
-        "email": extract_email(resume_text),
-        "phone": extract_phone(resume_text),
+        "email": fields["email"],
+        "phone": fields["phone"],
         "text": resume_text
     }
 
@@ -0,0 +1,489 @@
+"""
+utils/sqlite_store.py
+---------------------
+Embedded SQLite implementation of the utils/db.py storage API, for local
+development, offline benchmarking and CI without a Supabase instance.
+
+Enable with DB_BACKEND=sqlite (file: SQLITE_PATH, default
+data/agentforge.db). utils/db.py and utils/async_db.py then re-export
+these functions, so callers keep importing from utils.db unchanged.
+
+The database runs in WAL mode with synchronous=NORMAL: readers never
+block the writer and commits don't fsync the main file. Tables and
+indexes mirror the Postgres migrations; TEXT[] columns are stored as
+JSON and timestamps as UTC 'YYYY-MM-DD HH:MM:SS.fff' text, which sorts
+correctly as a string.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from utils import db
+
+
+# ──────────────────────────────────────────────
+# Connection
+# ──────────────────────────────────────────────
+
+_local = threading.local()
+_schema_lock = threading.Lock()
+
+_NOW = "(strftime('%Y-%m-%d %H:%M:%f', 'now'))"
+
+
+def _db_path() -> str:
+    default = Path(__file__).resolve().parents[1] / "data" / "agentforge.db"
+    return os.getenv("SQLITE_PATH", str(default))
+
+
+def get_connection() -> sqlite3.Connection:
+    """Return this thread's SQLite connection (opened and tuned on first use)."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        path = _db_path()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = sqlite3.connect(path, timeout=float(os.getenv("SQLITE_BUSY_TIMEOUT", 5)),
+                               isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute("PRAGMA foreign_keys=ON;")
+        _local.conn = conn
+    return conn
+
+
+@contextmanager
+def _transaction():
+    """BEGIN IMMEDIATE … COMMIT on this thread's connection (ROLLBACK on error)."""
+    conn = get_connection()
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK;")
+        raise
+    conn.execute("COMMIT;")
+
+
+def test_connection():
+    """Quick connectivity test. Returns True/False."""
+    try:
+        get_connection().execute("SELECT 1;").fetchone()
+        print(f"✅ SQLite store ready ({_db_path()})")
+        return True
+    except Exception as e:
+        print(f"❌ SQLite connection failed: {e}")
+        return False
+
+
+# ──────────────────────────────────────────────
+# Schema  (PRAGMA user_version tracks the applied version)
+# ──────────────────────────────────────────────
+
+_SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS candidates (
+    id              INTEGER PRIMARY KEY,
+    name            TEXT,
+    email           TEXT UNIQUE,
+    phone           TEXT,
+    resume_text     TEXT,
+    linkedin_url    TEXT,
+    github_username TEXT,
+    created_at      TEXT DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS screening_results (
+    id              INTEGER PRIMARY KEY,
+    candidate_id    INTEGER REFERENCES candidates(id) ON DELETE CASCADE,
+    decision        TEXT NOT NULL,
+    reason          TEXT,
+    raw_output      TEXT,
+    screened_at     TEXT DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS background_checks (
+    id                  INTEGER PRIMARY KEY,
+    candidate_id        INTEGER REFERENCES candidates(id) ON DELETE CASCADE,
+    credibility_score   INTEGER,
+    status              TEXT,
+    recommendation      TEXT,
+    email_valid         BOOLEAN,
+    email_confidence    INTEGER,
+    linkedin_found      BOOLEAN,
+    linkedin_confidence INTEGER,
+    github_found        BOOLEAN,
+    github_repos        INTEGER,
+    github_mern_projects INTEGER,
+    issues              TEXT,               -- JSON array
+    verified_at         TEXT DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS interview_sessions (
+    id                  INTEGER PRIMARY KEY,
+    candidate_id        INTEGER REFERENCES candidates(id) ON DELETE CASCADE,
+    call_id             TEXT,
+    phone_number        TEXT,
+    call_status         TEXT,
+    questions_asked     TEXT,
+    transcript          TEXT,
+    duration_seconds    INTEGER,
+    called_at           TEXT DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS evaluation_results (
+    id                  INTEGER PRIMARY KEY,
+    candidate_id        INTEGER REFERENCES candidates(id) ON DELETE CASCADE,
+    questions_asked     INTEGER,
+    perfect_answers     INTEGER,
+    score               REAL,
+    decision            TEXT NOT NULL,
+    reason              TEXT,
+    raw_output          TEXT,
+    slack_notified      BOOLEAN DEFAULT 0,
+    email_sent          BOOLEAN DEFAULT 0,
+    evaluated_at        TEXT DEFAULT {_NOW}
+);
+
+CREATE INDEX IF NOT EXISTS idx_candidates_created_at
+    ON candidates (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_screening_results_candidate
+    ON screening_results (candidate_id, screened_at DESC);
+CREATE INDEX IF NOT EXISTS idx_background_checks_candidate
+    ON background_checks (candidate_id, verified_at DESC);
+CREATE INDEX IF NOT EXISTS idx_interview_sessions_candidate
+    ON interview_sessions (candidate_id, called_at DESC);
+CREATE INDEX IF NOT EXISTS idx_evaluation_results_candidate
+    ON evaluation_results (candidate_id, evaluated_at DESC);
+"""
+
+# Same shape as the Postgres resume_blobs / resume_files (used to skip
+# re-parsing known uploads), but SQLite has no TOAST, so content is
+# zlib-compressed UTF-8. candidates keep resume_text inline here.
+_RESUME_SQL = f"""
+CREATE TABLE IF NOT EXISTS resume_blobs (
+    text_hash   TEXT PRIMARY KEY,
+    content     BLOB NOT NULL,
+    created_at  TEXT DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS resume_files (
+    file_hash   TEXT PRIMARY KEY,
+    text_hash   TEXT NOT NULL REFERENCES resume_blobs(text_hash),
+    created_at  TEXT DEFAULT {_NOW}
+);
+"""
+
+_MIGRATIONS = [(1, _SCHEMA_SQL), (2, _RESUME_SQL)]
+_SCHEMA_VERSION = _MIGRATIONS[-1][0]
+
+
+def init_tables():
+    """Create or upgrade the schema. Cheap on every startup."""
+    with _schema_lock:
+        conn = get_connection()
+        current = conn.execute("PRAGMA user_version;").fetchone()[0]
+        for version, sql in _MIGRATIONS:
+            if version > current:
+                conn.executescript(f"BEGIN IMMEDIATE;{sql}"
+                                   f"PRAGMA user_version = {version};COMMIT;")
+    print(f"✅ SQLite schema ready (v{_SCHEMA_VERSION}, {_db_path()}).")
+
+
+# ──────────────────────────────────────────────
+# Writes
+# ──────────────────────────────────────────────
+
+_UPSERT_CANDIDATE_SQL = """
+INSERT INTO candidates (name, email, phone, resume_text, linkedin_url, github_username)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (email) DO UPDATE SET
+    name            = excluded.name,
+    phone           = excluded.phone,
+    resume_text     = excluded.resume_text,
+    linkedin_url    = excluded.linkedin_url,
+    github_username = excluded.github_username
+RETURNING id;
+"""
+
+
+def _insert_sql(table: str) -> str:
+    columns = ("candidate_id",) + db._RESULT_COLUMNS[table]
+    return (f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))});")
+
+
+def _adapt(row: tuple) -> tuple:
+    """Lists (TEXT[] in Postgres) become JSON text."""
+    return tuple(json.dumps(v) if isinstance(v, (list, tuple)) else v for v in row)
+
+
+def upsert_candidate(name=None, email=None, phone=None, resume_text=None,
+                     linkedin_url=None, github_username=None) -> Optional[int]:
+    """Insert or update a candidate row. Returns its id, or None on failure."""
+    try:
+        with _transaction() as conn:
+            candidate_id = conn.execute(
+                _UPSERT_CANDIDATE_SQL,
+                (name, email, phone, resume_text, linkedin_url, github_username)).fetchone()[0]
+        print(f"📁 Candidate saved (id={candidate_id})")
+        return candidate_id
+    except Exception as e:
+        print(f"❌ upsert_candidate failed: {e}")
+        return None
+
+
+def _insert_result(table: str, candidate_id: int, row: tuple, success_msg: str) -> bool:
+    try:
+        with _transaction() as conn:
+            conn.execute(_insert_sql(table), (candidate_id,) + _adapt(row))
+        print(success_msg)
+        return True
+    except Exception as e:
+        print(f"❌ DB write failed: {e}")
+        return False
+
+
+def save_screening_result(candidate_id: int, raw_output: str):
+    """Parse and save the screening agent's raw output."""
+    _insert_result("screening_results", candidate_id, db._screening_row(raw_output),
+                   success_msg="📋 Screening result saved.")
+
+
+def save_background_check(candidate_id: int, verification_result: dict):
+    """Save the output from background_verification_agent.verify_background()."""
+    _insert_result("background_checks", candidate_id, db._background_row(verification_result),
+                   success_msg="🔍 Background check saved.")
+
+
+def save_interview_session(candidate_id: int, call_id: str, phone_number: str,
+                           questions: str, transcript: str = None,
+                           call_status: str = "completed", duration_seconds: int = None):
+    """Save a Vapi interview call session."""
+    row = db._interview_row(call_id, phone_number, questions, transcript,
+                            call_status, duration_seconds)
+    _insert_result("interview_sessions", candidate_id, row,
+                   success_msg="📞 Interview session saved.")
+
+
+def save_evaluation_result(candidate_id: int, raw_output: str,
+                           slack_notified=False, email_sent=False):
+    """Parse and save the final LLM evaluation output."""
+    return _insert_result("evaluation_results", candidate_id,
+                   db._evaluation_row(raw_output, slack_notified, email_sent),
+                   success_msg="📊 Evaluation result saved.")
+
+
+class CandidateSession(db.CandidateSession):
+    """db.CandidateSession, flushed as one BEGIN IMMEDIATE … COMMIT in SQLite."""
+
+    def _write(self) -> int:
+        c = self._candidate
+        with _transaction() as conn:
+            candidate_id = self.candidate_id
+            if self._candidate_dirty:
+                candidate_id = conn.execute(
+                    _UPSERT_CANDIDATE_SQL,
+                    (c["name"], c["email"], c["phone"], c["resume_text"],
+                     c["linkedin_url"], c["github_username"])).fetchone()[0]
+            for table, rows in self._rows.items():
+                if rows:
+                    conn.executemany(_insert_sql(table),
+                                     [(candidate_id,) + _adapt(row) for row in rows])
+        return candidate_id
+
+
+def store_candidate_result(candidate_data: dict) -> bool:
+    """SQLite version of utils.db.store_candidate_result()."""
+    candidate_id = candidate_data.get("candidate_id")
+    raw_output = candidate_data.get("evaluation_summary", "")
+    slack_notified = candidate_data.get("slack_notified", False)
+    email_sent = candidate_data.get("email_sent", False)
+
+    if candidate_id:
+        return save_evaluation_result(candidate_id, raw_output, slack_notified, email_sent)
+    try:
+        with _transaction() as conn:
+            conn.execute(
+                "INSERT INTO evaluation_results "
+                "(decision, reason, raw_output, slack_notified, email_sent) VALUES (?, ?, ?, ?, ?);",
+                (candidate_data.get("decision", "Fail"), candidate_data.get("remarks", ""),
+                 raw_output, slack_notified, email_sent))
+        print("📁 Candidate result stored in SQLite.")
+        return True
+    except Exception as e:
+        print(f"❌ DB write failed: {e}")
+        return False
+
+
+def store_resume(text: str, file_hash: str = None) -> Optional[str]:
+    """SQLite version of utils.db.store_resume()."""
+    if not text:
+        return None
+    text_hash = db.resume_hash(text)
+    try:
+        with _transaction() as conn:
+            if conn.execute("SELECT 1 FROM resume_blobs WHERE text_hash = ?;",
+                            (text_hash,)).fetchone() is None:
+                conn.execute("INSERT INTO resume_blobs (text_hash, content) VALUES (?, ?);",
+                             (text_hash, zlib.compress(text.encode("utf-8"))))
+            if file_hash:
+                conn.execute("INSERT INTO resume_files (file_hash, text_hash) VALUES (?, ?) "
+                             "ON CONFLICT (file_hash) DO NOTHING;", (file_hash, text_hash))
+        return text_hash
+    except Exception as e:
+        print(f"❌ store_resume failed: {e}")
+        return None
+
+
+def get_resume_by_file_hash(file_hash: str) -> Optional[str]:
+    """SQLite version of utils.db.get_resume_by_file_hash()."""
+    row = get_connection().execute(
+        "SELECT rb.content FROM resume_files rf "
+        "JOIN resume_blobs rb ON rb.text_hash = rf.text_hash WHERE rf.file_hash = ?;",
+        (file_hash,)).fetchone()
+    return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+
+def save_transcript(data: dict):
+    """SQLite version of utils.db.save_transcript() (webhook_server)."""
+    with CandidateSession(name=data.get("name"), email=data.get("email")) as session:
+        session.add_interview_session(
+            call_id="webhook",
+            phone_number="",
+            questions="",
+            transcript=data.get("transcript"),
+            call_status=data.get("status", "completed"),
+            duration_seconds=data.get("duration"),
+        )
+
+
+# ──────────────────────────────────────────────
+# Reads
+# ──────────────────────────────────────────────
+
+def _to_text(ts: datetime) -> str:
+    """datetime → the stored UTC text form, for comparisons."""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+
+def _row_dict(row: sqlite3.Row) -> dict:
+    """sqlite3.Row → dict, with *_at columns as UTC datetimes (like TIMESTAMPTZ)."""
+    out = dict(row)
+    for key, value in out.items():
+        if key.endswith("_at") and isinstance(value, str):
+            out[key] = datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+        elif key == "issues" and isinstance(value, str):
+            out[key] = json.loads(value)
+    return out
+
+
+def _fetch_all(sql: str, params: tuple = ()) -> list[dict]:
+    try:
+        return [_row_dict(r) for r in get_connection().execute(sql, params)]
+    except Exception as e:
+        print(f"❌ DB read failed: {e}")
+        return []
+
+
+def get_candidate_by_email(email: str) -> Optional[dict]:
+    """Look up a candidate by email. Returns a dict or None."""
+    rows = _fetch_all("SELECT * FROM candidates WHERE email = ? LIMIT 1;", (email,))
+    return rows[0] if rows else None
+
+
+def _candidates_query(cursor: str = None, decision: str = None,
+                      min_score: float = None, max_score: float = None,
+                      created_from: datetime = None, created_to: datetime = None,
+                      limit: int = None) -> tuple:
+    """SQLite twin of utils.db._candidates_query()."""
+    where, params = [], []
+    if cursor:
+        created_at, candidate_id = db.decode_cursor(cursor)
+        where.append("(c.created_at, c.id) < (?, ?)")
+        params.extend((_to_text(created_at), candidate_id))
+    if created_from:
+        where.append("c.created_at >= ?")
+        params.append(_to_text(created_from))
+    if created_to:
+        where.append("c.created_at < ?")
+        params.append(_to_text(created_to))
+    if decision:
+        where.append("er.decision LIKE ?")
+        params.append(decision)
+    if min_score is not None:
+        where.append("er.score >= ?")
+        params.append(min_score)
+    if max_score is not None:
+        where.append("er.score <= ?")
+        params.append(max_score)
+
+    sql = f"""
+    SELECT
+        c.id, c.name, c.email, c.phone, c.github_username, c.created_at,
+        er.decision, er.score, er.evaluated_at
+    FROM candidates c
+    LEFT JOIN evaluation_results er ON er.id = (
+        SELECT id FROM evaluation_results
+        WHERE candidate_id = c.id
+        ORDER BY evaluated_at DESC, id DESC
+        LIMIT 1
+    )
+    {"WHERE " + " AND ".join(where) if where else ""}
+    ORDER BY c.created_at DESC, c.id DESC
+    {"LIMIT ?" if limit else ""};
+    """
+    if limit:
+        params.append(limit)
+    return sql, tuple(params)
+
+
+def get_all_candidates() -> list[dict]:
+    """Return all candidates with their latest evaluation decision."""
+    return _fetch_all(*_candidates_query())
+
+
+def get_candidates_page(limit: int = 50, cursor: str = None, **filters) -> dict:
+    """Keyset page of candidates; same contract as utils.db.get_candidates_page()."""
+    sql, params = _candidates_query(cursor=cursor, limit=limit + 1, **filters)
+    return db._page_result(_fetch_all(sql, params), limit)
+
+
+def iter_candidates(itersize: int = 500, **filters):
+    """Stream matching candidates `itersize` rows at a time."""
+    cur = get_connection().execute(*_candidates_query(**filters))
+    while True:
+        rows = cur.fetchmany(itersize)
+        if not rows:
+            return
+        for row in rows:
+            yield _row_dict(row)
+
+
+def get_pipeline_stats() -> dict:
+    """
+    Return aggregate stats for the dashboard. One indexed subquery per
+    table instead of the Postgres rollup; no join fan-out.
+    """
+    rows = _fetch_all("""
+    SELECT
+        (SELECT COUNT(*) FROM candidates)                               AS total_candidates,
+        (SELECT COUNT(DISTINCT candidate_id) FROM screening_results
+          WHERE decision LIKE '%qualified%' AND decision NOT LIKE '%not%') AS passed_screening,
+        (SELECT COUNT(DISTINCT candidate_id) FROM background_checks
+          WHERE credibility_score >= 70)                                AS passed_verification,
+        (SELECT COUNT(DISTINCT candidate_id) FROM evaluation_results
+          WHERE decision LIKE 'pass')                                   AS final_passed,
+        (SELECT COUNT(DISTINCT candidate_id) FROM evaluation_results
+          WHERE decision LIKE 'fail')                                   AS final_failed;
+    """)
+    return rows[0] if rows else {}
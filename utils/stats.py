@@ -0,0 +1,14 @@
+"""
+utils/stats.py
+--------------
+Small statistics helpers shared by the app and the benchmark scripts.
+"""
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile of `samples` (pct in 0–100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    k = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[k]
@@ -0,0 +1,440 @@
+"""
+utils/write_spool.py
+--------------------
+Durable write-behind queue for utils/db.py.
+
+Writes that can't (or shouldn't) wait for Postgres are appended to a
+local spool and applied later by a background flusher thread:
+
+  enqueue()  appends one JSON line to the active segment file and returns
+             once it is on disk. fsyncs are group-committed: one fsync
+             covers every record appended within DB_SPOOL_FSYNC_MS.
+  flusher    applies up to DB_SPOOL_BATCH records after the checkpoint in
+             one transaction, then advances the checkpoint. Connection
+             errors retry with exponential backoff (up to
+             DB_SPOOL_RETRY_MAX seconds); a record that fails on its own
+             is moved to dead.jsonl so it can't block the queue.
+
+Every record has a UUID that is inserted into spool_applied in the same
+transaction, so a crash between COMMIT and the checkpoint write never
+applies a record twice.
+
+Each process spools into its own directory under DB_SPOOL_DIR (default
+data/spool) and holds an flock on it. Flushers also drain directories
+left behind by processes that have exited.
+"""
+
+import atexit
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:          # no flock: directories of dead processes are not adopted
+    fcntl = None
+
+from utils import db
+
+SPOOL_DIR = Path(os.getenv("DB_SPOOL_DIR",
+                           str(Path(__file__).resolve().parents[1] / "data" / "spool")))
+FSYNC_WINDOW = float(os.getenv("DB_SPOOL_FSYNC_MS", 2)) / 1000
+BATCH_SIZE = int(os.getenv("DB_SPOOL_BATCH", 200))
+SEGMENT_BYTES = int(float(os.getenv("DB_SPOOL_SEGMENT_MB", 16)) * 1024 * 1024)
+RETRY_MAX = float(os.getenv("DB_SPOOL_RETRY_MAX", 60))
+POLL_INTERVAL = float(os.getenv("DB_SPOOL_POLL", 0.5))
+DRAIN_TIMEOUT = float(os.getenv("DB_SPOOL_DRAIN_TIMEOUT", 5))
+
+_CHECKPOINT = "checkpoint.json"
+_DEAD_LETTER = "dead.jsonl"
+_LOCK = "lock"
+
+
+# ──────────────────────────────────────────────
+# Files
+# ──────────────────────────────────────────────
+
+def _segment_path(directory: Path, segment: int) -> Path:
+    return directory / f"{segment:08d}.log"
+
+
+def _segments(directory: Path) -> list[int]:
+    return sorted(int(p.stem) for p in directory.glob("*.log") if p.stem.isdigit())
+
+
+def _read_checkpoint(directory: Path) -> tuple[int, int]:
+    try:
+        data = json.loads((directory / _CHECKPOINT).read_text())
+        return data["segment"], data["offset"]
+    except (FileNotFoundError, ValueError, KeyError):
+        segments = _segments(directory)
+        return (segments[0] if segments else 1), 0
+
+
+def _write_checkpoint(directory: Path, segment: int, offset: int):
+    tmp = directory / (_CHECKPOINT + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump({"segment": segment, "offset": offset}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, directory / _CHECKPOINT)
+
+
+def _truncate_partial(path: Path):
+    """Drop a torn last line (crash mid-append) so new records start cleanly."""
+    if not path.exists():
+        return
+    with open(path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            f.truncate(end)
+
+
+def _try_lock(directory: Path, blocking: bool = False):
+    """flock `directory`; returns the open lock file, or None if another process holds it."""
+    f = open(directory / _LOCK, "a")
+    if fcntl is None:
+        if blocking:
+            return f
+        f.close()
+        return None
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+    except BlockingIOError:
+        f.close()
+        return None
+    return f
+
+
+def _read_lines(path: Path, offset: int, limit: int) -> tuple[list[bytes], int]:
+    """Up to `limit` complete lines of `path` from `offset`, and the offset after them."""
+    lines = []
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            while len(lines) < limit:
+                line = f.readline()
+                if not line.endswith(b"\n"):      # EOF or a record still being written
+                    break
+                lines.append(line)
+                offset += len(line)
+    except FileNotFoundError:
+        pass
+    return lines, offset
+
+
+# ──────────────────────────────────────────────
+# Writer  (append + group-committed fsync)
+# ──────────────────────────────────────────────
+
+class SpoolWriter:
+    """Appends records to this process's spool directory."""
+
+    def __init__(self, directory: Path):
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self._lock_file = _try_lock(directory, blocking=True)
+        self._cond = threading.Condition()
+        segments = _segments(directory)
+        self.segment = segments[-1] if segments else 1
+        path = _segment_path(directory, self.segment)
+        _truncate_partial(path)
+        self._file = open(path, "ab")
+        self._appended = 0
+        self._durable = 0
+        self._closed = False
+        self.fsyncs = 0
+        threading.Thread(target=self._sync_loop, name="spool-fsync", daemon=True).start()
+
+    def append(self, record: dict):
+        """Append one record; returns once it has been fsynced."""
+        line = (json.dumps(record, separators=(",", ":"), default=str) + "\n").encode()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("write spool is closed")
+            if self._file.tell() and self._file.tell() + len(line) > SEGMENT_BYTES:
+                self._rotate()
+            self._file.write(line)
+            self._file.flush()
+            self._appended += 1
+            seq = self._appended
+            self._cond.notify_all()
+            while self._durable < seq:
+                self._cond.wait()
+
+    def _rotate(self):
+        # Caller holds self._cond.
+        self._fsync()
+        self._file.close()
+        self.segment += 1
+        self._file = open(_segment_path(self.directory, self.segment), "ab")
+
+    def _fsync(self):
+        os.fsync(self._file.fileno())
+        self.fsyncs += 1
+        self._durable = self._appended
+        self._cond.notify_all()
+
+    def _sync_loop(self):
+        while True:
+            with self._cond:
+                while self._durable == self._appended and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+            time.sleep(FSYNC_WINDOW)       # let concurrent appends share this fsync
+            with self._cond:
+                if not self._closed:
+                    self._fsync()
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._fsync()
+            self._closed = True
+            self._file.close()
+            self._cond.notify_all()
+
+    def release(self):
+        """Drop the directory lock (after close) so another process may adopt it."""
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+# ──────────────────────────────────────────────
+# Flusher  (spool → Postgres)
+# ──────────────────────────────────────────────
+
+def _apply(records: list[dict]):
+    """Apply `records` in one transaction, skipping ones already applied."""
+    with db.pooled_connection() as conn:
+        cur = conn.cursor()
+        for record in records:
+            cur.execute("INSERT INTO spool_applied (record_id) VALUES (%s) "
+                        "ON CONFLICT DO NOTHING RETURNING 1;", (record["id"],))
+            if cur.fetchone():
+                db.SPOOL_OPS[record["op"]](cur, record["payload"])
+        conn.commit()
+        cur.close()
+
+
+def _dead_letter(directory: Path, line: bytes, error: str):
+    with open(directory / _DEAD_LETTER, "ab") as f:
+        f.write(json.dumps({"error": error, "record": line.decode("utf-8", "replace")}).encode()
+                + b"\n")
+        f.flush()
+        os.fsync(f.fileno())
+    print(f"☠️  Spool record moved to {directory / _DEAD_LETTER}: {error}")
+
+
+class SpoolFlusher:
+    """Drains spool directories into Postgres from a background thread."""
+
+    def __init__(self, root: Path, writer: Optional[SpoolWriter] = None):
+        self.root = root
+        self.writer = writer
+        self.applied = 0
+        self.dead = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="spool-flusher", daemon=True)
+            self._thread.start()
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                done = self.drain_once()
+                backoff = 1.0
+            except Exception as e:
+                if db._is_transient(e):
+                    print(f"⚠️  Spool flush failed, retrying in {backoff:g}s: {e}")
+                    self._stop.wait(backoff)
+                    backoff = min(backoff * 2, RETRY_MAX)
+                    continue
+                print(f"❌ Spool flusher error: {e}")
+                done = 0
+            if not done:
+                self._wake.wait(POLL_INTERVAL)
+                self._wake.clear()
+
+    def drain_once(self) -> int:
+        """One batch from this process's spool, else from an abandoned one. Returns records handled."""
+        if self.writer is not None:
+            done = self._drain_batch(self.writer.directory, self.writer.segment)
+            if done:
+                return done
+        return self._adopt_one()
+
+    def _adopt_one(self) -> int:
+        own = self.writer.directory if self.writer is not None else None
+        for directory in sorted(p for p in self.root.glob("*") if p.is_dir() and p != own):
+            lock = _try_lock(directory)
+            if lock is None:
+                continue                    # owner still running
+            try:
+                total = 0
+                while not self._stop.is_set():
+                    done = self._drain_batch(directory, active_segment=None)
+                    if not done:
+                        break
+                    total += done
+                else:
+                    return total
+                if (directory / _DEAD_LETTER).exists():
+                    dead = self.root / f"dead-{directory.name}.jsonl"
+                    os.replace(directory / _DEAD_LETTER, dead)
+                shutil.rmtree(directory, ignore_errors=True)
+                if total:
+                    print(f"📤 Spool: drained {total} write(s) left by {directory.name}.")
+                return total
+            finally:
+                lock.close()
+        return 0
+
+    def _drain_batch(self, directory: Path, active_segment: Optional[int]) -> int:
+        segment, offset = _read_checkpoint(directory)
+        lines, end = _read_lines(_segment_path(directory, segment), offset, BATCH_SIZE)
+        if not lines:
+            later = [s for s in _segments(directory) if s > segment]
+            if later and segment != active_segment:
+                _segment_path(directory, segment).unlink(missing_ok=True)
+                _write_checkpoint(directory, later[0], 0)
+                return self._drain_batch(directory, active_segment)
+            return 0
+
+        records = []
+        for line in lines:
+            try:
+                record = json.loads(line)
+                if record.get("op") not in db.SPOOL_OPS:
+                    raise ValueError(f"unknown op {record.get('op')!r}")
+                records.append((line, record))
+            except ValueError as e:
+                _dead_letter(directory, line, f"unreadable record: {e}")
+                self.dead += 1
+
+        try:
+            _apply([record for _, record in records])
+        except Exception as e:
+            if db._is_transient(e):
+                raise
+            # Something in the batch is bad: apply one by one to find it.
+            # A record that fails on its own (a constraint, or a statement
+            # or lock timeout) is dead-lettered, not retried forever.
+            for line, record in records:
+                try:
+                    _apply([record])
+                except Exception as e:
+                    if db._is_transient(e):
+                        raise
+                    _dead_letter(directory, line, str(e))
+                    self.dead += 1
+
+        _write_checkpoint(directory, segment, end)
+        self.applied += len(records)
+        return len(lines)
+
+
+# ──────────────────────────────────────────────
+# Process-wide spool
+# ──────────────────────────────────────────────
+
+class WriteSpool:
+    """This process's writer plus the flusher that drains it."""
+
+    def __init__(self, root: Path = SPOOL_DIR):
+        self.root = root
+        self.writer = SpoolWriter(root / f"{os.getpid()}-{uuid.uuid4().hex[:8]}")
+        self.flusher = SpoolFlusher(root, self.writer)
+        self.flusher.start()
+
+    def append(self, record: dict):
+        self.writer.append(record)
+        self.flusher.wake()
+
+    def stats(self) -> dict:
+        return {"appended": self.writer._appended, "fsyncs": self.writer.fsyncs,
+                "applied": self.flusher.applied, "dead": self.flusher.dead}
+
+    def close(self, timeout: float = DRAIN_TIMEOUT):
+        """
+        Stop the flusher, try to drain what's left for up to `timeout`
+        seconds, then close. Anything not yet applied stays on disk and is
+        picked up by the next process that starts a spool.
+        """
+        self.flusher.stop()
+        self.writer.close()
+        deadline = time.monotonic() + timeout
+        directory = self.writer.directory
+        try:
+            while time.monotonic() < deadline:
+                if not self.flusher._drain_batch(directory, active_segment=None):
+                    break
+            else:
+                raise TimeoutError
+        except Exception as e:
+            print(f"⚠️  Spool not fully drained on exit, kept in {directory}: {e or 'timeout'}")
+            self.writer.release()
+            return
+        if (directory / _DEAD_LETTER).exists():
+            os.replace(directory / _DEAD_LETTER, self.root / f"dead-{directory.name}.jsonl")
+        shutil.rmtree(directory, ignore_errors=True)
+        self.writer.release()
+
+
+_spool = None
+_spool_lock = threading.Lock()
+
+
+def get_spool() -> WriteSpool:
+    """Return the process-wide spool, starting its flusher on first use."""
+    global _spool
+    with _spool_lock:
+        if _spool is None:
+            _spool = WriteSpool()
+            atexit.register(close_spool)
+        return _spool
+
+
+def close_spool():
+    global _spool
+    with _spool_lock:
+        spool, _spool = _spool, None
+    if spool is not None:
+        spool.close()
+
+
+def enqueue(op: str, payload: dict) -> str:
+    """Durably queue a db.SPOOL_OPS operation. Returns the record id."""
+    record = {"id": str(uuid.uuid4()), "op": op, "ts": time.time(), "payload": payload}
+    get_spool().append(record)
+    return record["id"]
+
+
+def resume_pending():
+    """Start the flusher if earlier processes left writes behind (called by db.init_tables)."""
+    if _spool is None and SPOOL_DIR.is_dir() and any(p.is_dir() for p in SPOOL_DIR.iterdir()):
+        get_spool()